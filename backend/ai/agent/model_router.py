@@ -0,0 +1,212 @@
+# backend/ai/agent/model_router.py
+
+"""
+질문 복잡도 기반 모델 라우팅
+
+단순하고 도구 한 번으로 답할 수 있는 질문(예: "오늘 학식 뭐야?")은 빠르고 저렴한 모델로,
+여러 단계 추론이 필요한 질문은 큰 모델로 보낸다.
+티어별 지연/품질 샘플을 모아 혼합 비율을 튜닝할 수 있게 한다.
+"""
+
+import re
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from backend.core.config import settings
+
+FAST = "fast"
+LARGE = "large"
+
+# 도구 한 번으로 답이 나오는 주제 (uhs_fetch_info / rag_search 단골 질문)
+SIMPLE_KEYWORDS = [
+    "학식", "식단", "메뉴", "교직원 식당", "학생식당", "등록금", "동아리",
+    "셔틀", "통학버스", "취업률", "교환학생", "장학금 공지", "공모전",
+]
+
+# 여러 단계 추론/비교/계획이 필요한 신호
+COMPLEX_KEYWORDS = [
+    "비교", "차이", "왜", "이유", "분석", "계획", "추천", "정리해", "설명해",
+    "각각", "단계", "장단점", "어떻게 해야", "전략", "요약해",
+    "compare", "why", "explain", "plan", "analy",
+]
+
+# 이전 대화를 참조하는 후속 질문
+FOLLOWUP_KEYWORDS = ["아까", "위에", "방금", "그럼", "그러면", "앞에서"]
+
+
+@dataclass
+class RoutingDecision:
+    tier: str
+    model: str
+    score: int
+    reasons: List[str]
+
+
+@dataclass
+class RoutingSample:
+    tier: str
+    escalated: bool
+    latency_ms: float
+    steps: int
+    tool_errors: int
+    answer_chars: int
+    quality: float
+
+
+class ModelRouter:
+    """
+    휴리스틱 점수로 티어를 고른다. score >= threshold 이면 large.
+    """
+
+    def __init__(
+        self,
+        fast_model: str,
+        large_model: str,
+        threshold: int = 2,
+        simple_keywords: Iterable[str] = SIMPLE_KEYWORDS,
+        complex_keywords: Iterable[str] = COMPLEX_KEYWORDS,
+        followup_keywords: Iterable[str] = FOLLOWUP_KEYWORDS,
+        sample_size: int = 500,
+    ):
+        self.models = {FAST: fast_model, LARGE: large_model}
+        self.threshold = threshold
+        self.simple_keywords = list(simple_keywords)
+        self.complex_keywords = list(complex_keywords)
+        self.followup_keywords = list(followup_keywords)
+
+        self._samples: Dict[str, Deque[RoutingSample]] = {
+            FAST: deque(maxlen=sample_size),
+            LARGE: deque(maxlen=sample_size),
+        }
+        self._counts = {FAST: 0, LARGE: 0, "escalations": 0}
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------
+    # 1) 라우팅
+    # ---------------------------------------------------
+    def score(self, question: str, history_len: int = 0) -> Tuple[int, List[str]]:
+        q = question.strip().lower()
+        score = 0
+        reasons: List[str] = []
+
+        simple_hits = [k for k in self.simple_keywords if k in q]
+        if simple_hits:
+            score -= 2
+            reasons.append(f"simple:{simple_hits[0]}")
+
+        complex_hits = [k for k in self.complex_keywords if k in q]
+        if complex_hits:
+            score += min(len(complex_hits), 3)
+            reasons.append(f"complex:{','.join(complex_hits[:3])}")
+
+        if len(re.findall(r"[?？]", q)) >= 2:
+            score += 2
+            reasons.append("multi-question")
+
+        if len(q) > 160:
+            score += 2
+            reasons.append("long")
+        elif len(q) > 80:
+            score += 1
+            reasons.append("medium")
+
+        if history_len > 0 and any(k in q for k in self.followup_keywords):
+            score += 1
+            reasons.append("follow-up")
+
+        return score, reasons
+
+    def route(self, question: str, history_len: int = 0) -> RoutingDecision:
+        if not settings.agent_routing_enabled:
+            return RoutingDecision(LARGE, self.models[LARGE], 0, ["routing-disabled"])
+
+        score, reasons = self.score(question, history_len)
+        tier = LARGE if score >= self.threshold else FAST
+
+        with self._lock:
+            self._counts[tier] += 1
+
+        logger.info(f"[model_router] tier={tier} score={score} reasons={reasons}")
+        return RoutingDecision(tier, self.models[tier], score, reasons)
+
+    # ---------------------------------------------------
+    # 2) 샘플 기록
+    # ---------------------------------------------------
+    def record(
+        self,
+        tier: str,
+        escalated: bool,
+        latency_ms: float,
+        steps: int,
+        tool_errors: int,
+        answer_chars: int,
+    ) -> RoutingSample:
+        # 품질 프록시: 도구 오류/에스컬레이션/빈 답변이 있으면 감점
+        quality = 1.0
+        if tool_errors:
+            quality -= 0.3
+        if escalated:
+            quality -= 0.3
+        if answer_chars == 0:
+            quality -= 0.4
+
+        sample = RoutingSample(
+            tier=tier,
+            escalated=escalated,
+            latency_ms=round(latency_ms, 1),
+            steps=steps,
+            tool_errors=tool_errors,
+            answer_chars=answer_chars,
+            quality=round(max(quality, 0.0), 2),
+        )
+        with self._lock:
+            self._samples[tier].append(sample)
+            if escalated:
+                self._counts["escalations"] += 1
+        return sample
+
+    def stats(self, recent: int = 20) -> Dict:
+        with self._lock:
+            samples = {tier: list(dq) for tier, dq in self._samples.items()}
+            counts = dict(self._counts)
+
+        tiers = {}
+        for tier, items in samples.items():
+            latencies = [s.latency_ms for s in items]
+            tiers[tier] = {
+                "model": self.models[tier],
+                "routed": counts[tier],
+                "samples": len(items),
+                "latency_ms_p50": _percentile(latencies, 50),
+                "latency_ms_p95": _percentile(latencies, 95),
+                "avg_steps": round(statistics.mean(s.steps for s in items), 2) if items else None,
+                "avg_quality": round(statistics.mean(s.quality for s in items), 3) if items else None,
+                "recent": [asdict(s) for s in items[-recent:]],
+            }
+
+        return {
+            "enabled": settings.agent_routing_enabled,
+            "threshold": self.threshold,
+            "escalations": counts["escalations"],
+            "tiers": tiers,
+        }
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+model_router = ModelRouter(
+    fast_model=settings.agent_fast_model,
+    large_model=settings.agent_large_model,
+    threshold=settings.agent_routing_threshold,
+)
@@ -0,0 +1,109 @@
+# backend/ai/agent/prompts/token_report.py
+
+"""
+Agent LLM 호출별 프롬프트 토큰 회계
+매 호출의 입력 토큰을 정적(시스템 프롬프트 + 도구 스키마)과
+동적(히스토리 + 질문 + 도구 결과)으로 나누고, 제공자가 보고한 캐시 적중 토큰과 함께 집계한다.
+동적 토큰은 실행(run_id)별로 이어서 세므로 매 단계에서는 새로 붙은 메시지만 토큰화한다.
+"""
+
+import json
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from backend.ai.tokens import count_tokens, MESSAGE_OVERHEAD_TOKENS
+
+
+def _message_text(msg: Any) -> str:
+    content = msg.content if isinstance(msg.content, str) else json.dumps(msg.content, ensure_ascii=False)
+    tool_calls = getattr(msg, "tool_calls", None)
+    if tool_calls:
+        content += json.dumps([{"name": c["name"], "args": c.get("args", {})} for c in tool_calls], ensure_ascii=False)
+    return content
+
+
+class PromptTokenReport:
+
+    def __init__(self, window: int = 500):
+        self._calls: Deque[Dict[str, int]] = deque(maxlen=window)
+        self._totals = {"calls": 0, "static": 0, "dynamic": 0, "provider_input": 0, "cached": 0}
+        self._static_cache: Dict[int, int] = {}
+        # run_id → (이미 센 메시지 수, 그때까지의 동적 토큰)
+        self._runs: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._window = window
+        self._lock = threading.Lock()
+
+    def static_tokens(self, system_prompt: str, tools: Sequence[Any]) -> int:
+        """시스템 프롬프트 + 도구 스키마 토큰 (바이트 단위로 매번 동일하므로 한 번만 계산)"""
+        key = hash((system_prompt, tuple(t.name for t in tools)))
+        cached = self._static_cache.get(key)
+        if cached is None:
+            schema = json.dumps([convert_to_openai_tool(t) for t in tools], ensure_ascii=False)
+            cached = count_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS + count_tokens(schema)
+            self._static_cache[key] = cached
+        return cached
+
+    def _dynamic_tokens(self, run_id: Optional[str], messages: List[Any]) -> int:
+        """히스토리 + 질문 + 도구 결과 토큰. 같은 실행의 이전 단계에서 센 메시지는 다시 세지 않는다"""
+        counted, dynamic = 1, 0
+        if run_id:
+            with self._lock:
+                counted, dynamic = self._runs.pop(run_id, (1, 0))
+        dynamic += sum(count_tokens(_message_text(m)) + MESSAGE_OVERHEAD_TOKENS for m in messages[counted:])
+        if run_id:
+            with self._lock:
+                self._runs[run_id] = (len(messages), dynamic)
+                while len(self._runs) > self._window:
+                    self._runs.popitem(last=False)
+        return dynamic
+
+    def discard(self, run_id: str) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def record(self, messages: List[Any], ai_msg: Any, static: int, run_id: Optional[str] = None) -> Dict[str, int]:
+        dynamic = self._dynamic_tokens(run_id, messages)
+
+        usage = getattr(ai_msg, "usage_metadata", None) or {}
+        provider_input = usage.get("input_tokens", 0)
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+        entry = {
+            "static": static,
+            "dynamic": dynamic,
+            "provider_input": provider_input,
+            "cached": cached,
+        }
+        with self._lock:
+            self._calls.append(entry)
+            self._totals["calls"] += 1
+            for k, v in entry.items():
+                self._totals[k] += v
+
+        logger.info(
+            f"[token_report] static={static} dynamic={dynamic} "
+            f"provider_input={provider_input} cached={cached}"
+        )
+        return entry
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = dict(self._totals)
+            recent = list(self._calls)[-20:]
+
+        local = totals["static"] + totals["dynamic"]
+        return {
+            **totals,
+            "static_share": round(totals["static"] / local, 3) if local else 0.0,
+            "cached_share": round(totals["cached"] / totals["provider_input"], 3) if totals["provider_input"] else 0.0,
+            "avg_static_per_call": round(totals["static"] / totals["calls"], 1) if totals["calls"] else 0.0,
+            "avg_dynamic_per_call": round(totals["dynamic"] / totals["calls"], 1) if totals["calls"] else 0.0,
+            "recent": recent,
+        }
+
+
+token_report = PromptTokenReport()
@@ -1,9 +1,10 @@
 # backend/ai/agent/react_agent.py
 
+import time
+import uuid
 from typing import List, Any, TypedDict
 
 from loguru import logger
-from langchain_openai import ChatOpenAI
 
 from langgraph.graph import StateGraph
 from langgraph.constants import END
@@ -16,39 +17,75 @@ from langchain_core.messages import (
 )
 
 from backend.core.config import settings
+from backend.core.llm_factory import get_chat_model
 from langchain_core.prompts import ChatPromptTemplate
 
 # Tools
 from backend.ai.tools.search.web_search import web_search
 from backend.ai.tools.search.hyupsung_info import uhs_fetch_info
-from backend.ai.tools.search.rag_search import rag_search
+from backend.ai.tools.search.rag_search import rag_search, get_rag_pipeline
+from backend.ai.tools.search.notice_search import notice_search
+from backend.ai.tools.search.rag_prefetch import rag_prefetcher
 
-from backend.ai.agent.prompts.system_prompt import SYSTEM_PROMPT
+from backend.ai.agent.prompts.system_prompt import get_system_prompt
+from backend.ai.agent.prompts.token_report import token_report
+from backend.ai.agent.model_router import model_router, FAST, LARGE
 from backend.ai.memory.chat_memory import chat_memory
 
 
 # ---------------------------------------------------
 # 1) LLM 초기화
 # ---------------------------------------------------
-llm = ChatOpenAI(
-    api_key=settings.openai_api_key,
-    model="gpt-4o",
-    temperature=0.2
-)
+# 라우터 티어별 모델 (fast: 단순 질문, large: 다단계 추론)
+LLM_TIERS = {
+    FAST: get_chat_model(settings.agent_fast_model, temperature=0.2),
+    LARGE: get_chat_model(settings.agent_large_model, temperature=0.2),
+}
+llm = LLM_TIERS[LARGE]
 
 # ---------------------------------------------------
 # 2) 도구 목록
 # ---------------------------------------------------
-TOOLS = [web_search, uhs_fetch_info, rag_search]
+TOOLS = [web_search, uhs_fetch_info, rag_search, notice_search]
 TOOL_REGISTRY = {t.name: t for t in TOOLS}
 
+# ---------------------------------------------------
+# 2-1) 정적 프롬프트 접두부
+#   [시스템 프롬프트][도구 스키마] 는 모든 호출에서 바이트 단위로 동일해야
+#   제공자 측 프롬프트 캐시가 적중한다. 날짜 등 동적 정보는 절대 여기에 넣지 않는다.
+# ---------------------------------------------------
+SYSTEM_MESSAGE = SystemMessage(content=get_system_prompt(settings.agent_prompt_variant))
+
+# 번역 프롬프트는 대상 언어별로 한 번만 만든다
+TRANSLATE_PROMPTS = {
+    lang: ChatPromptTemplate.from_messages([
+        ("system", f"Translate the following text to {name}. Only return the translated text, nothing else."),
+        ("human", "{text}")
+    ])
+    for lang, name in [("ko", "Korean"), ("en", "English")]
+}
+
+# bind_tools는 호출마다 도구 스키마를 다시 직렬화하므로 모델별로 캐시한다
+_bound_llms = {}
+
+
+def _bound_llm(tier: str):
+    model = LLM_TIERS.get(tier, llm)
+    cached = _bound_llms.get(tier)
+    if cached is None or cached[0] is not model:
+        cached = (model, model.bind_tools(TOOLS))
+        _bound_llms[tier] = cached
+    return cached[1]
+
 
 # ---------------------------------------------------
 # 3) LangGraph 상태 정의
 # ---------------------------------------------------
-class AgentState(TypedDict):
+class AgentState(TypedDict, total=False):
     messages: List[Any]
     session_id: str
+    run_id: str
+    model_tier: str
 
 
 # ---------------------------------------------------
@@ -58,11 +95,24 @@ def call_agent(state: AgentState):
     """
     LLM 호출 노드
     """
-    llm_with_tools = llm.bind_tools(TOOLS)
-    ai_msg = llm_with_tools.invoke(state["messages"])
+    tier = state.get("model_tier", LARGE)
+
+    # fast 티어가 도구를 여러 번 돌며 헤매면 large로 에스컬레이션
+    if tier == FAST:
+        tool_steps = sum(1 for m in state["messages"] if isinstance(m, ToolMessage))
+        if tool_steps >= settings.agent_fast_max_steps:
+            logger.info(f"⬆️ 모델 에스컬레이션: fast → large (tool_steps={tool_steps})")
+            tier = LARGE
+
+    ai_msg = _bound_llm(tier).invoke(state["messages"])
+
+    if settings.agent_token_report:
+        static = token_report.static_tokens(state["messages"][0].content, TOOLS)
+        token_report.record(state["messages"], ai_msg, static, state.get("run_id"))
 
     return {
-        "messages": state["messages"] + [ai_msg]
+        "messages": state["messages"] + [ai_msg],
+        "model_tier": tier
     }
 
 
@@ -79,9 +129,19 @@ def call_tool(state: AgentState):
 
     logger.info(f"🔧 Tool 호출: {tool_name}({tool_args})")
 
+    # 투기적 프리페치 결과가 있으면 검색 없이 바로 답변 생성
+    prefetched = None
+    if tool_name == "rag_search" and state.get("run_id"):
+        prefetched = rag_prefetcher.take(state["run_id"], tool_args.get("query", ""))
+
     tool = TOOL_REGISTRY.get(tool_name)
     if tool is None:
         result = f"[ERROR] 존재하지 않는 도구: {tool_name}"
+    elif prefetched is not None:
+        try:
+            result = get_rag_pipeline().answer(tool_args.get("query", ""), results=prefetched)
+        except Exception as e:
+            result = f"[ERROR] 도구 실행 실패: {str(e)}"
     else:
         try:
             result = tool.invoke(tool_args)
@@ -144,19 +204,46 @@ async def run_react_agent(question: str, session_id: str, language: str = "ko"):
     # 이번 질문 추가 (번역된 질문 사용)
     history.append(HumanMessage(content=translated_question))
 
+    # 질문 복잡도에 따라 모델 티어 결정
+    decision = model_router.route(translated_question, history_len=len(history) - 1)
+
     # 초기 상태
+    run_id = uuid.uuid4().hex
     initial_state = {
         "messages": [
-            SystemMessage(content=SYSTEM_PROMPT),
+            SYSTEM_MESSAGE,
             *history
         ],
-        "session_id": session_id
+        "session_id": session_id,
+        "run_id": run_id,
+        "model_tier": decision.tier
     }
 
-    result = app.invoke(initial_state)
+    # 투기적 RAG: 첫 LLM 호출과 병렬로 FAISS 검색 시작
+    if settings.agent_speculative_rag:
+        rag_prefetcher.start(run_id, translated_question)
+
+    started = time.perf_counter()
+    try:
+        # 동기 노드는 스레드풀에서 실행되어 이벤트 루프를 막지 않는다
+        result = await app.ainvoke(initial_state)
+    finally:
+        rag_prefetcher.discard(run_id)
+        token_report.discard(run_id)
 
     final_msg = result["messages"][-1]
 
+    # 티어별 지연/품질 샘플 기록
+    new_msgs = result["messages"][len(initial_state["messages"]):]
+    model_router.record(
+        tier=decision.tier,
+        escalated=result.get("model_tier", decision.tier) != decision.tier,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        steps=sum(1 for m in new_msgs if getattr(m, "tool_calls", None)),
+        tool_errors=sum(1 for m in new_msgs if isinstance(m, ToolMessage) and str(m.content).startswith("[ERROR]")),
+        answer_chars=len(final_msg.content or ""),
+    )
+
     # 메모리에 AI 답변도 저장
     chat_memory.add(session_id, final_msg)
 
@@ -173,13 +260,8 @@ async def translate_text(text: str, target_lang: str) -> str:
     텍스트를 대상 언어로 번역
     """
     try:
-        translate_prompt = ChatPromptTemplate.from_messages([
-            ("system", f"Translate the following text to {'Korean' if target_lang == 'ko' else 'English'}. Only return the translated text, nothing else."),
-            ("human", "{text}")
-        ])
-        
-        chain = translate_prompt | llm
-        result = chain.invoke({"text": text})
+        chain = TRANSLATE_PROMPTS.get(target_lang, TRANSLATE_PROMPTS["en"]) | llm
+        result = await chain.ainvoke({"text": text})
         return result.content
     except Exception as e:
         logger.error(f"번역 오류: {e}")
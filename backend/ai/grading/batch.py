@@ -0,0 +1,110 @@
+# backend/ai/grading/batch.py
+
+"""
+OpenAI Batch API 클라이언트 (채점 배치 모드)
+
+채점 프롬프트를 /v1/chat/completions 요청 JSONL로 만들어 올리고(files → batches),
+끝날 때까지 상태를 폴링한 뒤 결과 JSONL을 custom_id별로 돌려준다.
+응답까지 최대 GRADING_BATCH_COMPLETION_WINDOW가 걸리는 대신 비용이 낮고 분당 토큰 한도와 무관하다.
+
+GRADING_BATCH_BASE_URL을 지정하면 그 엔드포인트로 보낸다
+(로컬 테스트: python -m backend.benchmarks.fake_batch_server).
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+from backend.core.config import settings
+from backend.core.llm_factory import get_async_http_client, get_async_openai_client
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def request_line(custom_id: str, prompt_text: str) -> str:
+    """배치 입력 JSONL 한 줄 (온라인 채점과 같은 모델/온도/JSON 모드)"""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": settings.grading_model,
+            "temperature": 0.1,
+            "response_format": {"type": "json_object"},
+            "messages": [{"role": "user", "content": prompt_text}],
+        },
+    }, ensure_ascii=False)
+
+
+def response_content(line: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """결과 JSONL 한 줄 → (응답 본문, 오류 메시지)"""
+    if line.get("error"):
+        error = line["error"]
+        return None, error.get("message") if isinstance(error, dict) else str(error)
+    response = line.get("response") or {}
+    if response.get("status_code") != 200:
+        body = response.get("body") or {}
+        message = (body.get("error") or {}).get("message") if isinstance(body, dict) else None
+        return None, message or f"HTTP {response.get('status_code')}"
+    try:
+        return response["body"]["choices"][0]["message"]["content"], None
+    except (KeyError, IndexError, TypeError):
+        return None, "배치 응답 형식 오류"
+
+
+class BatchClient:
+
+    def __init__(self):
+        if settings.grading_batch_base_url:
+            self.client = AsyncOpenAI(
+                api_key=settings.openai_api_key or "sk-local-batch",
+                base_url=settings.grading_batch_base_url,
+                max_retries=settings.openai_max_retries,
+                http_client=get_async_http_client(),
+            )
+        else:
+            self.client = get_async_openai_client()
+
+    async def submit(self, jsonl_path: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """입력 파일 업로드 후 배치 생성. 배치 ID 반환."""
+        with open(jsonl_path, "rb") as f:
+            uploaded = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=settings.grading_batch_completion_window,
+            metadata=metadata,
+        )
+        print(f"📦 배치 제출: {batch.id} (입력 파일 {uploaded.id})")
+        return batch.id
+
+    async def wait(self, batch_id: str, on_status: Optional[Callable[[Any], Awaitable[None]]] = None):
+        """끝날 때까지 GRADING_BATCH_POLL_INTERVAL 간격으로 상태 조회 (on_status는 조회할 때마다 await)"""
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if on_status is not None:
+                await on_status(batch)
+            if batch.status in TERMINAL_STATUSES:
+                print(f"📦 배치 종료: {batch_id} - {batch.status}")
+                return batch
+            await asyncio.sleep(settings.grading_batch_poll_interval)
+
+    async def _read_lines(self, file_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        if not file_id:
+            return {}
+        content = await self.client.files.content(file_id)
+        lines = {}
+        for raw in content.text.splitlines():
+            if raw.strip():
+                line = json.loads(raw)
+                lines[line["custom_id"]] = line
+        return lines
+
+    async def results(self, batch) -> Dict[str, Dict[str, Any]]:
+        """custom_id → 결과 줄 (성공 파일 + 오류 파일)"""
+        lines = await self._read_lines(getattr(batch, "error_file_id", None))
+        lines.update(await self._read_lines(getattr(batch, "output_file_id", None)))
+        return lines
@@ -2,35 +2,153 @@ import os
 import zipfile
 import tempfile
 import json
+import time
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict
-import pandas as pd
-from langchain_openai import ChatOpenAI
+from typing import Any, Awaitable, Callable, Collection, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from langchain_core.prompts import PromptTemplate
-from langchain_community.document_loaders import PyPDFLoader
+
+from backend.core.config import settings
+from backend.core.llm_factory import get_chat_model
+from backend.core.artifact_store import content_hash, get_artifact_store, make_key
+from backend.services.pdf_extract import get_pdf_extractor
+from backend.ai.tokens import count_tokens, split_by_tokens, truncate_to_tokens
+from backend.ai.grading.scheduler import GradingScheduler, get_grading_scheduler
+from backend.ai.grading.report import write_reports
+from backend.ai.grading.batch import BatchClient, request_line, response_content
+from backend.ai.grading.result_schema import (
+    build_result_model,
+    extract_json,
+    invalid_fields,
+    merge_partial,
+    validate_result,
+)
+
+# 프롬프트/결과 형식이 바뀌면 올려서 이전 채점 캐시를 무효화
+GRADING_PROMPT_VERSION = 2
+
+# 채점 프롬프트
+GRADING_PROMPT = PromptTemplate(
+    input_variables=["content", "rubric"],
+    template="""
+당신은 대학교 과제 채점 AI입니다.
+
+다음 Rubric에 따라 과제를 채점하세요:
+{rubric}
+
+과제 내용:
+{content}
+
+반드시 다음 JSON 형식으로만 응답하세요:
+{{
+  "scores": {{
+    "항목1": 점수,
+    "항목2": 점수
+  }},
+  "total_score": 총점,
+  "feedback": "상세한 피드백"
+}}
+각 항목 점수는 0 이상, 해당 항목 배점 이하의 숫자여야 합니다.
+"""
+)
+
+# 검증에 실패한 필드만 다시 요청하는 프롬프트 (이전 대화에 이어서 보냄)
+REPAIR_PROMPT = PromptTemplate(
+    input_variables=["errors", "fields"],
+    template="""
+이전 응답의 다음 항목이 형식에 맞지 않습니다:
+{errors}
+
+과제 내용과 Rubric을 다시 확인하고 {fields} 항목만 같은 JSON 구조로 다시 응답하세요.
+나머지 항목은 응답에 넣지 마세요. 다른 설명 없이 JSON만 출력하세요.
+"""
+)
+
+# 긴 과제: 섹션별 근거 수집 (map) → 근거를 모아 GRADING_PROMPT로 최종 채점 (reduce)
+SECTION_PROMPT = PromptTemplate(
+    input_variables=["index", "count", "content", "rubric"],
+    template="""
+당신은 대학교 과제 채점 AI입니다. 과제가 길어 {count}개 섹션으로 나누어 검토하고 있습니다.
+
+Rubric:
+{rubric}
+
+과제 내용 (섹션 {index}/{count}):
+{content}
+
+이 섹션에서 Rubric 항목별로 평가 근거가 되는 내용을 간결하게 요약하세요.
+점수는 매기지 말고, 근거가 없는 항목은 빈 문자열로 두세요.
+반드시 다음 JSON 형식으로만 응답하세요:
+{{
+  "evidence": {{
+    "항목1": "근거 요약",
+    "항목2": "근거 요약"
+  }},
+  "summary": "섹션 내용 요약"
+}}
+"""
+)
+
+SECTION_HEADER = "[과제가 길어 섹션별로 검토한 근거입니다. 전체 과제를 평가한다고 보고 채점하세요.]"
+
+def normalize_rubric(rubric: Dict) -> Dict:
+    """캐시 키용 루브릭 (항목명 공백 정리, 배점 숫자화, 키 순서 무시)"""
+    normalized = {}
+    for name, score in rubric.items():
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            score = str(score).strip()
+        normalized[" ".join(str(name).split())] = score
+    return dict(sorted(normalized.items()))
+
+def is_failed(result: Dict) -> bool:
+    return result.get("status") == "failed"
 
 class GradingPipeline:
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
-        
-    def extract_zip(self, zip_path: str) -> List[str]:
-        """ZIP 파일에서 PDF 추출"""
-        print(f"🔍 ZIP 파일 추출 시작: {zip_path}")
-        temp_dir = tempfile.mkdtemp()
-        pdf_files = []
-        
+        # 429는 SDK 내부 재시도 대신 스케줄러가 받아서 동시성 조절 + 백오프
+        # JSON 모드: 코드 펜스/설명 문장 없이 JSON 객체만 받도록 강제
+        self.llm = get_chat_model(settings.grading_model, temperature=0.1, max_retries=0).bind(
+            response_format={"type": "json_object"}
+        )
+        self._result_models: Dict[str, type] = {}
+
+    def _is_pdf_member(self, info: zipfile.ZipInfo) -> bool:
+        name = info.filename
+        base = os.path.basename(name)
+        # 디렉터리, macOS 메타데이터(__MACOSX/, ._파일) 제외
+        return (
+            not info.is_dir()
+            and name.lower().endswith('.pdf')
+            and not name.startswith('__MACOSX/')
+            and not base.startswith('._')
+        )
+
+    def list_zip_pdfs(self, zip_path: str) -> List[str]:
+        """ZIP 안의 PDF 멤버 이름 목록 (압축 해제 없음)"""
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            names = [info.filename for info in zip_ref.infolist() if self._is_pdf_member(info)]
+        print(f"📁 ZIP 내부 PDF {len(names)}개: {zip_path}")
+        return names
+
+    def iter_zip_pdfs(self, zip_path: str, skip: Collection[str] = ()) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """
+        ZIP 멤버에서 PDF를 하나씩 읽어 (파일명, 바이트)로 넘긴다.
+        임시 디렉터리에 풀지 않으므로 디스크 사용량이 늘지 않는다.
+        skip: 이미 채점된 멤버 이름 (재시작한 작업에서 건너뜀)
+        GRADING_MAX_PDF_MB를 넘는 멤버는 읽지 않고 (파일명, None)으로 넘긴다 (채점 쪽에서 failed 처리).
+        """
+        max_bytes = settings.grading_max_pdf_mb * 1024 * 1024
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            print(f"📁 ZIP 내부 파일 목록: {[f.filename for f in zip_ref.filelist]}")
-            for file_info in zip_ref.filelist:
-                if file_info.filename.endswith('.pdf'):
-                    zip_ref.extract(file_info, temp_dir)
-                    extracted_path = os.path.join(temp_dir, file_info.filename)
-                    pdf_files.append(extracted_path)
-                    print(f"✅ PDF 추출: {file_info.filename} -> {extracted_path}")
-        
-        print(f"📊 총 {len(pdf_files)}개 PDF 파일 추출 완료")
-        return pdf_files
+            for info in zip_ref.infolist():
+                if not self._is_pdf_member(info) or info.filename in skip:
+                    continue
+                if info.file_size > max_bytes:
+                    print(f"⚠️ PDF 크기 제한 초과: {info.filename} ({info.file_size} bytes)")
+                    yield info.filename, None
+                    continue
+                with zip_ref.open(info) as member:
+                    yield info.filename, member.read()
     
     def parse_filename(self, filename: str) -> Dict[str, str]:
         """파일명에서 학번, 과제명, 이름 추출"""
@@ -51,125 +169,388 @@ class GradingPipeline:
         print(f"⚠️ 파싱 실패 (형식 불일치): {result}")
         return result
     
-    def load_pdf_content(self, pdf_path: str) -> str:
-        """PDF 내용 로드"""
+    async def load_pdf_content(self, source: Union[str, bytes], digest: Optional[str] = None) -> str:
+        """
+        PDF 내용 로드 (파일 경로 또는 ZIP 멤버에서 읽은 바이트)
+        추출은 공유 프로세스 풀(services/pdf_extract.py)에서, 결과는 파일 내용 해시로 캐시한다.
+        추출에 실패하면 RuntimeError (오류 문구를 채점하거나 캐시하지 않도록 호출한 쪽에서 failed 처리)
+        """
         try:
-            loader = PyPDFLoader(pdf_path)
-            pages = loader.load()
-            return "\n".join([p.page_content for p in pages])
+            return await get_pdf_extractor().extract(source, digest)
         except Exception as e:
-            return f"PDF 로드 실패: {str(e)}"
+            raise RuntimeError(f"PDF 로드 실패: {str(e)}") from e
+    
+    def _submission_info(self, filename: str) -> Dict[str, str]:
+        file_info = self.parse_filename(filename)
+        return {
+            "filename": os.path.basename(filename),
+            "student_id": file_info["student_id"],
+            "name": file_info["name"],
+            "assignment": file_info["assignment"],
+        }
+    
+    def _cache_key(self, digest: str, rubric: Dict) -> str:
+        return make_key(digest, normalize_rubric(rubric), settings.grading_model, GRADING_PROMPT_VERSION)
+    
+    def _oversize(self, filename: str) -> Dict:
+        return self._failed(
+            self._submission_info(filename),
+            f"파일 크기 초과 ({settings.grading_max_pdf_mb}MB 제한)",
+        )
+    
+    def _failed(self, submission: Dict, error: str) -> Dict:
+        return {
+            **submission,
+            "status": "failed",
+            "error": error,
+            "scores": {},
+            "total_score": 0,
+            "feedback": f"채점 실패: {error}"
+        }
     
-    def grade_single_assignment(self, pdf_path: str, rubric: Dict) -> Dict:
+    async def grade_single_assignment(
+        self,
+        filename: str,
+        source: Union[str, bytes],
+        rubric: Dict,
+        scheduler: Optional[GradingScheduler] = None,
+    ) -> Dict:
         """단일 과제 채점"""
-        print(f"📝 채점 시작: {os.path.basename(pdf_path)}")
+        print(f"📝 채점 시작: {os.path.basename(filename)}")
+        scheduler = scheduler or get_grading_scheduler()
         
-        file_info = self.parse_filename(pdf_path)
-        print(f"📄 PDF 내용 로드 시작...")
-        content = self.load_pdf_content(pdf_path)
-        print(f"📄 PDF 내용 로드 완료: {len(content)}자")
+        submission = self._submission_info(filename)
         
-        # 채점 프롬프트
-        prompt = PromptTemplate(
-            input_variables=["content", "rubric"],
-            template="""
-당신은 대학교 과제 채점 AI입니다.
-
-다음 Rubric에 따라 과제를 채점하세요:
-{rubric}
-
-과제 내용:
-{content}
-
-반드시 다음 JSON 형식으로만 응답하세요:
-{{
-  "scores": {{
-    "항목1": 점수,
-    "항목2": 점수
-  }},
-  "total_score": 총점,
-  "feedback": "상세한 피드백"
-}}
-"""
-        )
+        # 같은 제출물 + 같은 루브릭 + 같은 모델이면 이전 채점 결과 재사용
+        if not isinstance(source, bytes):
+            source = await asyncio.to_thread(lambda: open(source, 'rb').read())
+        digest = content_hash(source)
+        store = get_artifact_store()
+        cache_key = self._cache_key(digest, rubric)
+        cached = await asyncio.to_thread(store.get, "grading", cache_key)
+        if cached is not None:
+            print(f"♻️ 채점 캐시 적중: {submission['name']} - 총점 {cached.get('total_score', 0)}")
+            scheduler.record_submission()
+            return {**submission, **cached}
+        
+        rubric_text = json.dumps(rubric, ensure_ascii=False)
         
         try:
-            print(f"🤖 LLM 채점 요청 시작...")
-            response = self.llm.invoke(prompt.format(content=content, rubric=json.dumps(rubric, ensure_ascii=False)))
-            print(f"🤖 LLM 응답 수신: {response.content[:200]}...")
+            print(f"📄 PDF 내용 로드 시작...")
+            content = await self.load_pdf_content(source, digest)
+            print(f"📄 PDF 내용 로드 완료: {len(content)}자")
             
-            result = json.loads(response.content.strip())
-            print(f"✅ 채점 성공: {file_info['name']} - 총점 {result.get('total_score', 0)}")
+            content_tokens = count_tokens(content, settings.grading_model)
+            if content_tokens > settings.grading_max_prompt_tokens:
+                print(f"✂️ 긴 과제 분할 채점: {content_tokens} 토큰 > {settings.grading_max_prompt_tokens}")
+                content, notice = await self._collect_evidence(content, rubric_text, scheduler)
+            else:
+                notice = None
+            prompt_text = GRADING_PROMPT.format(content=content, rubric=rubric_text)
+            result = await self._request_grading(prompt_text, rubric, scheduler)
+            if notice:
+                result["feedback"] = f"{result['feedback']}\n\n{notice}"
+            print(f"✅ 채점 성공: {submission['name']} - 총점 {result['total_score']}")
             
-            return {
-                "filename": os.path.basename(pdf_path),
-                "student_id": file_info["student_id"],
-                "name": file_info["name"],
-                "assignment": file_info["assignment"],
-                **result
-            }
+            # 성공한 결과만 캐시 (실패는 다음 실행에서 다시 채점)
+            await asyncio.to_thread(store.put, "grading", cache_key, result)
+            return {**submission, **result}
         except Exception as e:
-            print(f"❌ 채점 실패: {file_info['name']} - {str(e)}")
-            return {
-                "filename": os.path.basename(pdf_path),
-                "student_id": file_info["student_id"],
-                "name": file_info["name"],
-                "assignment": file_info["assignment"],
-                "scores": {},
-                "total_score": 0,
-                "feedback": f"채점 실패: {str(e)}"
-            }
+            print(f"❌ 채점 실패: {submission['name']} - {str(e)}")
+            return self._failed(submission, str(e))
+        finally:
+            scheduler.record_submission()
     
-    async def grade_assignments_parallel(self, pdf_files: List[str], rubric: Dict) -> List[Dict]:
-        """병렬 채점 처리"""
-        print(f"🚀 병렬 채점 시작: {len(pdf_files)}개 파일, 5개 워커")
-        loop = asyncio.get_event_loop()
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            tasks = [
-                loop.run_in_executor(executor, self.grade_single_assignment, pdf_file, rubric)
-                for pdf_file in pdf_files
-            ]
-            print(f"🔄 {len(tasks)}개 작업 생성 완료, 대기 중...")
-            results = await asyncio.gather(*tasks)
-            print(f"✅ 병렬 채점 완료: {len(results)}개 결과")
+    def _result_model(self, rubric: Dict) -> type:
+        key = json.dumps(rubric, ensure_ascii=False, sort_keys=True)
+        if key not in self._result_models:
+            self._result_models[key] = build_result_model(rubric)
+        return self._result_models[key]
+    
+    async def _invoke(self, messages, scheduler: GradingScheduler) -> str:
+        """스케줄러를 거쳐 LLM 호출, 실제 사용량으로 토큰 버킷 보정"""
+        text = "\n".join(m[1] for m in messages)
+        estimated_tokens = count_tokens(text, settings.grading_model) + settings.grading_expected_output_tokens
+        print(f"🤖 LLM 채점 요청 시작... (예상 {estimated_tokens} 토큰)")
+        response = await scheduler.call(lambda: self.llm.ainvoke(messages), estimated_tokens)
+        print(f"🤖 LLM 응답 수신: {response.content[:200]}...")
+        # 예상치와 실제 사용량 차이만큼 토큰 버킷 보정
+        usage = getattr(response, "usage_metadata", None)
+        if usage and usage.get("total_tokens"):
+            scheduler.bucket.adjust(estimated_tokens - usage["total_tokens"])
+        return response.content
+    
+    async def _collect_evidence(
+        self, content: str, rubric_text: str, scheduler: GradingScheduler
+    ) -> Tuple[str, Optional[str]]:
+        """
+        GRADING_MAX_PROMPT_TOKENS를 넘는 과제를 섹션으로 나눠 항목별 근거를 동시에 모으고,
+        (최종 채점 프롬프트에 넣을 근거 텍스트, 피드백에 덧붙일 안내)를 돌려준다
+        (섹션당 근거도 잘라 전체가 한도 안에 들어오게).
+        섹션이 GRADING_MAX_SECTIONS개를 넘으면 섹션을 GRADING_MAX_PROMPT_TOKENS까지 키워 다시 나누고,
+        그래도 넘으면 앞 섹션만 검토하고 안내 문구로 알린다 (뒷부분이 점수에 반영되지 않았음을 채점자가 알 수 있게).
+        """
+        model = settings.grading_model
+        max_sections = max(1, settings.grading_max_sections)
+        overlap = settings.grading_section_overlap
+        section_tokens = min(settings.grading_section_tokens, settings.grading_max_prompt_tokens)
+        sections = split_by_tokens(content, section_tokens, overlap, model)
+        if len(sections) > max_sections and section_tokens < settings.grading_max_prompt_tokens:
+            needed = -(-count_tokens(content, model) // max_sections) + overlap
+            section_tokens = min(max(section_tokens, needed), settings.grading_max_prompt_tokens)
+            sections = split_by_tokens(content, section_tokens, overlap, model)
+        notice = None
+        if len(sections) > max_sections:
+            print(f"⚠️ 섹션 {len(sections)}개 중 앞 {max_sections}개만 검토")
+            notice = f"※ 분량이 많아 전체 {len(sections)}개 구간 중 앞 {max_sections}개 구간만 검토한 결과입니다."
+            sections = sections[:max_sections]
         
-        return results
+        async def _map(index: int, section: str) -> str:
+            prompt_text = SECTION_PROMPT.format(
+                index=index, count=len(sections), content=section, rubric=rubric_text
+            )
+            text = await self._invoke([("human", prompt_text)], scheduler)
+            try:
+                data = extract_json(text)
+                evidence = data.get("evidence") or {}
+                lines = [f"- {item}: {note}" for item, note in evidence.items() if note]
+                if data.get("summary"):
+                    lines.append(f"요약: {data['summary']}")
+                return "\n".join(lines)
+            except ValueError:
+                # 형식이 깨져도 근거로는 쓸 수 있으므로 원문 그대로
+                return text.strip()
+        
+        print(f"🧩 섹션 {len(sections)}개 근거 수집 시작 (섹션당 {section_tokens} 토큰)")
+        notes = await asyncio.gather(*[_map(i, section) for i, section in enumerate(sections, 1)])
+        
+        # 섹션 머리말 몫을 빼고 나머지를 섹션별로 균등 배분
+        overhead = count_tokens(SECTION_HEADER, model) + 10 * len(notes)
+        budget = max(1, (settings.grading_max_prompt_tokens - overhead) // len(notes))
+        parts = [
+            f"[섹션 {i}/{len(notes)}]\n{truncate_to_tokens(note, budget, model)}"
+            for i, note in enumerate(notes, 1)
+        ]
+        return SECTION_HEADER + "\n\n" + "\n\n".join(parts), notice
     
-    def create_excel_report(self, results: List[Dict], rubric: Dict) -> str:
-        """Excel 보고서 생성"""
-        print(f"📈 Excel 보고서 생성 시작: {len(results)}개 결과")
-        
-        # 데이터 정리
-        rows = []
-        for i, result in enumerate(results):
-            row = {
-                "파일명": result["filename"],
-                "학번": result["student_id"],
-                "이름": result["name"],
-                "과제명": result["assignment"]
-            }
+    async def _request_grading(self, prompt_text: str, rubric: Dict, scheduler: GradingScheduler) -> Dict:
+        """
+        채점 요청 + 스키마 검증.
+        검증에 실패하면 잘못된 필드만 다시 요청해 이전 응답에 합치고(최대 GRADING_REPAIR_ATTEMPTS회),
+        그래도 맞지 않으면 ValueError.
+        """
+        model = self._result_model(rubric)
+        messages = [("human", prompt_text)]
+        content = await self._invoke(messages, scheduler)
+        
+        data: Dict = {}
+        for attempt in range(settings.grading_repair_attempts + 1):
+            try:
+                data = merge_partial(data, extract_json(content))
+                result, errors = validate_result(model, data)
+            except ValueError as e:
+                # JSON 자체가 깨진 경우 전체를 다시 받는다
+                result, errors = None, [f"(root): {e}"]
+            if result is not None:
+                result["status"] = "graded"
+                return result
+            if attempt == settings.grading_repair_attempts:
+                break
             
-            # Rubric 항목별 점수
-            for item in rubric.keys():
-                score = result["scores"].get(item, 0)
-                row[f"{item}_점수"] = score
-                print(f"📊 {result['name']}: {item} = {score}")
+            fields = invalid_fields(errors)
+            print(f"🔧 응답 보정 요청 {attempt + 1}/{settings.grading_repair_attempts}: {', '.join(fields)}")
+            messages = messages + [
+                ("ai", content),
+                ("human", REPAIR_PROMPT.format(
+                    errors="\n".join(f"- {e}" for e in errors),
+                    fields="전체" if "(root)" in fields else ", ".join(fields),
+                )),
+            ]
+            content = await self._invoke(messages, scheduler)
+        
+        raise ValueError(f"응답 형식 오류: {'; '.join(errors)}")
+    
+    async def grade_assignments_parallel(
+        self,
+        pdf_files: Iterable[Tuple[str, Optional[bytes]]],
+        rubric: Dict,
+        on_result: Optional[Callable[[str, Dict], Awaitable[None]]] = None,
+    ) -> List[Dict]:
+        """
+        병렬 채점 처리
+        LLM 호출의 동시성/속도는 공유 스케줄러(토큰 버킷 + AIMD)가 조절한다.
+        pdf_files는 iter_zip_pdfs 제너레이터를 그대로 받고, 메모리에 올라가는 PDF가
+        최대 동시성의 2배를 넘지 않도록 작업이 끝날 때마다 다음 파일을 읽는다.
+        on_result(멤버 이름, 결과)는 파일 하나가 끝날 때마다 await된다 (코루틴 함수).
+        on_result를 주면 결과를 모아 두지 않고 빈 리스트를 반환한다 (수강생 수와 관계없이 메모리 일정).
+        """
+        scheduler = get_grading_scheduler()
+        window = asyncio.Semaphore(settings.grading_max_concurrency * 2)
+        print(f"🚀 병렬 채점 시작: 동시성 한도 {scheduler.limiter.limit:.1f} (최대 {settings.grading_max_concurrency})")
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        
+        results: List[Dict] = []
+        
+        async def _grade(index: int, filename: str, data: Optional[bytes]) -> None:
+            try:
+                if data is None:
+                    result = self._oversize(filename)
+                else:
+                    result = await self.grade_single_assignment(filename, data, rubric, scheduler)
+            finally:
+                window.release()
+            if on_result is not None:
+                await on_result(filename, result)
+            else:
+                results.append((index, result))
+        
+        # 끝난 작업은 바로 집합에서 빠지므로 들고 있는 태스크도 창 크기 이하
+        running = set()
+        count = 0
+        files = iter(pdf_files)
+        while True:
+            await window.acquire()
+            # ZIP 멤버 읽기는 이벤트 루프 밖에서
+            item = await loop.run_in_executor(None, next, files, None)
+            if item is None:
+                window.release()
+                break
+            task = asyncio.create_task(_grade(count, *item))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            count += 1
+        
+        print(f"🔄 {count}개 작업 생성 완료, 대기 중...")
+        await asyncio.gather(*running)
+        
+        elapsed = time.perf_counter() - started
+        per_min = count / elapsed * 60 if elapsed else 0.0
+        print(f"✅ 병렬 채점 완료: {count}개, {elapsed:.1f}초 ({per_min:.1f}건/분)")
+        print(f"📊 스케줄러: {scheduler.stats()}")
+        
+        # 입력 순서대로
+        return [result for _, result in sorted(results, key=lambda r: r[0])]
+    
+    async def grade_assignments_batch(
+        self,
+        pdf_files: Iterable[Tuple[str, Optional[bytes]]],
+        rubric: Dict,
+        on_result: Optional[Callable[[str, Dict], Awaitable[None]]] = None,
+        batch_id: Optional[str] = None,
+        on_batch: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_status: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ) -> List[Dict]:
+        """
+        배치 채점 (OpenAI Batch API 호환 엔드포인트, 비용/처리량 우선)
+        - 캐시 적중 제출물은 바로 결과 처리
+        - 나머지는 채점 프롬프트를 JSONL 한 파일로 모아 배치 하나로 제출하고 끝날 때까지 폴링
+        - 본문이 GRADING_MAX_PROMPT_TOKENS를 넘는 과제는 분할 채점이 필요하므로 온라인 경로로 함께 처리
+        - 스키마 검증에 실패한 응답은 failed로 남긴다 (retry-failed로 온라인 재채점)
+        batch_id를 주면 새로 제출하지 않고 그 배치 결과를 기다린다 (서버 재시작 후 재개).
+        on_result를 주면 결과를 모아 두지 않고 빈 리스트를 반환한다.
+        on_batch(배치 ID)는 제출 직후, on_status(배치 객체)는 폴링할 때마다 await된다.
+        """
+        store = get_artifact_store()
+        model = self._result_model(rubric)
+        rubric_text = json.dumps(rubric, ensure_ascii=False)
+        loop = asyncio.get_running_loop()
+        results: List[Dict] = []
+        pending: Dict[str, Tuple[Dict, str]] = {}
+        online: List[asyncio.Task] = []
+        
+        counts = {"done": 0, "cached": 0}
+        
+        async def _finish(filename: str, result: Dict) -> None:
+            counts["done"] += 1
+            if on_result is not None:
+                await on_result(filename, result)
+            else:
+                results.append(result)
+        
+        async def _grade_online(filename: str, data: bytes) -> None:
+            await _finish(filename, await self.grade_single_assignment(filename, data, rubric))
+        
+        # 입력 파일을 읽는 도중 실패해도 JSONL 삭제/온라인 작업 취소가 되도록 같은 try 안에서
+        jsonl = tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False)
+        try:
+            with jsonl:
+                files = iter(pdf_files)
+                while True:
+                    item = await loop.run_in_executor(None, next, files, None)
+                    if item is None:
+                        break
+                    filename, data = item
+                    if data is None:
+                        await _finish(filename, self._oversize(filename))
+                        continue
+                    submission = self._submission_info(filename)
+                    digest = content_hash(data)
+                    cache_key = self._cache_key(digest, rubric)
+                    cached = await asyncio.to_thread(store.get, "grading", cache_key)
+                    if cached is not None:
+                        counts["cached"] += 1
+                        await _finish(filename, {**submission, **cached})
+                        continue
+                    
+                    try:
+                        content = await self.load_pdf_content(data, digest)
+                    except RuntimeError as e:
+                        await _finish(filename, self._failed(submission, str(e)))
+                        continue
+                    if count_tokens(content, settings.grading_model) > settings.grading_max_prompt_tokens:
+                        online.append(asyncio.create_task(_grade_online(filename, data)))
+                        continue
+                    pending[filename] = (submission, cache_key)
+                    if batch_id is None:
+                        prompt_text = GRADING_PROMPT.format(content=content, rubric=rubric_text)
+                        jsonl.write(request_line(filename, prompt_text) + "\n")
             
-            row["총점"] = result["total_score"]
-            row["피드백"] = result["feedback"]
-            rows.append(row)
-            print(f"✅ 데이터 정리 완료: {i+1}/{len(results)}")
-        
-        # DataFrame 생성
-        print(f"📈 DataFrame 생성 중...")
-        df = pd.DataFrame(rows)
-        print(f"📈 DataFrame 생성 완료: {df.shape}")
-        
-        # Excel 파일 저장
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        print(f"💾 Excel 파일 저장 중: {temp_file.name}")
-        df.to_excel(temp_file.name, index=False, engine='openpyxl')
-        print(f"✅ Excel 파일 생성 완료: {temp_file.name}")
-        
-        return temp_file.name
\ No newline at end of file
+            print(f"📦 배치 채점: 배치 {len(pending)}개, 온라인 {len(online)}개, 캐시 {counts['cached']}개")
+            if pending:
+                client = BatchClient()
+                if batch_id is None:
+                    batch_id = await client.submit(jsonl.name, metadata={"source": "grading"})
+                    if on_batch is not None:
+                        await on_batch(batch_id)
+                batch = await client.wait(batch_id, on_status)
+                lines = await client.results(batch)
+                
+                for filename, (submission, cache_key) in pending.items():
+                    line = lines.get(filename)
+                    if line is None:
+                        await _finish(filename, self._failed(submission, f"배치 결과 없음 ({batch.status})"))
+                        continue
+                    content, error = response_content(line)
+                    if error is not None:
+                        await _finish(filename, self._failed(submission, f"배치 요청 실패: {error}"))
+                        continue
+                    try:
+                        result, errors = validate_result(model, extract_json(content))
+                    except ValueError as e:
+                        result, errors = None, [str(e)]
+                    if result is None:
+                        await _finish(filename, self._failed(submission, f"응답 형식 오류: {'; '.join(errors)}"))
+                        continue
+                    result["status"] = "graded"
+                    await asyncio.to_thread(store.put, "grading", cache_key, result)
+                    await _finish(filename, {**submission, **result})
+            await asyncio.gather(*online)
+        finally:
+            for task in online:
+                task.cancel()
+            os.unlink(jsonl.name)
+        
+        print(f"✅ 배치 채점 완료: {counts['done']}개")
+        return results
+    
+    def create_excel_report(self, results: Iterable[Dict], rubric: Dict, output_path: Optional[str] = None) -> str:
+        """Excel 보고서 생성 (write-only 모드로 결과를 한 행씩 기록)"""
+        # output_path가 없으면 임시 파일
+        if output_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
+                output_path = temp_file.name
+        print(f"📈 Excel 보고서 생성 시작: {output_path}")
+        summary = write_reports(results, rubric, [output_path])
+        print(f"✅ Excel 파일 생성 완료: {output_path} ({summary['rows']}행)")
+        return output_path
@@ -0,0 +1,454 @@
+# backend/ai/grading/job_queue.py
+
+"""
+백그라운드 채점 작업 큐
+
+POST /grading/grade 는 작업만 등록하고 바로 반환한다. 채점은 앱 이벤트 루프의 태스크로 돌고,
+동시에 실행되는 작업 수는 GRADING_MAX_JOBS로 제한한다.
+
+- 파일 하나가 끝날 때마다 결과를 Redis 해시 grading_items:{session_id}에 기록하고
+  grading_result:{session_id}의 진행률(done/total)을 갱신한다. 결과 본문은 해시에만 두고
+  상태 값에는 진행률/요약만 넣는다 (결과 전체를 담은 큰 값 하나를 만들지 않음).
+- 완료되면 해시에서 ZIP 순서대로 조금씩 읽어 Excel/CSV 보고서를 스트리밍으로 쓰고,
+  결과를 PostgreSQL(grading/repository.py)에 옮겨 Redis가 만료된 뒤에도 다시 열람할 수 있게 한다.
+- 서버가 재시작되면 queued/processing 상태로 남은 작업을 다시 등록하고,
+  해시에 이미 있는 파일은 건너뛴다.
+- 여러 워커가 같은 작업을 동시에 돌리지 않도록 Redis 락(grading_lock:{session_id}, 값은 워커 ID)을 잡는다.
+  워커는 grading_worker:{worker_id}에 하트비트를 남기고 잡고 있는 락의 TTL도 함께 연장한다.
+  락을 못 잡았을 때 주인 워커의 하트비트가 없으면(죽은 워커) 락을 넘겨받고, 살아 있으면 기다렸다가 다시 확인한다.
+- 채점에 실패한 파일도 status="failed"로 해시에 남기고, retry_failed()로 그 파일만 다시 채점한다.
+- mode="batch"면 Batch API로 한 번에 제출하고, 배치 ID를 세션 정보에 저장해 재시작 후에도 같은 배치를 기다린다.
+- 파일 결과/상태 변경마다 Redis Stream grading_events:{session_id}에 이벤트(파일 이름만)를 남긴다.
+  GET /grading/stream 이 이 스트림을 읽어 결과를 SSE로 바로 보내므로, 다른 워커가 채점 중이어도 받아 볼 수 있다.
+- 이벤트 루프에서 도는 코드는 비동기 클라이언트(redis.asyncio)만 쓴다.
+  동기 get_status/get_items/iter_items는 스레드(보고서 작성, DB 저장)와 동기 코드용.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.core.redis_client import get_async_redis_client, get_redis_client
+from backend.ai.grading.grading_pipeline import GradingPipeline, is_failed
+from backend.ai.grading.report import write_reports
+from backend.ai.grading.repository import save_job_results
+from backend.ai.grading.storage import REPORT_CSV_FILENAME, REPORT_FILENAME, session_dir
+
+SESSION_KEY = "grading:{}"
+RESULT_KEY = "grading_result:{}"
+ITEMS_KEY = "grading_items:{}"
+LOCK_KEY = "grading_lock:{}"
+WORKER_KEY = "grading_worker:{}"
+EVENTS_KEY = "grading_events:{}"
+
+SESSION_TTL = 3600
+# 락 자체의 만료 시간. 살아 있는 워커는 하트비트로 계속 연장하므로 죽은 워커의 락만 풀린다
+LOCK_TTL = 300
+# 워커 하트비트: HEARTBEAT_INTERVAL마다 갱신, HEARTBEAT_TTL 동안 없으면 죽은 워커로 본다
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_TTL = 30
+# 살아 있는 다른 워커가 락을 잡고 있을 때 다시 확인하는 간격
+LOCK_RETRY_INTERVAL = 15
+
+# 값이 기대한 주인일 때만 락을 바꾸거나 지운다 (확인과 변경 사이에 다른 워커가 끼어들지 않도록)
+_TAKEOVER_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return nil
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+ACTIVE_STATUSES = ("queued", "processing")
+
+# 결과를 해시에서 한 번에 읽어 오는 개수
+RESULT_CHUNK = 200
+
+# 이벤트 스트림 최대 길이 (근사치로 잘라냄, 재접속 시 되감기 가능한 범위)
+EVENTS_MAXLEN = 20000
+
+
+class GradingJobManager:
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._worker_id = uuid.uuid4().hex
+        self._held_locks: set = set()
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    def _redis(self):
+        return get_redis_client()
+
+    def _sem(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.grading_max_jobs)
+        return self._semaphore
+
+    async def _set_status(self, session_id: str, status: str, **data: Any) -> None:
+        """상태 저장 + status 이벤트 발행 (한 번의 왕복)"""
+        pipe = get_async_redis_client().pipeline()
+        pipe.setex(
+            RESULT_KEY.format(session_id), SESSION_TTL, json.dumps({"status": status, **data}, ensure_ascii=False)
+        )
+        self._publish(pipe, session_id, "status")
+        await pipe.execute()
+
+    def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        data = self._redis().get(RESULT_KEY.format(session_id))
+        return json.loads(data) if data else None
+
+    async def aget_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """get_status의 비동기 버전 (SSE 등 이벤트 루프에서 반복 호출하는 곳용)"""
+        data = await get_async_redis_client().get(RESULT_KEY.format(session_id))
+        return json.loads(data) if data else None
+
+    def _publish(self, pipe, session_id: str, event: str, name: str = "") -> None:
+        """이벤트 스트림 기록을 파이프라인에 추가한다 (실행은 호출한 쪽에서, 같은 왕복에 묶이도록)"""
+        events_key = EVENTS_KEY.format(session_id)
+        pipe.xadd(events_key, {"event": event, "name": name}, maxlen=EVENTS_MAXLEN, approximate=True)
+        pipe.expire(events_key, SESSION_TTL)
+
+    async def read_events(
+        self, session_id: str, last_id: str, block_ms: Optional[int] = None
+    ) -> List[Tuple[str, str, str]]:
+        """last_id 이후 이벤트 (id, event, name). block_ms를 주면 새 이벤트가 없을 때 그만큼 기다린다."""
+        response = await get_async_redis_client().xread(
+            {EVENTS_KEY.format(session_id): last_id}, count=RESULT_CHUNK, block=block_ms
+        )
+        return [
+            (event_id, fields.get("event", ""), fields.get("name", ""))
+            for _, entries in response or []
+            for event_id, fields in entries
+        ]
+
+    def get_items(self, session_id: str, names: List[str]) -> Dict[str, Dict]:
+        """이름 → 결과 (없는 파일은 빠짐)"""
+        if not names:
+            return {}
+        values = self._redis().hmget(ITEMS_KEY.format(session_id), names)
+        return {name: json.loads(data) for name, data in zip(names, values) if data}
+
+    async def aget_items(self, session_id: str, names: List[str]) -> Dict[str, Dict]:
+        if not names:
+            return {}
+        values = await get_async_redis_client().hmget(ITEMS_KEY.format(session_id), names)
+        return {name: json.loads(data) for name, data in zip(names, values) if data}
+
+    def iter_items(self, session_id: str, names: List[str]) -> Iterator[Tuple[int, str, Dict]]:
+        """names 순서대로 저장된 (위치, 이름, 결과)를 RESULT_CHUNK개씩 읽어 하나씩 넘긴다 (없는 파일은 건너뜀)"""
+        items_key = ITEMS_KEY.format(session_id)
+        for i in range(0, len(names), RESULT_CHUNK):
+            chunk = names[i:i + RESULT_CHUNK]
+            for j, data in enumerate(self._redis().hmget(items_key, chunk)):
+                if data:
+                    yield i + j, chunk[j], json.loads(data)
+
+    def iter_results(self, session_id: str, names: List[str]) -> Iterator[Dict]:
+        for _, _, result in self.iter_items(session_id, names):
+            yield result
+
+    def is_running(self, session_id: str) -> bool:
+        task = self._tasks.get(session_id)
+        return task is not None and not task.done()
+
+    # ---------------------------------------------------
+    # 등록 / 취소 / 재개
+    # ---------------------------------------------------
+    async def submit(
+        self,
+        session_id: str,
+        rubric: Optional[Dict] = None,
+        total: int = 0,
+        mode: Optional[str] = None,
+    ) -> None:
+        """
+        작업 등록. rubric/mode를 주면 세션 정보에 저장해 두고(재시작 시 재사용),
+        없으면 세션에 저장된 값으로 이어서 채점한다.
+        mode: "online"(기본, 스케줄러로 바로 호출) | "batch"(Batch API)
+        """
+        if self.is_running(session_id):
+            return
+
+        redis_client = get_async_redis_client()
+        if rubric is not None or mode is not None:
+            data = await redis_client.get(SESSION_KEY.format(session_id))
+            if not data:
+                print(f"❌ 세션 만료로 채점 작업 등록 실패: {session_id}")
+                await self._set_status(session_id, "error", message="세션을 찾을 수 없습니다")
+                return
+            info = json.loads(data)
+            # 기준이 바뀌었으면 이전 결과는 다시 채점
+            if rubric is not None and info.get("rubric") != rubric:
+                await redis_client.delete(ITEMS_KEY.format(session_id), EVENTS_KEY.format(session_id))
+            if rubric is not None:
+                info["rubric"] = rubric
+            if mode is not None:
+                info["mode"] = mode
+            # 새로 등록하는 작업은 새 배치로 (재개할 때만 저장된 배치를 기다림)
+            info.pop("batch_id", None)
+            await redis_client.setex(SESSION_KEY.format(session_id), SESSION_TTL, json.dumps(info, ensure_ascii=False))
+
+        done = await redis_client.hlen(ITEMS_KEY.format(session_id))
+        await self._set_status(session_id, "queued", done=done, total=total)
+
+        await self._ensure_heartbeat()
+        # await 사이에 같은 세션이 등록됐으면 그쪽에 맡긴다
+        if self.is_running(session_id):
+            return
+        task = asyncio.create_task(self._run(session_id))
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(session_id, None))
+        print(f"📥 채점 작업 등록: {session_id} (이미 채점 {done}개)")
+
+    async def cancel(self, session_id: str) -> None:
+        task = self._tasks.get(session_id)
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def retry_failed(self, session_id: str) -> int:
+        """
+        실패한 파일의 결과만 지우고 작업을 다시 등록한다 (성공한 파일은 건너뜀).
+        다시 채점할 파일 수 반환.
+        """
+        if self.is_running(session_id):
+            return 0
+        redis_client = get_async_redis_client()
+        items_key = ITEMS_KEY.format(session_id)
+        names = await redis_client.hkeys(items_key)
+        failed = []
+        for i in range(0, len(names), RESULT_CHUNK):
+            chunk = names[i:i + RESULT_CHUNK]
+            items = await self.aget_items(session_id, chunk)
+            failed += [n for n, result in items.items() if is_failed(result)]
+        if not failed:
+            return 0
+        await redis_client.hdel(items_key, *failed)
+        status = await self.aget_status(session_id) or {}
+        # 실패분은 보통 몇 개뿐이므로 배치로 돌렸던 세션도 온라인으로 다시 채점
+        await self.submit(session_id, total=status.get("total", 0), mode="online")
+        print(f"🔁 실패한 채점 재시도: {session_id} ({len(failed)}개)")
+        return len(failed)
+
+    async def resume_pending(self) -> int:
+        """서버 시작 시 끝나지 않은 작업을 다시 등록한다."""
+        resumed = 0
+        redis_client = get_async_redis_client()
+        async for key in redis_client.scan_iter(RESULT_KEY.format("*")):
+            session_id = key.split(":", 1)[1]
+            status = await self.aget_status(session_id) or {}
+            if status.get("status") not in ACTIVE_STATUSES:
+                continue
+            if not await redis_client.exists(SESSION_KEY.format(session_id)):
+                continue
+            await self.submit(session_id, total=status.get("total", 0))
+            resumed += 1
+        return resumed
+
+    # ---------------------------------------------------
+    # 락 / 하트비트
+    # ---------------------------------------------------
+    async def _ensure_heartbeat(self) -> None:
+        if self._heartbeat is None or self._heartbeat.done():
+            await self._beat()
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def _beat(self) -> None:
+        pipe = get_async_redis_client().pipeline()
+        pipe.setex(WORKER_KEY.format(self._worker_id), HEARTBEAT_TTL, "1")
+        # 파일 하나가 오래 걸려도 살아 있는 동안은 락이 풀리지 않게
+        for lock_key in self._held_locks:
+            pipe.expire(lock_key, LOCK_TTL)
+        await pipe.execute()
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            try:
+                await self._beat()
+            except Exception as e:
+                print(f"⚠️ 채점 워커 하트비트 실패: {e}")
+
+    async def _acquire(self, session_id: str) -> bool:
+        """락 획득. 주인 워커의 하트비트가 끊겼으면 넘겨받는다."""
+        redis_client = get_async_redis_client()
+        lock_key = LOCK_KEY.format(session_id)
+        acquired = bool(await redis_client.set(lock_key, self._worker_id, nx=True, ex=LOCK_TTL))
+        if not acquired:
+            holder = await redis_client.get(lock_key)
+            if holder == self._worker_id:
+                acquired = True
+            elif holder and not await redis_client.exists(WORKER_KEY.format(holder)):
+                acquired = bool(
+                    await redis_client.eval(_TAKEOVER_SCRIPT, 1, lock_key, holder, self._worker_id, LOCK_TTL)
+                )
+                if acquired:
+                    print(f"🔓 응답 없는 워커의 채점 락 인수: {session_id} (이전 워커 {holder[:8]})")
+        if acquired:
+            self._held_locks.add(lock_key)
+        return acquired
+
+    async def _release(self, session_id: str) -> None:
+        lock_key = LOCK_KEY.format(session_id)
+        self._held_locks.discard(lock_key)
+        await get_async_redis_client().eval(_RELEASE_SCRIPT, 1, lock_key, self._worker_id)
+
+    # ---------------------------------------------------
+    # 실행
+    # ---------------------------------------------------
+    async def _run(self, session_id: str) -> None:
+        while True:
+            async with self._sem():
+                if await self._acquire(session_id):
+                    try:
+                        await self._grade(session_id)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        print(f"❌ 채점 오류: {session_id} - {str(e)}")
+                        await self._set_status(session_id, "error", message=str(e))
+                    finally:
+                        await self._release(session_id)
+                    return
+
+            # 살아 있는 다른 워커가 채점 중: 끝났는지 / 그 워커가 죽었는지 나중에 다시 확인
+            status = await self.aget_status(session_id) or {}
+            if status.get("status") not in ACTIVE_STATUSES:
+                return
+            print(f"⏳ 다른 워커가 채점 중, {LOCK_RETRY_INTERVAL}초 후 다시 확인: {session_id}")
+            await asyncio.sleep(LOCK_RETRY_INTERVAL)
+
+    async def _grade(self, session_id: str) -> None:
+        redis_client = get_async_redis_client()
+        data = await redis_client.get(SESSION_KEY.format(session_id))
+        if not data:
+            raise RuntimeError("세션을 찾을 수 없습니다")
+        info = json.loads(data)
+        rubric = info["rubric"]
+        zip_path = info["zip_path"]
+
+        pipeline = GradingPipeline()
+        names = await asyncio.to_thread(pipeline.list_zip_pdfs, zip_path)
+        if not names:
+            raise RuntimeError("ZIP 파일에 PDF가 없습니다")
+
+        items_key = ITEMS_KEY.format(session_id)
+        graded = set(await redis_client.hkeys(items_key))
+        done_names = [n for n in names if n in graded]
+        # 재개한 작업은 이미 채점된 결과가 많을 수 있으므로 스레드에서 조금씩 읽어 센다
+        failed = await asyncio.to_thread(
+            lambda: sum(1 for r in self.iter_results(session_id, done_names) if is_failed(r))
+        )
+        progress = {"done": len(done_names), "total": len(names), "failed": failed}
+        print(f"🚀 채점 작업 시작: {session_id} ({progress['done']}/{progress['total']} 완료 상태에서)")
+        await self._set_status(session_id, "processing", **progress)
+        started = time.monotonic()
+        graded_now = 0
+
+        async def on_result(name: str, result: Dict) -> None:
+            nonlocal graded_now
+            # 파일마다 호출되므로 이벤트 루프를 막지 않도록 비동기 클라이언트로 한 번에 보낸다
+            pipe = redis_client.pipeline()
+            pipe.hset(items_key, name, json.dumps(result, ensure_ascii=False, separators=(",", ":")))
+            pipe.expire(items_key, SESSION_TTL)
+            pipe.expire(SESSION_KEY.format(session_id), SESSION_TTL)
+            pipe.expire(LOCK_KEY.format(session_id), LOCK_TTL)
+            progress["done"] += 1
+            if is_failed(result):
+                progress["failed"] += 1
+            graded_now += 1
+            # 이번 실행에서 채점한 건수 기준 처리량과 남은 시간
+            per_second = graded_now / max(time.monotonic() - started, 1e-6)
+            progress["throughput_per_min"] = round(per_second * 60, 1)
+            progress["eta_seconds"] = round(max(progress["total"] - progress["done"], 0) / per_second)
+            pipe.setex(
+                RESULT_KEY.format(session_id),
+                SESSION_TTL,
+                json.dumps({"status": "processing", **progress}, ensure_ascii=False),
+            )
+            self._publish(pipe, session_id, "result", name)
+            await pipe.execute()
+
+        if info.get("mode") == "batch":
+            async def on_batch(batch_id: str) -> None:
+                info["batch_id"] = batch_id
+                await redis_client.setex(
+                    SESSION_KEY.format(session_id), SESSION_TTL, json.dumps(info, ensure_ascii=False)
+                )
+
+            async def on_status(batch) -> None:
+                # 배치는 몇 시간 걸릴 수 있으므로 폴링할 때마다 세션/락 TTL 연장
+                pipe = redis_client.pipeline()
+                pipe.expire(SESSION_KEY.format(session_id), SESSION_TTL)
+                pipe.expire(items_key, SESSION_TTL)
+                pipe.expire(LOCK_KEY.format(session_id), LOCK_TTL)
+                await pipe.execute()
+                counts = getattr(batch, "request_counts", None)
+                await self._set_status(
+                    session_id,
+                    "processing",
+                    batch_id=batch.id,
+                    batch_status=batch.status,
+                    batch_completed=getattr(counts, "completed", 0) if counts else 0,
+                    **progress,
+                )
+
+            await pipeline.grade_assignments_batch(
+                pipeline.iter_zip_pdfs(zip_path, skip=graded),
+                rubric,
+                on_result=on_result,
+                batch_id=info.get("batch_id"),
+                on_batch=on_batch,
+                on_status=on_status,
+            )
+        else:
+            await pipeline.grade_assignments_parallel(
+                pipeline.iter_zip_pdfs(zip_path, skip=graded), rubric, on_result=on_result
+            )
+
+        # ZIP 순서대로 해시에서 조금씩 읽어 보고서 작성 (재시작 전 결과 포함)
+        report_dir = session_dir(session_id, create=True)
+        excel_path = os.path.join(report_dir, REPORT_FILENAME)
+        csv_path = os.path.join(report_dir, REPORT_CSV_FILENAME)
+        summary = await asyncio.to_thread(
+            write_reports, self.iter_results(session_id, names), rubric, [excel_path, csv_path]
+        )
+        # 영속 저장 실패는 채점 결과(Redis)에 영향을 주지 않는다
+        try:
+            saved = await asyncio.to_thread(
+                save_job_results,
+                session_id,
+                info,
+                {**summary, "total_files": len(names)},
+                self.iter_items(session_id, names),
+            )
+            print(f"🗄️ 채점 결과 DB 저장: {session_id} ({saved}개)")
+        except Exception as e:
+            print(f"⚠️ 채점 결과 DB 저장 실패: {session_id} - {e}")
+
+        await self._set_status(
+            session_id,
+            "completed",
+            excel_path=excel_path,
+            csv_path=csv_path,
+            total_files=len(names),
+            average_score=summary["average_score"],
+            **{**progress, "failed": summary["failed"], "eta_seconds": 0},
+        )
+        print(f"✅ 채점 작업 완료: {session_id} ({summary['rows']}개, 실패 {summary['failed']}개)")
+
+
+grading_jobs = GradingJobManager()
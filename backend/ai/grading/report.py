@@ -0,0 +1,105 @@
+# backend/ai/grading/report.py
+
+"""
+채점 보고서 스트리밍 작성기
+
+결과를 한 행씩 바로 파일에 쓴다. Excel은 openpyxl write-only 모드(행을 임시 XML로 흘려 씀),
+CSV는 Excel에서 한글이 깨지지 않도록 UTF-8 BOM으로 쓴다.
+DataFrame/리스트에 전체 결과를 모으지 않으므로 수강생 수와 관계없이 메모리 사용량이 일정하다.
+"""
+
+import csv
+import os
+from typing import Dict, Iterable, List
+
+from openpyxl import Workbook
+
+BASE_COLUMNS = ["파일명", "학번", "이름", "과제명"]
+
+
+def report_columns(rubric: Dict) -> List[str]:
+    return BASE_COLUMNS + [f"{item}_점수" for item in rubric.keys()] + ["총점", "피드백"]
+
+
+def report_row(result: Dict, rubric: Dict) -> List:
+    scores = result.get("scores") or {}
+    return [
+        result.get("filename", ""),
+        result.get("student_id", ""),
+        result.get("name", ""),
+        result.get("assignment", ""),
+        *[scores.get(item, 0) for item in rubric.keys()],
+        result.get("total_score", 0),
+        result.get("feedback", ""),
+    ]
+
+
+class ReportWriter:
+    """확장자(.xlsx / .csv)에 따라 형식을 정하고 append()마다 한 행씩 기록"""
+
+    def __init__(self, path: str, rubric: Dict):
+        self.path = path
+        self.rubric = rubric
+        self.rows = 0
+        self._csv_file = None
+        self._workbook = None
+
+        if os.path.splitext(path)[1].lower() == ".csv":
+            self._csv_file = open(path, "w", encoding="utf-8-sig", newline="")
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(report_columns(rubric))
+        else:
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet("채점 결과")
+            self._sheet.append(report_columns(rubric))
+
+    def append(self, result: Dict) -> None:
+        row = report_row(result, self.rubric)
+        if self._csv_file is not None:
+            self._csv.writerow(row)
+        else:
+            self._sheet.append(row)
+        self.rows += 1
+
+    def close(self) -> None:
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+        elif self._workbook is not None:
+            self._workbook.save(self.path)
+            self._workbook = None
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_reports(results: Iterable[Dict], rubric: Dict, paths: Iterable[str]) -> Dict:
+    """
+    결과를 한 번만 순회하면서 여러 형식의 보고서를 함께 쓴다.
+    요약(행 수, 실패 수, 평균 점수) 반환.
+    """
+    writers = [ReportWriter(path, rubric) for path in paths]
+    count = failed = 0
+    score_sum = 0.0
+    try:
+        for result in results:
+            for writer in writers:
+                writer.append(result)
+            count += 1
+            if result.get("status") == "failed":
+                failed += 1
+            else:
+                score_sum += float(result.get("total_score") or 0)
+    finally:
+        for writer in writers:
+            writer.close()
+
+    graded = count - failed
+    return {
+        "rows": count,
+        "failed": failed,
+        "average_score": round(score_sum / graded, 2) if graded else 0.0,
+    }
@@ -0,0 +1,178 @@
+# backend/ai/grading/repository.py
+
+"""
+채점 결과 영속 저장소 (PostgreSQL, backend/db/models.py의 GradingJob / GradingSubmission)
+
+Redis 해시는 채점 중 작업 공간이고, 작업이 끝나면 결과를 여기로 옮겨 둔다.
+- 저장: 해당 작업의 이전 행을 지우고 SUBMISSION_CHUNK개씩 묶어 bulk insert (executemany)
+- 조회: 작업 목록 / 제출물 목록을 offset·limit 페이지로, 학번·과제명·상태로 필터
+- 보고서 재생성: position 기준 keyset 페이지로 끝까지 스트리밍
+"""
+
+import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+
+from backend.db.models import GradingJob, GradingSubmission
+from backend.db.session import SessionLocal
+
+SUBMISSION_CHUNK = 500
+
+
+def _number(value: Any):
+    value = float(value or 0)
+    return int(value) if value.is_integer() else value
+
+
+def _submission_row(job_id: str, position: int, member_name: str, result: Dict) -> Dict:
+    return {
+        "job_id": job_id,
+        "member_name": member_name,
+        "position": position,
+        "filename": result.get("filename", ""),
+        "student_id": result.get("student_id") or None,
+        "name": result.get("name") or None,
+        "assignment": result.get("assignment") or None,
+        "status": result.get("status", "graded"),
+        "scores": result.get("scores") or {},
+        "total_score": float(result.get("total_score") or 0),
+        "feedback": result.get("feedback"),
+        "error": result.get("error"),
+    }
+
+
+def _to_result(row: GradingSubmission) -> Dict:
+    """파이프라인 결과와 같은 모양으로"""
+    result = {
+        "filename": row.filename,
+        "student_id": row.student_id or "",
+        "name": row.name or "",
+        "assignment": row.assignment or "",
+        "status": row.status,
+        "scores": {k: _number(v) for k, v in (row.scores or {}).items()},
+        "total_score": _number(row.total_score),
+        "feedback": row.feedback or "",
+    }
+    if row.error:
+        result["error"] = row.error
+    return result
+
+
+def _to_job(job: GradingJob) -> Dict:
+    return {
+        "session_id": job.id,
+        "filename": job.filename,
+        "rubric": job.rubric,
+        "mode": job.mode,
+        "status": job.status,
+        "total_files": job.total_files,
+        "failed": job.failed,
+        "average_score": job.average_score,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+
+
+def save_job_results(
+    session_id: str,
+    info: Dict,
+    summary: Dict,
+    items: Iterable[Tuple[int, str, Dict]],
+) -> int:
+    """
+    작업 요약과 (position, 멤버 이름, 결과)를 저장한다. 같은 작업을 다시 저장하면(실패분 재채점 후)
+    이전 행을 지우고 새로 넣는다. 저장한 제출물 수 반환.
+    """
+    with SessionLocal() as db:
+        job = db.get(GradingJob, session_id) or GradingJob(id=session_id)
+        job.filename = info.get("filename")
+        job.rubric = info.get("rubric") or {}
+        job.mode = info.get("mode") or "online"
+        job.status = "completed"
+        job.total_files = summary.get("total_files", 0)
+        job.failed = summary.get("failed", 0)
+        job.average_score = summary.get("average_score", 0.0)
+        job.completed_at = datetime.datetime.now()
+        db.add(job)
+        db.flush()
+
+        db.execute(delete(GradingSubmission).where(GradingSubmission.job_id == session_id))
+        saved = 0
+        chunk: List[Dict] = []
+        for position, member_name, result in items:
+            chunk.append(_submission_row(session_id, position, member_name, result))
+            if len(chunk) >= SUBMISSION_CHUNK:
+                db.execute(insert(GradingSubmission), chunk)
+                saved += len(chunk)
+                chunk = []
+        if chunk:
+            db.execute(insert(GradingSubmission), chunk)
+            saved += len(chunk)
+        db.commit()
+    return saved
+
+
+def get_job(session_id: str) -> Optional[Dict]:
+    with SessionLocal() as db:
+        job = db.get(GradingJob, session_id)
+        return _to_job(job) if job else None
+
+
+def list_jobs(offset: int = 0, limit: int = 20) -> Tuple[int, List[Dict]]:
+    """최근 작업부터"""
+    with SessionLocal() as db:
+        total = db.scalar(select(func.count()).select_from(GradingJob))
+        jobs = db.scalars(
+            select(GradingJob).order_by(GradingJob.created_at.desc()).offset(offset).limit(limit)
+        ).all()
+        return total, [_to_job(job) for job in jobs]
+
+
+def list_submissions(
+    session_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    student_id: Optional[str] = None,
+    assignment: Optional[str] = None,
+    status: Optional[str] = None,
+    order: str = "position",
+) -> Tuple[int, List[Dict]]:
+    """제출물 결과 페이지. order: position(ZIP 순서) | score(총점 높은 순)"""
+    conditions = [GradingSubmission.job_id == session_id]
+    if student_id:
+        conditions.append(GradingSubmission.student_id == student_id)
+    if assignment:
+        conditions.append(GradingSubmission.assignment == assignment)
+    if status:
+        conditions.append(GradingSubmission.status == status)
+    ordering = (
+        (GradingSubmission.total_score.desc(), GradingSubmission.position)
+        if order == "score"
+        else (GradingSubmission.position,)
+    )
+
+    with SessionLocal() as db:
+        total = db.scalar(select(func.count()).select_from(GradingSubmission).where(*conditions))
+        rows = db.scalars(
+            select(GradingSubmission).where(*conditions).order_by(*ordering).offset(offset).limit(limit)
+        ).all()
+        return total, [_to_result(row) for row in rows]
+
+
+def iter_submissions(session_id: str, chunk: int = SUBMISSION_CHUNK) -> Iterator[Dict]:
+    """ZIP 순서대로 전체 결과를 chunk개씩 읽어 하나씩 넘긴다 (보고서 재생성용)"""
+    last = -1
+    while True:
+        with SessionLocal() as db:
+            rows = db.scalars(
+                select(GradingSubmission)
+                .where(GradingSubmission.job_id == session_id, GradingSubmission.position > last)
+                .order_by(GradingSubmission.position)
+                .limit(chunk)
+            ).all()
+            results = [_to_result(row) for row in rows]
+        if not results:
+            return
+        last = rows[-1].position
+        yield from results
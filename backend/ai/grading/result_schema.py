@@ -0,0 +1,119 @@
+# backend/ai/grading/result_schema.py
+
+"""
+채점 결과 스키마
+
+루브릭 항목명으로 pydantic 모델을 만들어 LLM 응답을 검증한다.
+- 항목별 점수: 0 이상, 배점 이하 (배점이 숫자가 아니면 하한만)
+- total_score: 항목 점수 합으로 다시 계산 (LLM이 준 총점은 쓰지 않음)
+- feedback: 빈 문자열 불가
+검증에 실패한 필드 경로(invalid_fields)만 골라 LLM에 다시 물어보고 기존 응답에 합친다.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model, model_validator
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def _max_score(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_result_model(rubric: Dict) -> Type[BaseModel]:
+    """루브릭 항목을 필드로 갖는 채점 결과 모델 (항목명은 alias, 한글/공백 허용)"""
+    fields = {}
+    for i, (name, max_score) in enumerate(rubric.items()):
+        limit = _max_score(max_score)
+        field = Field(..., alias=str(name), ge=0, le=limit) if limit is not None else Field(..., alias=str(name), ge=0)
+        fields[f"item_{i}"] = (float, field)
+
+    scores_model = create_model(
+        "RubricScores",
+        __config__=ConfigDict(populate_by_name=True, extra="ignore"),
+        **fields,
+    )
+
+    class GradingResult(BaseModel):
+        scores: scores_model
+        total_score: Optional[float] = None
+        feedback: str = Field(..., min_length=1)
+
+        @model_validator(mode="after")
+        def _fill_total(self):
+            # LLM이 계산한 총점은 틀리는 경우가 있어 항목 점수(배점 이하로 검증됨) 합으로 덮어쓴다
+            self.total_score = sum(self.scores.model_dump().values())
+            return self
+
+    return GradingResult
+
+
+def extract_json(text: str) -> Dict:
+    """
+    응답에서 JSON 객체를 꺼낸다 (코드 펜스, 앞뒤 설명 문장 허용).
+    객체를 찾지 못하면 ValueError.
+    """
+    text = text.strip()
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        raise ValueError("응답에 JSON 객체가 없습니다")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("응답이 JSON 객체가 아닙니다")
+    return data
+
+
+def _field_path(model: Type[BaseModel], loc: Tuple) -> str:
+    # scores 하위 필드는 alias(루브릭 항목명)로 표시
+    if len(loc) >= 2 and loc[0] == "scores":
+        scores_model = model.model_fields["scores"].annotation
+        info = scores_model.model_fields.get(str(loc[1]))
+        return f"scores.{info.alias if info else loc[1]}"
+    return str(loc[0]) if loc else "(root)"
+
+
+def validate_result(model: Type[BaseModel], data: Dict) -> Tuple[Optional[Dict], List[str]]:
+    """
+    (정규화된 결과, 오류 목록) 반환. 오류 항목은 "필드경로: 메시지" 형식.
+    점수는 정수로 떨어지면 int로 돌려준다.
+    """
+    try:
+        parsed = model.model_validate(data)
+    except ValidationError as e:
+        return None, [f"{_field_path(model, err['loc'])}: {err['msg']}" for err in e.errors()]
+
+    result = parsed.model_dump(by_alias=True)
+    result["scores"] = {k: _compact(v) for k, v in result["scores"].items()}
+    result["total_score"] = _compact(result["total_score"])
+    return result, []
+
+
+def invalid_fields(errors: List[str]) -> List[str]:
+    return sorted({e.split(":", 1)[0] for e in errors})
+
+
+def merge_partial(base: Dict, patch: Dict) -> Dict:
+    """부분 응답(잘못된 필드만 다시 받은 것)을 기존 응답에 합친다"""
+    merged = dict(base)
+    for key, value in patch.items():
+        if key == "scores" and isinstance(value, dict) and isinstance(merged.get("scores"), dict):
+            merged["scores"] = {**merged["scores"], **value}
+        else:
+            merged[key] = value
+    # 점수만 고쳐 받았으면 이전 총점은 버리고 항목 합으로 다시 계산
+    if "scores" in patch and "total_score" not in patch:
+        merged.pop("total_score", None)
+    return merged
+
+
+def _compact(value: float):
+    return int(value) if float(value).is_integer() else value
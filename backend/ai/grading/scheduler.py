@@ -0,0 +1,216 @@
+# backend/ai/grading/scheduler.py
+
+"""
+채점 LLM 호출 스케줄러
+
+고정 크기 스레드풀 대신 비동기로 호출하되,
+1) 토큰 버킷: 예상 프롬프트 토큰 기준으로 분당 토큰(GRADING_TPM_LIMIT)을 넘지 않게 대기
+2) AIMD 동시성: 정상 응답마다 동시 호출 한도를 조금씩 올리고(+1/limit),
+   429나 지연 급증 시 곱셈으로 줄인다 (×0.5 / ×0.8)
+3) 재시도: 429·타임아웃·5xx는 지수 백오프(+jitter), Retry-After가 있으면 그 값을 따른다
+한 프로세스의 모든 채점 작업이 같은 스케줄러를 공유하므로 쿼터도 함께 나눠 쓴다.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+from backend.core.config import settings
+
+T = TypeVar("T")
+
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+class TokenBucket:
+    """분당 토큰 한도 (capacity = 1분치)"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, n: int) -> float:
+        """n 토큰이 모일 때까지 기다린다. 기다린 시간(초) 반환."""
+        n = min(float(n), self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return waited
+                delay = (n - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def adjust(self, delta: float) -> None:
+        """실제 사용량이 예상과 다를 때 보정 (양수면 돌려받음)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class AIMDLimiter:
+    """동시 호출 한도를 AIMD로 조정하는 세마포어"""
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int, latency_target: float):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        # 최근 응답 지연 EWMA. 감소는 한 RTT에 한 번만 (동시에 몰린 429 여러 개로 연달아 깎이지 않도록)
+        self.rtt = latency_target / 4
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.rtt:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * factor)
+
+    def on_success(self, latency: float) -> None:
+        self.rtt = 0.8 * self.rtt + 0.2 * latency
+        if latency > self.latency_target:
+            self._decrease(0.8)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def on_rate_limited(self) -> None:
+        self._decrease(0.5)
+
+
+def _retry_after(error: RateLimitError) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+
+
+class GradingScheduler:
+
+    def __init__(self):
+        self.bucket = TokenBucket(settings.grading_tpm_limit)
+        self.limiter = AIMDLimiter(
+            initial=settings.grading_initial_concurrency,
+            min_limit=1,
+            max_limit=settings.grading_max_concurrency,
+            latency_target=settings.grading_latency_target,
+        )
+        self._stats = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "transient_errors": 0,
+            "latency_sum": 0.0,
+            "bucket_wait_sum": 0.0,
+            "submissions": 0,
+        }
+        self._started: Optional[float] = None
+
+    async def call(self, fn: Callable[[], Awaitable[T]], estimated_tokens: int) -> T:
+        """
+        fn()을 한도 안에서 실행한다. 재시도할 수 없는 오류나 시도 횟수 초과 시 마지막 예외를 올린다.
+        """
+        if self._started is None:
+            self._started = time.monotonic()
+        max_attempts = settings.grading_max_attempts
+
+        for attempt in range(max_attempts):
+            self._stats["bucket_wait_sum"] += await self.bucket.acquire(estimated_tokens)
+            await self.limiter.acquire()
+            self._stats["calls"] += 1
+            started = time.monotonic()
+            try:
+                result = await fn()
+            except RateLimitError as e:
+                # 쿼터 소진은 기다려도 풀리지 않는다
+                if getattr(e, "code", None) == "insufficient_quota":
+                    self._stats["failed"] += 1
+                    raise
+                self._stats["rate_limited"] += 1
+                self.limiter.on_rate_limited()
+                error, delay = e, _retry_after(e) or _backoff(attempt)
+            except (APITimeoutError, APIConnectionError, InternalServerError) as e:
+                self._stats["transient_errors"] += 1
+                error, delay = e, _backoff(attempt)
+            except Exception:
+                self._stats["failed"] += 1
+                raise
+            else:
+                latency = time.monotonic() - started
+                self._stats["succeeded"] += 1
+                self._stats["latency_sum"] += latency
+                self.limiter.on_success(latency)
+                return result
+            finally:
+                await self.limiter.release()
+
+            if attempt == max_attempts - 1:
+                self._stats["failed"] += 1
+                raise error
+            self._stats["retries"] += 1
+            print(f"⏳ 채점 LLM 재시도 {attempt + 1}/{max_attempts - 1}: {delay:.1f}초 후 ({type(error).__name__})")
+            await asyncio.sleep(delay)
+
+        raise RuntimeError("unreachable")
+
+    def record_submission(self) -> None:
+        self._stats["submissions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        latency_sum = stats.pop("latency_sum")
+        bucket_wait_sum = stats.pop("bucket_wait_sum")
+        stats.update({
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "bucket_tokens": int(self.bucket.tokens),
+            "avg_latency_s": round(latency_sum / stats["succeeded"], 2) if stats["succeeded"] else 0.0,
+            "avg_bucket_wait_s": round(bucket_wait_sum / stats["calls"], 2) if stats["calls"] else 0.0,
+            "submissions_per_min": round(stats["submissions"] / elapsed * 60, 1) if elapsed else 0.0,
+        })
+        return stats
+
+
+_scheduler: Optional[GradingScheduler] = None
+
+
+def get_grading_scheduler() -> GradingScheduler:
+    """프로세스 전역 채점 스케줄러 (모든 채점 작업이 공유)"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = GradingScheduler()
+    return _scheduler
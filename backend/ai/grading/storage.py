@@ -0,0 +1,80 @@
+# backend/ai/grading/storage.py
+
+"""
+채점 세션 파일 저장소
+
+세션마다 {UPLOAD_DIR}/grading/{session_id}/ 디렉터리 하나에 업로드 ZIP과 Excel/CSV 보고서를 두고,
+정리할 때는 디렉터리째 지운다. PDF는 ZIP 멤버에서 바로 읽으므로 압축을 풀지 않는다.
+Redis 세션이 만료된 뒤 남은 디렉터리는 서버 시작 시 청소한다.
+"""
+
+import os
+import shutil
+import time
+
+from fastapi import UploadFile
+
+from backend.core.config import settings
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_FILENAME = "assignments.zip"
+REPORT_FILENAME = "grading_results.xlsx"
+REPORT_CSV_FILENAME = "grading_results.csv"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def grading_root() -> str:
+    return os.path.join(settings.upload_dir, "grading")
+
+
+def session_dir(session_id: str, create: bool = False) -> str:
+    path = os.path.join(grading_root(), session_id)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+async def save_upload(file: UploadFile, dest: str, max_bytes: int) -> int:
+    """
+    업로드 파일을 청크 단위로 디스크에 쓴다 (메모리에 전체를 올리지 않음).
+    max_bytes를 넘으면 쓰던 파일을 지우고 UploadTooLarge.
+    """
+    written = 0
+    try:
+        with open(dest, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLarge(f"업로드 크기 제한({max_bytes // (1024 * 1024)}MB) 초과")
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(dest):
+            os.unlink(dest)
+        raise
+    return written
+
+
+def remove_session(session_id: str) -> None:
+    shutil.rmtree(session_dir(session_id), ignore_errors=True)
+
+
+def sweep_stale_sessions(max_age_seconds: float) -> int:
+    """max_age_seconds보다 오래된 세션 디렉터리를 지운다. 지운 개수 반환."""
+    root = grading_root()
+    if not os.path.isdir(root):
+        return 0
+
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
@@ -3,9 +3,44 @@ load_dotenv()
 
 import os
 import json
+import asyncio
+import weakref
 from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_community.document_loaders import PyPDFLoader
+
+from backend.ai.tokens import count_tokens, split_by_tokens, truncate_to_tokens
+from backend.core.artifact_store import content_hash, get_artifact_store, make_key
+from backend.core.config import settings
+from backend.core.llm_factory import get_chat_model
+from backend.services.pdf_extract import get_pdf_extractor
+
+
+LECTURE_MODEL = "gpt-4o-mini"
+# 프롬프트/파싱을 바꾸면 올려서 이전 캐시를 무효화
+LECTURE_PROMPT_VERSION = 1
+
+# 같은 강의 PDF(내용 해시)의 단원 분리 / 문제 생성 결과 캐시 (core/artifact_store.py)
+CHAPTERS_NAMESPACE = "lecture_chapters"
+QUIZ_NAMESPACE = "lecture_quiz"
+
+# 같은 키를 동시에 만들지 않도록 (여러 학생이 같은 PDF를 동시에 올린 경우 한 번만 호출)
+_key_locks = weakref.WeakValueDictionary()
+
+
+def _key_lock(key):
+    lock = _key_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _key_locks[key] = lock
+    return lock
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def quiz_cache_key(chapters):
+    return make_key(chapters, LECTURE_MODEL, LECTURE_PROMPT_VERSION)
 
 
 # ============================================
@@ -37,63 +72,64 @@ PDF 내용:
 """
 )
 
-# ============================================
-# 📌 2. 강의 PDF 로더
-# ============================================
-class LectureProcessor:
-
-    def __init__(self, pdf_path):
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"PDF 없음: {pdf_path}")
-
-        self.pdf_path = pdf_path
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.2
-        )
-
-    # -----------------------------
-    # 📄 PDF → 텍스트 로딩
-    # -----------------------------
-    def load_pdf(self):
-        print("📄 PDF 로딩 중…")
-        loader = PyPDFLoader(self.pdf_path)
-        pages = loader.load()
-        return "\n".join([p.page_content for p in pages])
-
-    # -----------------------------
-    # 📚 단원 자동 분리
-    # -----------------------------
-    def split_chapters(self, text):
-        print("📚 단원 자동 분리 중...")
+# 긴 PDF: 페이지 구간별로 단원 경계/요약 찾기 (map) → 목차를 모아 단원으로 합치기 (reduce)
+window_llm_prompt = PromptTemplate(
+    input_variables=["start", "end", "total", "content"],
+    template="""
+당신은 강의 PDF 내용을 분석하여 단원을 자동으로 분리하는 AI입니다.
+PDF가 길어 페이지 구간별로 나누어 읽고 있습니다. 지금은 전체 {total}페이지 중 {start}~{end}페이지입니다.
+각 페이지는 [p.번호] 표시로 시작합니다.
 
-        response = self.llm.invoke(
-            chapter_llm_prompt.format(content=text)
-        )
+이 구간에서 새로 시작하는 단원(섹션)을 모두 찾고, 각 단원의 이 구간 안 내용을 요약하세요.
+구간 첫 부분이 앞 구간에서 이어지는 내용이면 첫 항목의 "이어짐"을 true로 하세요.
+JSON 형식으로만 출력하세요.
 
-        raw = response.content.strip()
+{{
+  "sections": [
+    {{
+      "단원제목": "단원 제목",
+      "시작페이지": 1,
+      "이어짐": false,
+      "요약": "요약 내용",
+      "핵심키워드": ["키워드1", "키워드2"]
+    }}
+  ]
+}}
 
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            raw = raw.replace("json", "").strip()
+PDF 내용:
+{content}
+"""
+)
 
-        try:
-            return json.loads(raw)
-        except Exception:
-            print("❌ JSON 파싱 실패. 원본 출력:")
-            print(raw)
-            raise
+merge_llm_prompt = PromptTemplate(
+    input_variables=["outline"],
+    template="""
+당신은 강의 PDF 내용을 분석하여 단원을 자동으로 분리하는 AI입니다.
+아래는 긴 강의 PDF를 구간별로 읽고 찾은 섹션 목록(페이지 순서)입니다.
+같은 주제가 이어지는 섹션은 하나의 단원으로 합치고, 단원별 요약과 핵심키워드를 정리하세요.
+단원 순서는 페이지 순서를 따르세요. JSON 형식으로만 출력하세요.
 
-    # -----------------------------
-    # 📝 단원별 문제 생성 (선택지 + 해설 추가)
-    # -----------------------------
-    def generate_questions(self, chapters):
+{{
+  "chapters": [
+    {{
+      "단원제목": "단원 제목",
+      "요약": "요약 내용",
+      "핵심키워드": ["키워드1", "키워드2"]
+    }}
+  ]
+}}
 
-        print("📝 단원별 문제 생성 중…")
+섹션 목록:
+{outline}
+"""
+)
 
-        question_prompt = PromptTemplate(
-            input_variables=["chapter_title", "summary"],
-            template="""
+# ============================================
+# 📌 2. 단원별 문제 생성 프롬프트
+# ============================================
+question_llm_prompt = PromptTemplate(
+    input_variables=["chapter_title", "summary"],
+    template="""
 당신은 대학 강의 평가 문제 생성 AI입니다.
 
 아래 단원의 요약을 기반으로 정확한 객관식 문제 3개를 생성하세요.
@@ -122,37 +158,286 @@ class LectureProcessor:
 단원 요약:
 {summary}
 """
+)
+
+
+def _parse_json(raw):
+    # 코드블록 제거
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        raw = raw.replace("json", "").strip()
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        # 앞뒤에 설명이 붙은 경우 가장 바깥 중괄호만
+        start, end = raw.find("{"), raw.rfind("}")
+        if start < 0 or end <= start:
+            raise
+        return json.loads(raw[start:end + 1])
+
+
+def build_windows(pages, max_tokens, model=LECTURE_MODEL):
+    """
+    페이지들을 순서대로 max_tokens 안에 들어가게 묶는다 → [(시작페이지, 끝페이지, 텍스트)].
+    한 페이지가 max_tokens보다 길면 그 페이지만 토큰 단위로 잘라 여러 구간으로 만든다.
+    """
+    windows = []
+    current, current_tokens, first = [], 0, 1
+
+    def flush(last):
+        nonlocal current, current_tokens
+        if current:
+            windows.append((first, last, "\n".join(current)))
+        current, current_tokens = [], 0
+
+    for number, text in enumerate(pages, 1):
+        block = f"[p.{number}]\n{text}"
+        tokens = count_tokens(block, model)
+        if tokens > max_tokens:
+            flush(number - 1)
+            for piece in split_by_tokens(text, max(1, max_tokens - 10), model=model):
+                windows.append((number, number, f"[p.{number}]\n{piece}"))
+            first = number + 1
+            continue
+        if current and current_tokens + tokens > max_tokens:
+            flush(number - 1)
+        if not current:
+            first = number
+        current.append(block)
+        current_tokens += tokens
+    flush(len(pages))
+    return windows
+
+
+# ============================================
+# 📌 3. 강의 PDF 로더
+# ============================================
+class LectureProcessor:
+
+    def __init__(self, pdf_path, digest=None):
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDF 없음: {pdf_path}")
+
+        self.pdf_path = pdf_path
+        # PDF 내용 해시 (업로드 때 계산해 두었으면 그대로 사용)
+        self.digest = digest
+        self.llm = get_chat_model(LECTURE_MODEL, temperature=0.2)
+
+    async def adigest(self):
+        if self.digest is None:
+            self.digest = content_hash(await asyncio.to_thread(_read_file, self.pdf_path))
+        return self.digest
+
+    def chapters_cache_key(self, digest):
+        # 단원 분리 결과는 분할 방식/토큰 한도에 따라 달라진다
+        return make_key(
+            digest,
+            LECTURE_MODEL,
+            LECTURE_PROMPT_VERSION,
+            settings.lecture_segmentation,
+            settings.lecture_max_prompt_tokens,
+            settings.lecture_window_tokens,
         )
 
-        results = []
+    # -----------------------------
+    # ⚡ 캐시를 거치는 단원 분리 / 문제 생성
+    # -----------------------------
+    async def asummarize(self):
+        """(캐시 키, 단원 JSON, 캐시 적중 여부). 같은 PDF는 텍스트 추출과 LLM 호출 없이 캐시에서"""
+        key = self.chapters_cache_key(await self.adigest())
+        store = get_artifact_store()
+
+        async with _key_lock(f"{CHAPTERS_NAMESPACE}:{key}"):
+            chapters = await asyncio.to_thread(store.get, CHAPTERS_NAMESPACE, key)
+            if chapters is not None:
+                print(f"⚡ 단원 분리 캐시 적중: {self.digest[:12]}")
+                return key, chapters, True
+
+            chapters = await self.asplit_chapters(await self.aload_pages())
+            await asyncio.to_thread(store.put, CHAPTERS_NAMESPACE, key, chapters)
+        return key, chapters, False
+
+    async def aquiz(self, chapters):
+        """
+        (캐시 키, 단원별 문제, 캐시 적중 여부). 단원 JSON이 같으면 문제를 재사용하고,
+        캐시에 실패한 단원이 있으면 그 단원만 다시 생성해 캐시를 갱신한다.
+        """
+        key = quiz_cache_key(chapters)
+        store = get_artifact_store()
+
+        async with _key_lock(f"{QUIZ_NAMESPACE}:{key}"):
+            cached = await asyncio.to_thread(store.get, QUIZ_NAMESPACE, key)
+            if cached is not None and not any(item.get("error") for item in cached):
+                print("⚡ 문제 생성 캐시 적중")
+                return key, cached, True
+
+            questions = await self.agenerate_questions(chapters, previous=cached)
+            await asyncio.to_thread(store.put, QUIZ_NAMESPACE, key, questions)
+        return key, questions, False
 
-        for chap in chapters["chapters"]:
-            title = chap["단원제목"]
-            summary = chap["요약"]
+    # -----------------------------
+    # 📄 PDF → 텍스트 로딩
+    # -----------------------------
+    async def aload_pages(self):
+        # 페이지 구간별 단원 분리(asplit_chapters)용 페이지 목록
+        print("📄 PDF 로딩 중…")
+        return await get_pdf_extractor().extract_pages(self.pdf_path, await self.adigest())
+
+    async def _ainvoke_json(self, prompt, semaphore, label):
+        """LLM 호출 + JSON 파싱. 실패하면 백오프 후 재시도 (LECTURE_LLM_ATTEMPTS), 끝내 실패하면 마지막 예외"""
+        attempts = max(1, settings.lecture_llm_attempts)
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(2 ** (attempt - 1))
+            async with semaphore:
+                try:
+                    response = await self.llm.ainvoke(prompt)
+                    return _parse_json(response.content)
+                except Exception as e:
+                    print(f"⚠️ {label} 실패 ({attempt + 1}/{attempts}): {e}")
+                    if attempt == attempts - 1:
+                        raise
 
-            # LLM 호출
-            response = self.llm.invoke(
-                question_prompt.format(
-                    chapter_title=title,
-                    summary=summary
-                )
-            )
+    # -----------------------------
+    # 📚 단원 자동 분리
+    # -----------------------------
+    async def asplit_chapters(self, pages):
+        """
+        단원 분리. pages는 페이지별 텍스트 목록(또는 전체 텍스트).
+        LECTURE_SEGMENTATION=auto면 LECTURE_MAX_PROMPT_TOKENS 안에 들어오는 PDF는 한 번에,
+        넘는 PDF는 페이지 구간별로 동시에 처리한 뒤 합친다 (single / map_reduce로 고정 가능).
+        """
+        if isinstance(pages, str):
+            pages = [pages]
+        text = "\n".join(pages)
+        mode = settings.lecture_segmentation
+        if mode == "auto":
+            too_long = count_tokens(text, LECTURE_MODEL) > settings.lecture_max_prompt_tokens
+            mode = "map_reduce" if too_long else "single"
+
+        if mode == "map_reduce":
+            return await self._split_chapters_windows(pages)
 
-            raw = response.content.strip()
+        print("📚 단원 자동 분리 중...")
+        response = await self.llm.ainvoke(chapter_llm_prompt.format(content=text))
+        try:
+            return _parse_json(response.content)
+        except Exception:
+            print("❌ JSON 파싱 실패. 원본 출력:")
+            print(response.content)
+            raise
+
+    async def _split_chapters_windows(self, pages):
+        model = LECTURE_MODEL
+        # 프롬프트 틀 몫을 빼서 구간 프롬프트 전체가 LECTURE_MAX_PROMPT_TOKENS 안에 들어오게
+        overhead = count_tokens(window_llm_prompt.format(start=0, end=0, total=len(pages), content=""), model)
+        window_tokens = max(100, min(settings.lecture_window_tokens, settings.lecture_max_prompt_tokens - overhead))
+        windows = build_windows(pages, window_tokens, model)
+        print(f"📚 긴 PDF 단원 분리: {len(pages)}페이지 → 구간 {len(windows)}개 (구간당 {window_tokens} 토큰)")
 
-            # 코드블록 제거
-            if raw.startswith("```"):
-                raw = raw.split("```")[1]
-                raw = raw.replace("json", "").strip()
+        semaphore = asyncio.Semaphore(max(1, settings.lecture_window_concurrency))
 
+        async def _map(start, end, content):
+            prompt = window_llm_prompt.format(start=start, end=end, total=len(pages), content=content)
             try:
-                data = json.loads(raw)   # chapter_title 포함 JSON
-                results.append(data)
-            except Exception:
-                print("⚠️ 문제 JSON 파싱 실패:")
-                print(raw)
+                data = await self._ainvoke_json(prompt, semaphore, f"구간 {start}~{end}p 단원 분리")
+                if not isinstance(data, dict):
+                    raise ValueError(f"JSON 객체가 아님: {type(data).__name__}")
+                sections = data.get("sections") or []
+                if not isinstance(sections, list) or not all(isinstance(section, dict) for section in sections):
+                    raise ValueError("sections 형식 오류")
+            except Exception as e:
+                # 끝내 실패한 구간도 목차에서 빠지지 않도록 페이지 범위 그대로 자리표시 섹션으로 남긴다
+                print(f"⚠️ 구간 {start}~{end}p 단원 분리 실패, 원문으로 대체: {e}")
+                return [{
+                    "단원제목": f"{start}~{end}페이지",
+                    "시작페이지": start,
+                    "요약": content,
+                    "핵심키워드": [],
+                }]
+            return [dict(section, 시작페이지=section.get("시작페이지") or start) for section in sections]
+
+        results = await asyncio.gather(*[_map(*window) for window in windows])
+
+        # 구간 경계에서 이어지는 섹션은 앞 섹션에 합친다
+        sections = []
+        for window_sections in results:
+            for i, section in enumerate(window_sections):
+                if i == 0 and section.get("이어짐") and sections:
+                    prev = sections[-1]
+                    prev["요약"] = f"{prev['요약']} {section.get('요약', '')}".strip()
+                    prev["핵심키워드"] += [k for k in section.get("핵심키워드") or [] if k not in prev["핵심키워드"]]
+                    continue
+                sections.append({
+                    "단원제목": section.get("단원제목") or f"{section['시작페이지']}페이지",
+                    "시작페이지": section["시작페이지"],
+                    "요약": section.get("요약", ""),
+                    "핵심키워드": list(section.get("핵심키워드") or []),
+                })
+        if not sections:
+            raise ValueError("단원을 찾지 못했습니다")
+        fallback = {"chapters": [{k: v for k, v in s.items() if k != "시작페이지"} for s in sections]}
+        if len(sections) == 1:
+            return fallback
+
+        # 목차(섹션 제목 + 요약)만 모아 단원으로 정리. 섹션별 요약을 잘라 한도 안에 맞춘다
+        overhead = count_tokens(merge_llm_prompt.format(outline=""), model) + 20 * len(sections)
+        budget = max(20, (settings.lecture_max_prompt_tokens - overhead) // len(sections))
+        outline = "\n".join(
+            f"- p.{s['시작페이지']} {s['단원제목']}: {truncate_to_tokens(s['요약'], budget, model)}"
+            f" (키워드: {', '.join(s['핵심키워드'])})"
+            for s in sections
+        )
+        try:
+            response = await self.llm.ainvoke(merge_llm_prompt.format(outline=outline))
+            merged = _parse_json(response.content)
+            if merged.get("chapters"):
+                print(f"✅ 섹션 {len(sections)}개 → 단원 {len(merged['chapters'])}개")
+                return merged
+        except Exception as e:
+            print(f"⚠️ 단원 합치기 실패, 섹션 목록 그대로 사용: {e}")
+        return fallback
+
+    # -----------------------------
+    # 📝 단원별 문제 생성 (선택지 + 해설 추가)
+    # -----------------------------
+    async def _generate_chapter(self, chap, semaphore):
+        """단원 하나의 문제 생성. 실패하면 백오프 후 재시도하고, 끝내 실패하면 빈 문제 목록 + error"""
+        title = chap["단원제목"]
+        prompt = question_llm_prompt.format(chapter_title=title, summary=chap["요약"])
+        try:
+            data = await self._ainvoke_json(prompt, semaphore, f"문제 생성: {title}")   # chapter_title 포함 JSON
+        except Exception as e:
+            return {"chapter_title": title, "questions": [], "error": str(e)}
+        data["chapter_title"] = title
+        data.setdefault("questions", [])
+        return data
+
+    async def agenerate_questions(self, chapters, previous=None):
+        """
+        단원별 문제를 동시에 생성 (동시 호출 수 LECTURE_QUIZ_CONCURRENCY).
+        결과는 단원 순서대로 반환하고, 실패한 단원은 그 단원만 재시도한다.
+        previous(같은 단원 JSON으로 생성한 이전 결과)를 주면 이미 문제가 생성된 단원은 다시 호출하지 않는다.
+        결과가 단원 순서대로 저장되므로 단원은 위치로 맞춘다 (제목이 같은 단원이 여러 개여도 섞이지 않음).
+        """
+        print("📝 단원별 문제 생성 중…")
+
+        semaphore = asyncio.Semaphore(max(1, settings.lecture_quiz_concurrency))
+        items = chapters["chapters"]
+        if not previous or len(previous) != len(items):
+            previous = [None] * len(items)
+
+        async def generate(chap, prev):
+            if prev and prev.get("questions") and not prev.get("error"):
+                return prev
+            return await self._generate_chapter(chap, semaphore)
+
+        results = await asyncio.gather(*[generate(chap, prev) for chap, prev in zip(items, previous)])
 
-        return results
+        failed = sum(1 for item in results if item.get("error"))
+        print(f"✅ 문제 생성 완료: {len(results) - failed}/{len(results)}개 단원")
+        return list(results)
 
 
     # -----------------------------
@@ -186,13 +471,15 @@ if __name__ == "__main__":
 
     processor = LectureProcessor(pdf_path)
 
-    text = processor.load_pdf()
+    async def analyze():
+        # LLM 커넥션 풀을 같은 이벤트 루프에서 쓰도록 한 번에 실행
+        chapters = await processor.asplit_chapters(await processor.aload_pages())
+        return chapters, await processor.agenerate_questions(chapters)
 
-    chapters_json = processor.split_chapters(text)
+    chapters_json, questions = asyncio.run(analyze())
     print("\n=== 📌 단원 분리 결과 ===")
     print(json.dumps(chapters_json, ensure_ascii=False, indent=2))
 
-    questions = processor.generate_questions(chapters_json)
     print("\n=== 📝 단원별 문제 ===")
     print(json.dumps(questions, ensure_ascii=False, indent=2))
 
@@ -0,0 +1,72 @@
+# backend/ai/tokens.py
+
+"""
+로컬 토큰 카운팅 유틸
+tiktoken 인코딩을 한 번만 로드해 재사용하고, 인코딩 파일을 받을 수 없는
+오프라인 환경에서는 UTF-8 바이트 길이 기반 추정치로 대체한다.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List
+
+from loguru import logger
+
+# 메시지 하나당 role/구분자 오버헤드 (OpenAI chat 포맷 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"[tokens] tiktoken 인코딩 로드 실패, 추정치 사용: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    if not text:
+        return 0
+    enc = _encoding(model)
+    if enc is None:
+        # 한국어는 대략 UTF-8 3바이트 ≈ 1토큰
+        return max(1, len(text.encode("utf-8")) // 3)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(contents: Iterable[str], model: str = "gpt-4o") -> int:
+    return sum(count_tokens(c, model) + MESSAGE_OVERHEAD_TOKENS for c in contents)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """앞에서부터 max_tokens 까지만 남긴다."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    enc = _encoding(model)
+    if enc is None:
+        return text.encode("utf-8")[: max_tokens * 3].decode("utf-8", errors="ignore")
+    return enc.decode(enc.encode(text, disallowed_special=())[:max_tokens])
+
+
+def split_by_tokens(text: str, max_tokens: int, overlap: int = 0, model: str = "gpt-4o") -> List[str]:
+    """텍스트를 max_tokens 크기의 윈도우로 나눈다 (overlap 토큰만큼 겹침)."""
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    step = max(1, max_tokens - overlap)
+
+    enc = _encoding(model)
+    if enc is None:
+        data = text.encode("utf-8")
+        size, stride = max_tokens * 3, step * 3
+        return [
+            data[i:i + size].decode("utf-8", errors="ignore")
+            for i in range(0, max(len(data), 1), stride)
+        ]
+
+    ids = enc.encode(text, disallowed_special=())
+    return [enc.decode(ids[i:i + max_tokens]) for i in range(0, max(len(ids), 1), step)]
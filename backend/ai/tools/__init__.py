@@ -1,5 +1,6 @@
 from .search.web_search import web_search
 from .search.hyupsung_info import uhs_fetch_info
 from .search.rag_search import rag_search
+from .search.notice_search import notice_search
 
-ALL_TOOLS = [web_search, uhs_fetch_info, rag_search]
\ No newline at end of file
+ALL_TOOLS = [web_search, uhs_fetch_info, rag_search, notice_search]
\ No newline at end of file
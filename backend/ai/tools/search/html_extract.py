@@ -0,0 +1,159 @@
+# backend/ai/tools/search/html_extract.py
+
+"""
+스크래핑 fallback 경로용 본문 추출
+
+페이지 전체 텍스트(네비게이션·푸터 포함)를 그대로 넘기는 대신
+1) 보일러플레이트(메뉴/푸터/스크립트 등)를 걷어내고
+2) 본문을 블록 단위로 나눈 뒤
+3) 질문과의 관련도 순으로 골라 토큰 상한 안에서만 돌려준다.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+from backend.ai.tokens import count_tokens, truncate_to_tokens
+
+BOILERPLATE_TAGS = ["script", "style", "noscript", "header", "footer", "nav", "aside", "form", "iframe", "button", "select"]
+
+# id / class 이름으로 판별하는 보일러플레이트 영역 (k2web 계열 템플릿 기준)
+BOILERPLATE_ATTR_RE = re.compile(
+    r"(^|[\s_-])(gnb|lnb|snb|nav|navi|footer|foot|header|top_?menu|all_?menu|site_?map|sitemap|breadcrumb|"
+    r"location|quick|skip|util|banner|popup|sns|family|copyright|search)([\s_-]|$)",
+    re.IGNORECASE,
+)
+
+# 본문 컨테이너 후보 (앞에서부터 우선)
+MAIN_SELECTORS = ["main", "article", "#contents", "#content", ".contents", ".content", "#container", "body"]
+
+# 짧은 줄(메뉴 항목, 표 셀 등)은 BLOCK_MIN_CHARS가 될 때까지 이어 붙이고, 긴 줄은 BLOCK_MAX_CHARS로 자른다
+BLOCK_MIN_CHARS = 120
+BLOCK_MAX_CHARS = 400
+_WS_RE = re.compile(r"[ \t ]+")
+_NORMALIZE_RE = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+# ---------------------------------------------------
+# 1) HTML → 본문 블록
+# ---------------------------------------------------
+def _is_boilerplate(tag) -> bool:
+    attrs = " ".join(filter(None, [tag.get("id") or "", " ".join(tag.get("class") or [])]))
+    return bool(attrs) and bool(BOILERPLATE_ATTR_RE.search(attrs))
+
+
+def blocks_from_text(text: str, min_chars: int = BLOCK_MIN_CHARS, max_chars: int = BLOCK_MAX_CHARS) -> List[str]:
+    """줄 단위 텍스트를 블록으로 묶는다 (중복 줄 제거)."""
+    blocks: List[str] = []
+    seen = set()
+    buf = ""
+    for raw in text.split("\n"):
+        line = _WS_RE.sub(" ", raw).strip()
+        if len(line) < 2 or line in seen:
+            continue
+        seen.add(line)
+        for i in range(0, len(line), max_chars):
+            piece = line[i:i + max_chars]
+            if buf and len(buf) + len(piece) + 1 > max_chars:
+                blocks.append(buf)
+                buf = ""
+            buf = f"{buf}\n{piece}" if buf else piece
+            if len(buf) >= min_chars:
+                blocks.append(buf)
+                buf = ""
+    if buf:
+        blocks.append(buf)
+    return blocks
+
+
+def extract_blocks(soup: BeautifulSoup) -> List[str]:
+    """
+    soup에서 보일러플레이트를 제거하고 본문 블록 목록을 돌려준다.
+    주의: soup를 직접 수정하므로 다른 추출이 끝난 뒤에 호출한다.
+    """
+    for tag in soup.find_all(BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(True):
+        if tag.decomposed:
+            continue
+        if _is_boilerplate(tag):
+            tag.decompose()
+
+    main = None
+    for selector in MAIN_SELECTORS:
+        main = soup.select_one(selector)
+        if main is not None and main.get_text(strip=True):
+            break
+    if main is None:
+        main = soup
+
+    return blocks_from_text(main.get_text("\n", strip=True))
+
+
+# ---------------------------------------------------
+# 2) 질문 기준 랭킹 + 토큰 상한
+# ---------------------------------------------------
+def index_terms(text: str) -> List[str]:
+    """문자 bigram + 공백 단어 (한국어 조사 차이에 덜 민감)"""
+    norm = _NORMALIZE_RE.sub(" ", text.lower()).strip()
+    words = [w for w in norm.split() if len(w) >= 2]
+    compact = norm.replace(" ", "")
+    bigrams = [compact[i:i + 2] for i in range(len(compact) - 1)]
+    return words + bigrams
+
+
+def rank_blocks(blocks: List[str], query: str) -> List[float]:
+    """BM25 변형 점수 (블록 = 문서)"""
+    q_terms = set(index_terms(query))
+    if not blocks or not q_terms:
+        return [0.0] * len(blocks)
+
+    block_terms = [Counter(index_terms(b)) for b in blocks]
+    n = len(blocks)
+    avg_len = sum(sum(c.values()) for c in block_terms) / n or 1.0
+    df = Counter(t for c in block_terms for t in q_terms if t in c)
+
+    k1, b = 1.2, 0.75
+    scores = []
+    for counts in block_terms:
+        length = sum(counts.values())
+        score = 0.0
+        for t in q_terms:
+            tf = counts.get(t, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_len))
+        scores.append(score)
+    return scores
+
+
+def select_blocks(blocks: List[str], query: str, token_cap: int, model: Optional[str] = None) -> List[str]:
+    """
+    관련도 상위 블록을 token_cap 안에서 고르고, 원래 문서 순서로 돌려준다.
+    관련 블록이 하나도 없으면 앞쪽 블록부터 채운다.
+    """
+    scores = rank_blocks(blocks, query)
+    order = sorted(range(len(blocks)), key=lambda i: (-scores[i], i))
+    if not any(scores):
+        order = list(range(len(blocks)))
+
+    model = model or "gpt-4o"
+    chosen, used = {}, 0
+    for i in order:
+        if scores[i] <= 0 and any(scores) and chosen:
+            break
+        tokens = count_tokens(blocks[i], model)
+        if used + tokens > token_cap:
+            # 가장 관련 높은 블록조차 상한을 넘으면 잘라서라도 넣는다
+            if not chosen:
+                chosen[i] = truncate_to_tokens(blocks[i], token_cap, model)
+                break
+            continue
+        chosen[i] = blocks[i]
+        used += tokens
+
+    return [chosen[i] for i in sorted(chosen)]
@@ -1,22 +1,14 @@
 from langchain_core.tools import tool
-import requests
-import urllib3
-from bs4 import BeautifulSoup
 from loguru import logger
 import re
 
-urllib3.disable_warnings()
-
-URL_MAP = {
-    "동아리": "https://www.uhs.ac.kr/uhs/295/subview.do",
-    "학생식단": "https://www.uhs.ac.kr/uhs/2951/subview.do",
-    "교직원식단": "https://www.uhs.ac.kr/uhs/2949/subview.do",
-    "등록금": "https://www.uhs.ac.kr/global/2697/subview.do",
-    "교환학생": "https://www.uhs.ac.kr/global/2710/subview.do",
-    "취업률": "https://www.academyinfo.go.kr/popup/pubinfo1690/list.do?schlId=0000207",
-    "장학금 공지사항": "https://www.uhs.ac.kr/uhs/155/subview.do?enc=Zm5jdDF8QEB8JTJGcG9ydGFsQmJzJTJGdWhzJTJGNCUyRmxpc3QuZG8lM0ZzcmNoV3JkJTNEJUVDJTlFJUE1JUVEJTk1JTk5JUVBJUI4JTg4JTI2c3JjaENvbHVtbiUzRHNqJTI2cGFnZSUzRDIlMjY%3D#this",
-    "공모전 공지사항": "https://www.uhs.ac.kr/uhs/155/subview.do?enc=Zm5jdDF8QEB8JTJGcG9ydGFsQmJzJTJGdWhzJTJGNCUyRmxpc3QuZG8lM0ZzcmNoV3JkJTNEJUVBJUIzJUI1JUVCJUFBJUE4JUVDJUEwJTg0JTI2c3JjaENvbHVtbiUzRHNqJTI2cGFnZSUzRDElMjY%3D"
-}
+from backend.core.config import settings
+
+from backend.ai.tools.search.uhs_site import URL_MAP
+from backend.ai.tools.search.uhs_cache import uhs_page_cache, format_age
+from backend.ai.tools.search.uhs_menu import MENU_TARGETS, resolve_dates, resolve_meals, lookup
+from backend.ai.tools.search.html_extract import blocks_from_text, select_blocks
+from backend.ai.tools.search.uhs_notice import NOTICE_BOARDS, search_notices
 
 KEYWORDS = {
     "학식": "학생식단",
@@ -73,71 +65,74 @@ def uhs_fetch_info(query: str) -> str:
     if not target:
         return "지원 항목: 동아리, 학생식단, 교직원식단, 등록금, 교환학생, 취업률"
 
-    url = URL_MAP[target]
-    logger.info(f"[uhs_fetch_info] target='{target}', url='{url}'")
+    logger.info(f"[uhs_fetch_info] target='{target}', url='{URL_MAP[target]}'")
 
     # 2) '14일' → '14' 형식으로 일(day)만 추출
     day_str = _extract_day(query)
     logger.info(f"[uhs_fetch_info] day_str={day_str}")
 
-    # 3) HTML 요청
-    try:
-        resp = requests.get(url, timeout=8, verify=False)
-        logger.info(f"[uhs_fetch_info] status_code={resp.status_code}")
-
-        if resp.status_code != 200:
-            return f"요청 실패: 상태 코드 {resp.status_code}"
-
-        html = resp.text
-        logger.info(f"[uhs_fetch_info] raw_html_snippet=\n{html[:800]}")
-    except Exception as e:
-        logger.error(f"[uhs_fetch_info] 요청 예외: {e}")
-        return f"요청 실패: {e}"
-
-    # 4) HTML 파싱
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-
-        tables = soup.find_all("table")
-        logger.info(f"[uhs_fetch_info] table_count={len(tables)}")
-
-        candidate_rows: list[str] = []
-
-        # day_str가 있으면 그 날짜가 들어있는 행만 뽑는다
-        day_pattern = None
-        if day_str:
-            # '2025.11.14 ( 금 )' 같은 패턴에서 '14' 부분을 잡기 위한 정규식
-            # 예: '.14 (' 이런 부분을 노린다
-            day_pattern = re.compile(rf"\.\s*0?{day_str}\s*\(")
-
-        for t_idx, table in enumerate(tables):
-            for tr in table.find_all("tr"):
-                row_text = tr.get_text(" ", strip=True)
-                if not row_text:
-                    continue
-
-                # 샘플 몇 줄 로그로 보기
-                if len(candidate_rows) < 5:
-                    logger.info(f"[uhs_fetch_info] sample_row[{t_idx}]: {row_text[:150]}")
-
-                # 4-1) 날짜 지정된 경우: 날짜 패턴 매칭
-                if day_pattern and day_pattern.search(row_text):
-                    candidate_rows.append(row_text)
-                # 4-2) 날짜 지정이 안 된 경우: '중식', '석식' 같은 키워드 포함 행만 수집
-                elif not day_pattern and any(k in row_text for k in ["중식", "석식", "조식", "메뉴"]):
-                    candidate_rows.append(row_text)
-
-        # 5) 날짜 기반 식단 행 우선 반환
-        if candidate_rows:
-            logger.info(f"[uhs_fetch_info] found {len(candidate_rows)} candidate_rows")
-            joined = "\n".join(candidate_rows)
-            return f"[{target} 식단 추출 결과]\n\n{joined}"
-
-        # 6) 후보 행이 하나도 없으면 전체 텍스트 일부 반환 (fallback)
-        full_text = soup.get_text("\n", strip=True)
-        logger.info(f"[uhs_fetch_info] fallback_full_text_snippet=\n{full_text[:800]}")
-        return f"[{target} 전체 텍스트 일부]\n\n{full_text}"
-
-    except Exception as e:
-        logger.error(f"[uhs_fetch_info] HTML 파싱 예외: {e}")
-        return f"HTML 파싱 오류: {e}"
+    # 2-1) 공지사항: 로컬에 동기화된 전체 게시글에서 검색 (비어 있으면 아래 라이브 페이지로)
+    if target in NOTICE_BOARDS:
+        found = search_notices(query, target)
+        if found:
+            return found
+
+    # 3) 캐시 조회 (백그라운드 갱신기가 미리 파싱해 둔 결과), 미스일 때만 라이브 요청
+    record = uhs_page_cache.get(target)
+    if record is None:
+        logger.info("[uhs_fetch_info] cache miss → live fetch")
+        try:
+            record = uhs_page_cache.refresh(target)
+        except Exception as e:
+            logger.error(f"[uhs_fetch_info] 요청 예외: {e}")
+            return f"요청 실패: {e}"
+
+    age = uhs_page_cache.age_seconds(record)
+    freshness = f"갱신: {format_age(age)}"
+    if uhs_page_cache.is_stale(target, record):
+        freshness += ", ⚠️ 오래된 정보일 수 있음"
+
+    parsed = record["parsed"]
+
+    # 4) 식단 페이지: 날짜 인덱스에서 바로 조회 ("오늘", "내일", "금요일", "14일" 등)
+    menu = parsed.get("menu") if target in MENU_TARGETS else None
+    if menu and menu.get("days"):
+        dates = resolve_dates(query, menu)
+        lines = lookup(menu, dates, resolve_meals(query))
+        logger.info(f"[uhs_fetch_info] menu lookup dates={dates} → {len(lines)} lines")
+        if lines:
+            joined = "\n".join(lines)
+            return f"[{target}] ({freshness})\n{joined}"
+        available = ", ".join(f"{iso}({info['weekday']})" for iso, info in sorted(menu["days"].items()))
+        return f"[{target}] ({freshness})\n{', '.join(dates) or '요청한 날짜'} 식단 정보가 없습니다.\n등록된 날짜: {available}"
+
+    # 5) 캐시된 표 행에서 후보 행 선택 (식단 인덱스가 없을 때)
+    candidate_rows: list[str] = []
+
+    # day_str가 있으면 그 날짜가 들어있는 행만 뽑는다
+    day_pattern = None
+    if day_str:
+        # '2025.11.14 ( 금 )' 같은 패턴에서 '14' 부분을 잡기 위한 정규식
+        # 예: '.14 (' 이런 부분을 노린다
+        day_pattern = re.compile(rf"\.\s*0?{day_str}\s*\(")
+
+    for row_text in parsed["rows"]:
+        # 5-1) 날짜 지정된 경우: 날짜 패턴 매칭
+        if day_pattern and day_pattern.search(row_text):
+            candidate_rows.append(row_text)
+        # 5-2) 날짜 지정이 안 된 경우: '중식', '석식' 같은 키워드 포함 행만 수집
+        elif not day_pattern and any(k in row_text for k in ["중식", "석식", "조식", "메뉴"]):
+            candidate_rows.append(row_text)
+
+    # 6) 날짜 기반 식단 행 우선 반환
+    if candidate_rows:
+        logger.info(f"[uhs_fetch_info] found {len(candidate_rows)} candidate_rows")
+        joined = "\n".join(candidate_rows)
+        return f"[{target} 식단 추출 결과] ({freshness})\n\n{joined}"
+
+    # 7) 후보 행이 하나도 없으면 질문과 관련된 본문 블록만 토큰 상한 안에서 반환 (fallback)
+    blocks = parsed.get("blocks") or blocks_from_text(parsed["text"])
+    selected = select_blocks(blocks, query, settings.uhs_fallback_token_cap)
+    logger.info(f"[uhs_fetch_info] fallback blocks: {len(selected)}/{len(blocks)} selected")
+    excerpt = "\n\n".join(selected)
+    return f"[{target} 관련 본문 발췌] ({freshness})\n\n{excerpt}"
@@ -0,0 +1,23 @@
+# backend/ai/tools/search/notice_search.py
+
+from langchain_core.tools import tool
+from loguru import logger
+
+from backend.ai.tools.search.uhs_notice import detect_board, search_notices
+
+
+@tool
+def notice_search(query: str) -> str:
+    """협성대 장학금·공모전 공지사항 검색 Tool (로컬에 동기화된 전체 게시글 대상)"""
+    board = detect_board(query)
+    logger.info(f"[notice_search] query={query!r}, board={board}")
+
+    try:
+        result = search_notices(query, board)
+    except Exception as e:
+        logger.exception("[notice_search] 검색 중 예외 발생")
+        return f"공지사항 검색 오류: {e}"
+
+    if result is None:
+        return "아직 동기화된 공지사항이 없습니다. uhs_fetch_info로 공지사항 페이지를 확인하세요."
+    return result
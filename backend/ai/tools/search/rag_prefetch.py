@@ -0,0 +1,116 @@
+# backend/ai/tools/search/rag_prefetch.py
+
+"""
+투기적(speculative) RAG 검색
+
+Agent의 첫 LLM 호출이 진행되는 동안 사용자 질문으로 FAISS 검색을 미리 시작한다.
+모델이 비슷한 쿼리로 rag_search를 요청하면 프리페치 결과를 그대로 쓰고,
+쓰이지 않은 결과는 실행 종료 시 버린다.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from loguru import logger
+
+from backend.core.config import settings
+from backend.ai.tools.search.rag_search import get_rag_pipeline
+
+_NORMALIZE_RE = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def _bigrams(text: str) -> Set[str]:
+    norm = _NORMALIZE_RE.sub("", text.lower())
+    if len(norm) < 2:
+        return {norm} if norm else set()
+    return {norm[i:i + 2] for i in range(len(norm) - 1)}
+
+
+def query_similarity(a: str, b: str) -> float:
+    """문자 bigram Dice 계수 (한국어 조사/어미 차이에 덜 민감)"""
+    ga, gb = _bigrams(a), _bigrams(b)
+    if not ga or not gb:
+        return 0.0
+    return 2 * len(ga & gb) / (len(ga) + len(gb))
+
+
+@dataclass
+class _Speculation:
+    query: str
+    future: Future
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+class SpeculativeRetriever:
+    """
+    run_id 단위로 프리페치 검색을 관리한다.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag-prefetch")
+        self._pending: Dict[str, _Speculation] = {}
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "hits": 0, "misses": 0, "unused": 0, "errors": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def start(self, run_id: str, query: str) -> None:
+        future = self._executor.submit(lambda: get_rag_pipeline().search(query))
+        with self._lock:
+            self._pending[run_id] = _Speculation(query=query, future=future)
+            self._stats["started"] += 1
+        logger.info(f"[rag_prefetch] 프리페치 시작: run={run_id}, query={query!r}")
+
+    def take(self, run_id: str, query: str) -> Optional[List]:
+        """
+        rag_search 요청 시 호출. 프리페치 결과를 쓸 수 있으면 문서 리스트, 아니면 None.
+        """
+        with self._lock:
+            spec = self._pending.pop(run_id, None)
+        if spec is None:
+            return None
+
+        score = query_similarity(spec.query, query)
+        if score < settings.agent_speculative_similarity:
+            logger.info(f"[rag_prefetch] miss: similarity={score:.2f} ({spec.query!r} vs {query!r})")
+            self._count("misses")
+            spec.future.cancel()
+            return None
+
+        try:
+            results = spec.future.result(timeout=settings.agent_speculative_wait)
+        except Exception as e:
+            logger.warning(f"[rag_prefetch] 프리페치 결과 사용 불가: {e}")
+            self._count("errors")
+            return None
+
+        saved_ms = (time.perf_counter() - spec.started_at) * 1000
+        logger.info(f"[rag_prefetch] hit: similarity={score:.2f}, prefetch_age={saved_ms:.0f}ms")
+        self._count("hits")
+        return results
+
+    def discard(self, run_id: str) -> None:
+        """실행 종료 시 호출. 쓰이지 않은 프리페치는 취소하거나 결과를 버린다."""
+        with self._lock:
+            spec = self._pending.pop(run_id, None)
+        if spec is None:
+            return
+        spec.future.cancel()
+        self._count("unused")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._pending)
+        decided = stats["hits"] + stats["misses"] + stats["unused"] + stats["errors"]
+        stats["hit_rate"] = round(stats["hits"] / decided, 3) if decided else 0.0
+        return stats
+
+
+rag_prefetcher = SpeculativeRetriever()
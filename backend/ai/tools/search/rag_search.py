@@ -1,5 +1,6 @@
 # backend/ai/tools/search/rag_search.py
 
+import threading
 from typing import Optional
 
 from langchain_core.tools import tool
@@ -9,17 +10,20 @@ from backend.ai.vector.rag_pipeline import RAGPipeline
 
 # 전역 RAGPipeline 인스턴스 (한 번만 생성)
 _rag_pipeline: Optional[RAGPipeline] = None
+# 프리페치 스레드와 에이전트가 동시에 처음 호출해도 하나만 만들도록
+_lock = threading.Lock()
 
 
 def get_rag_pipeline() -> RAGPipeline:
     """전역 RAGPipeline 싱글톤 생성/반환."""
     global _rag_pipeline
-    if _rag_pipeline is None:
-        logger.info("[rag_search] 최초 RAGPipeline 생성")
-        _rag_pipeline = RAGPipeline()
-    else:
-        logger.info("[rag_search] 기존 RAGPipeline 재사용")
-    return _rag_pipeline
+    with _lock:
+        if _rag_pipeline is None:
+            logger.info("[rag_search] 최초 RAGPipeline 생성")
+            _rag_pipeline = RAGPipeline()
+        else:
+            logger.info("[rag_search] 기존 RAGPipeline 재사용")
+        return _rag_pipeline
 
 
 @tool
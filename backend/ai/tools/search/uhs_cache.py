@@ -0,0 +1,170 @@
+# backend/ai/tools/search/uhs_cache.py
+
+"""
+협성대 홈페이지 구조화 캐시 + 백그라운드 갱신기
+
+- 파싱된 페이지 레코드를 Redis에 저장해 모든 워커가 공유한다.
+  (Redis를 쓸 수 없으면 프로세스 로컬 dict로 동작)
+- UHSRefresher가 URL_MAP 항목을 각자의 주기로 미리 받아와 파싱해 둔다.
+  여러 워커가 같은 페이지를 동시에 갱신하지 않도록 Redis 락을 잡고, 끝나면 내 락일 때만 푼다.
+  (락을 잡을 수 없으면 이번 주기는 건너뛰고 요청 시 라이브 조회에 맡긴다)
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from backend.core.config import settings
+from backend.core.redis_client import get_redis_client
+from backend.ai.tools.search.uhs_site import URL_MAP, fetch_and_parse, refresh_interval
+
+CACHE_KEY = "uhs_page:{}"
+LOCK_KEY = "uhs_refresh_lock:{}"
+
+# 오래된 레코드도 라이브 요청 실패 시 대비로 하루 보관
+CACHE_TTL = 24 * 60 * 60
+
+# 락 값이 내 것일 때만 삭제 (TTL 만료 후 다른 워커가 잡은 락은 건드리지 않음)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class UHSPageCache:
+
+    def __init__(self):
+        self._local: Dict[str, Dict[str, Any]] = {}
+        self._owner = uuid.uuid4().hex
+
+    def _redis(self):
+        return get_redis_client()
+
+    def get(self, target: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self._redis().get(CACHE_KEY.format(target))
+            if raw:
+                return json.loads(raw)
+        except Exception as e:
+            logger.warning(f"[uhs_cache] Redis 조회 실패, 로컬 캐시 사용: {e}")
+        return self._local.get(target)
+
+    def put(self, target: str, record: Dict[str, Any]) -> None:
+        self._local[target] = record
+        try:
+            self._redis().setex(CACHE_KEY.format(target), CACHE_TTL, json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            logger.warning(f"[uhs_cache] Redis 저장 실패, 로컬 캐시만 갱신: {e}")
+
+    def refresh(self, target: str) -> Dict[str, Any]:
+        """
+        라이브 요청 + 파싱 후 캐시에 저장. 실패 시 예외.
+        기존 레코드를 넘겨 조건부 요청 / 변경 감지에 사용한다.
+        """
+        record = fetch_and_parse(target, previous=self.get(target))
+        self.put(target, record)
+        return record
+
+    def try_lock(self, target: str, ttl: int) -> bool:
+        """다른 워커가 이미 갱신 중이거나 Redis를 쓸 수 없으면 False"""
+        try:
+            return bool(self._redis().set(LOCK_KEY.format(target), self._owner, nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning(f"[uhs_cache] 갱신 락 획득 실패 target='{target}': {e}")
+            return False
+
+    def release_lock(self, target: str) -> None:
+        try:
+            self._redis().eval(_RELEASE_SCRIPT, 1, LOCK_KEY.format(target), self._owner)
+        except Exception as e:
+            logger.warning(f"[uhs_cache] 갱신 락 해제 실패 target='{target}': {e}")
+
+    @staticmethod
+    def age_seconds(record: Dict[str, Any]) -> float:
+        return max(0.0, time.time() - record.get("fetched_at", 0))
+
+    @staticmethod
+    def is_stale(target: str, record: Dict[str, Any]) -> bool:
+        return UHSPageCache.age_seconds(record) > 2 * refresh_interval(target)
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 60:
+        return "방금 전"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}분 전"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}시간 전"
+    return f"{int(seconds // 86400)}일 전"
+
+
+class UHSRefresher:
+    """
+    앱 이벤트 루프에서 도는 백그라운드 갱신 태스크
+    """
+
+    TICK_SECONDS = 30
+
+    def __init__(self, cache: UHSPageCache):
+        self.cache = cache
+        self._task: Optional[asyncio.Task] = None
+        self._next_due: Dict[str, float] = {}
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"[uhs_cache] 백그라운드 갱신 시작: {list(URL_MAP.keys())}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_one(self, target: str) -> None:
+        interval = refresh_interval(target)
+
+        # 다른 워커가 이미 받아온 최신 레코드가 있으면 건너뜀
+        record = await asyncio.to_thread(self.cache.get, target)
+        if record and self.cache.age_seconds(record) < interval:
+            self._next_due[target] = time.time() + interval - self.cache.age_seconds(record)
+            return
+
+        if not await asyncio.to_thread(self.cache.try_lock, target, max(60, interval // 2)):
+            self._next_due[target] = time.time() + self.TICK_SECONDS
+            return
+
+        try:
+            await asyncio.to_thread(self.cache.refresh, target)
+            self._next_due[target] = time.time() + interval
+        except Exception as e:
+            logger.warning(f"[uhs_cache] 갱신 실패 target='{target}': {e}")
+            self._next_due[target] = time.time() + min(interval, 5 * 60)
+        finally:
+            await asyncio.to_thread(self.cache.release_lock, target)
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            for target in URL_MAP:
+                if self._next_due.get(target, 0) <= now:
+                    await self._refresh_one(target)
+            await asyncio.sleep(self.TICK_SECONDS)
+
+
+uhs_page_cache = UHSPageCache()
+uhs_refresher = UHSRefresher(uhs_page_cache)
+
+
+def start_uhs_refresher() -> None:
+    if settings.uhs_prefetch_enabled:
+        uhs_refresher.start()
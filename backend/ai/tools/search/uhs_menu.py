@@ -0,0 +1,220 @@
+# backend/ai/tools/search/uhs_menu.py
+
+"""
+학생식단 / 교직원식단 페이지 → 날짜별 식단 모델
+
+    {
+      "days": {
+        "2025-11-14": {"weekday": "금", "meals": {"중식": ["쌀밥", "된장국", ...], ...}},
+        ...
+      },
+      "by_weekday": {"금": "2025-11-14", ...}
+    }
+
+페이지를 받아올 때 한 번만 만들어 두고, 질문 시에는 날짜 키로 바로 조회한다.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo("Asia/Seoul")
+
+MENU_TARGETS = ("학생식단", "교직원식단")
+
+MEALS = ("조식", "중식", "석식")
+MEAL_ALIASES = {
+    "조식": "조식", "아침": "조식",
+    "중식": "중식", "점심": "중식",
+    "석식": "석식", "저녁": "석식",
+}
+WEEKDAYS = "월화수목금토일"
+
+# '2025.11.14 ( 금 )', '2025-11-14(금)', '11.14(금)' 등
+DATE_RE = re.compile(
+    r"(?:(\d{4})\s*[.\-/년]\s*)?(\d{1,2})\s*[.\-/월]\s*(\d{1,2})\s*일?\s*(?:\(\s*([월화수목금토일])\s*\))?"
+)
+
+_ITEM_SPLIT_RE = re.compile(r"[\n,/]+")
+
+Grid = List[List[str]]
+
+
+def today_kst() -> date:
+    return datetime.now(KST).date()
+
+
+# ---------------------------------------------------
+# 1) 표 → 날짜별 식단
+# ---------------------------------------------------
+def _parse_date(text: str, default_year: int) -> Optional[Tuple[str, str]]:
+    m = DATE_RE.search(text)
+    if not m:
+        return None
+    year = int(m.group(1)) if m.group(1) else default_year
+    try:
+        d = date(year, int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return None
+    return d.isoformat(), m.group(4) or WEEKDAYS[d.weekday()]
+
+
+def _meal_of(text: str) -> Optional[str]:
+    for alias, meal in MEAL_ALIASES.items():
+        if alias in text:
+            return meal
+    return None
+
+
+def _items(text: str) -> List[str]:
+    return [t.strip() for t in _ITEM_SPLIT_RE.split(text) if t.strip() and t.strip() != "-"]
+
+
+def _add(days: Dict[str, Any], day: Tuple[str, str], meal: str, items: List[str]) -> None:
+    if not items:
+        return
+    iso, weekday = day
+    entry = days.setdefault(iso, {"weekday": weekday, "meals": {}})
+    entry["meals"].setdefault(meal, []).extend(items)
+
+
+def parse_menu(tables: List[Grid], default_year: Optional[int] = None) -> Dict[str, Any]:
+    """
+    tables: 표마다 [행][셀 텍스트] 그리드 (셀 내부 줄바꿈 유지)
+
+    세 가지 레이아웃을 처리한다.
+      A) 헤더가 끼니(조식/중식/석식), 행마다 날짜
+      B) 헤더가 날짜, 행마다 끼니
+      C) 날짜 행 다음에 끼니 행들이 이어지는 형태
+    """
+    year = default_year or today_kst().year
+    days: Dict[str, Any] = {}
+
+    for grid in tables:
+        rows = [r for r in grid if any(c.strip() for c in r)]
+        if not rows:
+            continue
+        header = rows[0]
+
+        header_dates = [_parse_date(c, year) for c in header]
+        header_meals = [_meal_of(c) if len(c) <= 6 else None for c in header]
+
+        # B) 날짜 열
+        if sum(1 for d in header_dates if d) >= 2:
+            for row in rows[1:]:
+                meal = _meal_of(row[0]) if row else None
+                if not meal:
+                    continue
+                # 헤더와 행의 셀 수가 다르면 오른쪽 정렬로 맞춘다
+                offset = len(header) - len(row)
+                for idx, cell in enumerate(row[1:], start=1):
+                    col = idx + offset
+                    if 0 <= col < len(header_dates) and header_dates[col]:
+                        _add(days, header_dates[col], meal, _items(cell))
+            continue
+
+        # A) 끼니 열
+        if any(header_meals):
+            for row in rows[1:]:
+                day = next((d for d in (_parse_date(c, year) for c in row[:2]) if d), None)
+                if not day:
+                    continue
+                offset = len(header) - len(row)
+                for idx, cell in enumerate(row):
+                    col = idx + offset
+                    if 0 <= col < len(header_meals) and header_meals[col]:
+                        _add(days, day, header_meals[col], _items(cell))
+            continue
+
+        # C) 날짜 행 + 끼니 행
+        current = None
+        for row in rows:
+            for idx, cell in enumerate(row):
+                day = _parse_date(cell, year) if len(cell) <= 20 else None
+                if day:
+                    current = day
+                    continue
+                meal = _meal_of(cell) if len(cell) <= 6 else None
+                if meal and current:
+                    rest = "\n".join(row[idx + 1:])
+                    _add(days, current, meal, _items(rest))
+                    break
+
+    by_weekday = {info["weekday"]: iso for iso, info in sorted(days.items())}
+    return {"days": days, "by_weekday": by_weekday}
+
+
+# ---------------------------------------------------
+# 2) 질문 → 날짜 / 끼니
+# ---------------------------------------------------
+RELATIVE_DAYS = {"그저께": -2, "어제": -1, "오늘": 0, "내일": 1, "모레": 2}
+
+
+def resolve_dates(query: str, menu: Dict[str, Any], today: Optional[date] = None) -> List[str]:
+    """
+    질문에서 날짜를 해석해 ISO 날짜 목록을 돌려준다.
+    날짜 언급이 없으면 오늘(식단에 있을 때) 또는 식단 전체 주간.
+    """
+    today = today or today_kst()
+    days = menu.get("days", {})
+
+    if "이번 주" in query or "이번주" in query or "주간" in query:
+        return sorted(days)
+
+    for word, delta in RELATIVE_DAYS.items():
+        if word in query:
+            return [(today + timedelta(days=delta)).isoformat()]
+
+    m = re.search(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일", query)
+    if m:
+        try:
+            return [date(today.year, int(m.group(1)), int(m.group(2))).isoformat()]
+        except ValueError:
+            return []
+
+    m = re.search(r"(\d{1,2})\s*일", query)
+    if m:
+        day_num = int(m.group(1))
+        # 식단표에 있는 날짜 중 일(day)이 같은 것을 우선
+        matched = [iso for iso in days if int(iso[-2:]) == day_num]
+        if matched:
+            return sorted(matched)
+        try:
+            return [today.replace(day=day_num).isoformat()]
+        except ValueError:
+            return []
+
+    m = re.search(r"([월화수목금토일])\s*(?:요일|욜)", query)
+    if m:
+        wd = m.group(1)
+        if wd in menu.get("by_weekday", {}):
+            return [menu["by_weekday"][wd]]
+        monday = today - timedelta(days=today.weekday())
+        return [(monday + timedelta(days=WEEKDAYS.index(wd))).isoformat()]
+
+    if today.isoformat() in days:
+        return [today.isoformat()]
+    return sorted(days)
+
+
+def resolve_meals(query: str) -> List[str]:
+    found = []
+    for alias, meal in MEAL_ALIASES.items():
+        if alias in query and meal not in found:
+            found.append(meal)
+    return found or list(MEALS)
+
+
+def lookup(menu: Dict[str, Any], dates: List[str], meals: List[str]) -> List[str]:
+    """날짜/끼니별 한 줄 요약"""
+    lines = []
+    days = menu.get("days", {})
+    for iso in dates:
+        info = days.get(iso)
+        if not info:
+            continue
+        for meal in MEALS:
+            if meal in meals and info["meals"].get(meal):
+                lines.append(f"{iso}({info['weekday']}) {meal}: {', '.join(info['meals'][meal])}")
+    return lines
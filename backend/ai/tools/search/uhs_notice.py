@@ -0,0 +1,464 @@
+# backend/ai/tools/search/uhs_notice.py
+
+"""
+협성대 공지사항 게시판 증분 크롤러 + 로컬 검색 인덱스
+
+URL_MAP의 "장학금 공지사항" / "공모전 공지사항"은 일반공지 게시판(portalBbs/uhs/4)을
+제목 키워드로 검색한 목록이다. 라이브 요청은 첫 페이지만 보게 되므로,
+- 목록을 1페이지부터 넘기며 마지막으로 본 게시글 ID보다 새 글만 상세 페이지까지 받아오고
+- 게시판별 JSONL 파일에 이어 쓴 뒤
+- 프로세스 메모리의 역색인(BM25)에 추가한다.
+질문 시에는 네트워크 없이 로컬 인덱스에서 전체 아카이브를 검색한다.
+
+여러 워커가 떠 있으면 Redis 락을 잡은 한 워커만 크롤링하고,
+나머지는 JSONL 파일에 새로 붙은 줄만 읽어 자신의 인덱스를 따라잡는다.
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from backend.core.config import settings
+from backend.core.redis_client import get_redis_client
+from backend.ai.tools.search.uhs_site import fetch
+from backend.ai.tools.search.html_extract import (
+    blocks_from_text,
+    extract_blocks,
+    index_terms,
+    select_blocks,
+)
+
+BASE_URL = "https://www.uhs.ac.kr"
+BOARD_PATH = "/portalBbs/uhs/4"
+
+# URL_MAP 항목 → 게시판 검색 조건 / 로컬 파일 이름
+NOTICE_BOARDS = {
+    "장학금 공지사항": {"slug": "scholarship", "keyword": "장학금"},
+    "공모전 공지사항": {"slug": "contest", "keyword": "공모전"},
+}
+
+# 질문 키워드 → 게시판 (없으면 전체 게시판 검색)
+BOARD_KEYWORDS = {
+    "장학": "장학금 공지사항",
+    "공모전": "공모전 공지사항",
+    "대회": "공모전 공지사항",
+}
+
+# k2web 게시판: href="/bbs/uhs/4/123456/artclView.do" 또는 onclick="jf_viewArtcl('uhs', '4', '123456')"
+ARTICLE_HREF_RE = re.compile(r"/bbs/(\w+)/(\d+)/(\d+)/artclView\.do")
+ARTICLE_ONCLICK_RE = re.compile(r"jf_viewArtcl\(\s*'(\w+)'\s*,\s*'(\d+)'\s*,\s*'(\d+)'")
+DATE_RE = re.compile(r"(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})")
+
+DETAIL_SELECTORS = [".artclView", ".view-con", ".bbs_view", "#artclView"]
+TITLE_SELECTORS = [".artclViewTitle", ".view-title", "h2"]
+
+TITLE_WEIGHT = 3
+LOCK_KEY = "uhs_notice_lock:{}"
+
+# 락 값이 내 것일 때만 삭제 (TTL 만료 후 다른 워커가 잡은 락은 건드리지 않음)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def list_url(keyword: str, page: int) -> str:
+    return f"{BASE_URL}{BOARD_PATH}/list.do?srchWrd={quote(keyword)}&srchColumn=sj&page={page}"
+
+
+def view_url(site: str, board_no: str, article_id: int) -> str:
+    return f"{BASE_URL}/bbs/{site}/{board_no}/{article_id}/artclView.do"
+
+
+def _iso_date(text: str) -> Optional[str]:
+    m = DATE_RE.search(text)
+    if not m:
+        return None
+    return f"{int(m.group(1)):04d}-{int(m.group(2)):02d}-{int(m.group(3)):02d}"
+
+
+# ---------------------------------------------------
+# 1) 목록 / 상세 페이지 파싱
+# ---------------------------------------------------
+def parse_list(html: str) -> List[Dict[str, Any]]:
+    """
+    목록 페이지 → [{id, title, date, pinned, url}]
+    pinned: 상단 고정 공지 (번호 칸이 숫자가 아님) — 최신 글이 아닐 수 있다.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    items: Dict[int, Dict[str, Any]] = {}
+
+    for a in soup.find_all("a"):
+        m = ARTICLE_HREF_RE.search(a.get("href") or "") or ARTICLE_ONCLICK_RE.search(
+            (a.get("onclick") or "") + " " + (a.get("href") or "")
+        )
+        if not m:
+            continue
+        site, board_no, article_id = m.group(1), m.group(2), int(m.group(3))
+        if article_id in items:
+            continue
+
+        row = a.find_parent("tr")
+        row_text = row.get_text(" ", strip=True) if row else ""
+        first_cell = row.find("td") if row else None
+        num_text = first_cell.get_text(strip=True) if first_cell else ""
+        classes = " ".join(row.get("class") or []) if row else ""
+
+        items[article_id] = {
+            "id": article_id,
+            "title": a.get_text(" ", strip=True),
+            "date": _iso_date(row_text),
+            "pinned": "headline" in classes or (bool(num_text) and not num_text.isdigit()),
+            "url": view_url(site, board_no, article_id),
+        }
+    return list(items.values())
+
+
+def parse_detail(html: str) -> Dict[str, Any]:
+    """상세 페이지 → {title, date, blocks}"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    title = None
+    for selector in TITLE_SELECTORS:
+        el = soup.select_one(selector)
+        if el and el.get_text(strip=True):
+            title = el.get_text(" ", strip=True)
+            break
+
+    body = None
+    for selector in DETAIL_SELECTORS:
+        body = soup.select_one(selector)
+        if body is not None:
+            break
+
+    text = body.get_text("\n", strip=True) if body is not None else ""
+    return {
+        "title": title,
+        "date": _iso_date(text[:300]),
+        # 본문 컨테이너를 못 찾으면 보일러플레이트 제거 후 전체에서 추출
+        "blocks": blocks_from_text(text) if text else extract_blocks(soup),
+    }
+
+
+# ---------------------------------------------------
+# 2) 로컬 저장소 (게시판별 JSONL + 마지막 ID)
+# ---------------------------------------------------
+class NoticeStore:
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, slug: str) -> str:
+        return os.path.join(self.root, f"{slug}.jsonl")
+
+    def _state_path(self) -> str:
+        return os.path.join(self.root, "state.json")
+
+    def load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def last_seen_id(self, slug: str) -> int:
+        return int(self.load_state().get(slug, {}).get("last_seen_id", 0))
+
+    def append(self, slug: str, posts: List[Dict[str, Any]]) -> None:
+        """새 글을 이어 쓰고 last_seen_id를 갱신한다 (글 → 상태 순서로 기록)."""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            if posts:
+                with open(self._path(slug), "a", encoding="utf-8") as f:
+                    for post in posts:
+                        f.write(json.dumps(post, ensure_ascii=False) + "\n")
+
+            state = self.load_state()
+            prev = state.get(slug, {})
+            state[slug] = {
+                "last_seen_id": max([prev.get("last_seen_id", 0)] + [p["id"] for p in posts]),
+                "synced_at": time.time(),
+                "count": prev.get("count", 0) + len(posts),
+            }
+            tmp = self._state_path() + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp, self._state_path())
+
+    def read_from(self, slug: str, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """offset 바이트 이후에 추가된 글만 읽는다 (끝이 잘린 줄은 다음 번에)."""
+        try:
+            with open(self._path(slug), "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        posts = []
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                posts.append(json.loads(line))
+        return posts, offset + end
+
+
+# ---------------------------------------------------
+# 3) 메모리 역색인 (BM25, 제목 가중치)
+# ---------------------------------------------------
+class NoticeIndex:
+
+    K1, B = 1.2, 0.75
+
+    def __init__(self, store: NoticeStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._docs: List[Dict[str, Any]] = []
+        self._doc_len: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._ids = set()
+        self._offsets: Dict[str, int] = {}
+
+    def add(self, post: Dict[str, Any]) -> None:
+        key = (post["board"], post["id"])
+        if key in self._ids:
+            return
+        counts = Counter(index_terms(post.get("title") or "") * TITLE_WEIGHT)
+        counts.update(index_terms("\n".join(post.get("blocks", []))))
+
+        doc_idx = len(self._docs)
+        self._ids.add(key)
+        self._docs.append(post)
+        self._doc_len.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self._postings[term][doc_idx] = tf
+
+    def refresh(self) -> int:
+        """JSONL에 새로 붙은 글을 인덱스에 반영. 추가된 글 수 반환."""
+        added = 0
+        with self._lock:
+            for info in NOTICE_BOARDS.values():
+                slug = info["slug"]
+                posts, self._offsets[slug] = self.store.read_from(slug, self._offsets.get(slug, 0))
+                for post in posts:
+                    self.add(post)
+                added += len(posts)
+        if added:
+            logger.info(f"[uhs_notice] 인덱스 +{added} (총 {len(self._docs)}건)")
+        return added
+
+    def count(self, board: Optional[str] = None) -> int:
+        if board is None:
+            return len(self._docs)
+        return sum(1 for d in self._docs if d["board"] == board)
+
+    def search(self, query: str, k: int = 5, board: Optional[str] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        q_terms = set(index_terms(query))
+        with self._lock:
+            n = len(self._docs)
+            if not n or not q_terms:
+                return []
+            avg_len = sum(self._doc_len) / n or 1.0
+
+            scores: Dict[int, float] = defaultdict(float)
+            for t in q_terms:
+                postings = self._postings.get(t)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_idx, tf in postings.items():
+                    norm = 1 - self.B + self.B * self._doc_len[doc_idx] / avg_len
+                    scores[doc_idx] += idf * tf * (self.K1 + 1) / (tf + self.K1 * norm)
+
+            ranked = sorted(
+                ((s, self._docs[i]) for i, s in scores.items() if board is None or self._docs[i]["board"] == board),
+                key=lambda x: (-x[0], -(x[1]["id"])),
+            )
+        return ranked[:k]
+
+    def latest(self, k: int = 5, board: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            docs = [d for d in self._docs if board is None or d["board"] == board]
+        return sorted(docs, key=lambda d: d["id"], reverse=True)[:k]
+
+
+# ---------------------------------------------------
+# 4) 증분 크롤러
+# ---------------------------------------------------
+class NoticeCrawler:
+
+    def __init__(self, store: NoticeStore, max_pages: int):
+        self.store = store
+        self.max_pages = max_pages
+
+    def sync(self, board: str) -> int:
+        """
+        last_seen_id보다 새 글만 받아 저장한다. 저장한 글 수 반환.
+        목록은 최신순이므로, 고정 공지를 제외한 새 글이 하나도 없는 페이지에서 멈춘다.
+        (최초 실행 시에는 max_pages까지 과거 글을 채운다)
+        """
+        info = NOTICE_BOARDS[board]
+        last_seen = self.store.last_seen_id(info["slug"])
+
+        new_items: Dict[int, Dict[str, Any]] = {}
+        for page in range(1, self.max_pages + 1):
+            items = parse_list(fetch(list_url(info["keyword"], page)).text)
+            regular = [it for it in items if not it["pinned"]]
+            fresh = [it for it in items if it["id"] > last_seen and it["id"] not in new_items]
+            for it in fresh:
+                new_items[it["id"]] = it
+            if not regular or not any(it["id"] > last_seen for it in regular):
+                break
+
+        posts = []
+        for article_id in sorted(new_items):
+            item = new_items[article_id]
+            try:
+                detail = parse_detail(fetch(item["url"]).text)
+            except Exception as e:
+                # 실패한 글부터는 저장하지 않는다 (last_seen_id가 넘어가면 다시 받지 못하므로 다음 동기화에서 재시도)
+                logger.warning(f"[uhs_notice] 상세 페이지 실패 id={article_id}, 이후 글은 다음 동기화에서: {e}")
+                break
+            posts.append({
+                "id": article_id,
+                "board": board,
+                "title": item["title"] or detail["title"] or "",
+                "date": item["date"] or detail["date"],
+                "url": item["url"],
+                "blocks": detail["blocks"],
+                "crawled_at": time.time(),
+            })
+
+        self.store.append(info["slug"], posts)
+        logger.info(f"[uhs_notice] sync board='{board}' last_seen={last_seen} → +{len(posts)}")
+        return len(posts)
+
+
+# ---------------------------------------------------
+# 5) 백그라운드 동기화
+# ---------------------------------------------------
+class NoticeSyncer:
+
+    TICK_SECONDS = 60
+
+    def __init__(self, crawler: NoticeCrawler, index: NoticeIndex):
+        self.crawler = crawler
+        self.index = index
+        self._task: Optional[asyncio.Task] = None
+        self._next_sync: Dict[str, float] = {}
+        self._owner = uuid.uuid4().hex
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"[uhs_notice] 게시판 동기화 시작: {list(NOTICE_BOARDS.keys())}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _acquire(self, board: str, ttl: int) -> bool:
+        """다른 워커가 이미 크롤링 중이거나 Redis를 쓸 수 없으면 False (JSONL에 중복으로 쓰지 않도록)"""
+        try:
+            return bool(get_redis_client().set(LOCK_KEY.format(board), self._owner, nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning(f"[uhs_notice] 동기화 락 획득 실패 board='{board}': {e}")
+            return False
+
+    def _release(self, board: str) -> None:
+        try:
+            get_redis_client().eval(_RELEASE_SCRIPT, 1, LOCK_KEY.format(board), self._owner)
+        except Exception as e:
+            logger.warning(f"[uhs_notice] 동기화 락 해제 실패 board='{board}': {e}")
+
+    async def _sync_one(self, board: str) -> None:
+        interval = settings.uhs_notice_sync_interval
+        self._next_sync[board] = time.time() + interval
+
+        if not await asyncio.to_thread(self._acquire, board, max(60, interval // 2)):
+            return
+        try:
+            await asyncio.to_thread(self.crawler.sync, board)
+        except Exception as e:
+            logger.warning(f"[uhs_notice] 동기화 실패 board='{board}': {e}")
+            self._next_sync[board] = time.time() + min(interval, 5 * 60)
+        finally:
+            await asyncio.to_thread(self._release, board)
+
+    async def _run(self) -> None:
+        await asyncio.to_thread(self.index.refresh)
+        while True:
+            now = time.time()
+            for board in NOTICE_BOARDS:
+                if self._next_sync.get(board, 0) <= now:
+                    await self._sync_one(board)
+            # 다른 워커가 붙인 글 포함
+            await asyncio.to_thread(self.index.refresh)
+            await asyncio.sleep(self.TICK_SECONDS)
+
+
+notice_store = NoticeStore(settings.uhs_notice_dir)
+notice_index = NoticeIndex(notice_store)
+notice_crawler = NoticeCrawler(notice_store, settings.uhs_notice_max_pages)
+notice_syncer = NoticeSyncer(notice_crawler, notice_index)
+
+
+def start_notice_syncer() -> None:
+    if settings.uhs_notice_enabled:
+        notice_syncer.start()
+
+
+# ---------------------------------------------------
+# 6) 질문 → 검색 결과 문자열
+# ---------------------------------------------------
+def detect_board(query: str) -> Optional[str]:
+    for keyword, board in BOARD_KEYWORDS.items():
+        if keyword in query:
+            return board
+    return None
+
+
+def search_notices(query: str, board: Optional[str] = None, k: Optional[int] = None) -> Optional[str]:
+    """
+    로컬 인덱스에서 공지를 찾아 에이전트용 문자열로 만든다.
+    인덱스가 비어 있으면 None (호출 측에서 라이브 페이지로 대체).
+    """
+    k = k or settings.uhs_notice_top_k
+    if not notice_index.count():
+        notice_index.refresh()
+    if not notice_index.count(board):
+        return None
+
+    hits = notice_index.search(query, k=k, board=board)
+    if hits:
+        posts = [post for _, post in hits]
+        header = f"[공지사항 검색 결과] {len(posts)}건 (로컬 {notice_index.count(board)}건 중)"
+    else:
+        # "최근 장학금 공지"처럼 키워드가 게시판 이름뿐이면 최신 글
+        posts = notice_index.latest(k=k, board=board)
+        header = f"[최근 공지사항] {len(posts)}건"
+
+    per_post_cap = max(80, settings.uhs_fallback_token_cap // max(1, len(posts)))
+    out = []
+    for post in posts:
+        excerpt = "\n  ".join(select_blocks(post.get("blocks", []), query, per_post_cap))
+        out.append(f"- [{post.get('date') or '날짜 미상'}] {post['title']}\n  URL: {post['url']}\n  {excerpt}".rstrip())
+    return header + "\n\n" + "\n\n".join(out)
@@ -0,0 +1,211 @@
+# backend/ai/tools/search/uhs_site.py
+
+"""
+협성대 홈페이지(uhs.ac.kr) 페이지 목록 / 요청 / 파싱
+파싱은 페이지를 받아올 때 한 번만 수행하고, 결과는 uhs_cache에 구조화된 형태로 저장한다.
+
+요청은 공유 커넥션 풀(requests.Session)을 쓰고, 이전 레코드의 ETag/Last-Modified로
+조건부 요청을 보낸다. 304이거나 본문 해시가 같으면 BeautifulSoup 파싱을 건너뛴다.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+import urllib3
+from bs4 import BeautifulSoup
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.core.config import settings
+from backend.ai.tools.search.uhs_menu import MENU_TARGETS, parse_menu
+from backend.ai.tools.search.html_extract import extract_blocks
+
+urllib3.disable_warnings()
+
+URL_MAP = {
+    "동아리": "https://www.uhs.ac.kr/uhs/295/subview.do",
+    "학생식단": "https://www.uhs.ac.kr/uhs/2951/subview.do",
+    "교직원식단": "https://www.uhs.ac.kr/uhs/2949/subview.do",
+    "등록금": "https://www.uhs.ac.kr/global/2697/subview.do",
+    "교환학생": "https://www.uhs.ac.kr/global/2710/subview.do",
+    "취업률": "https://www.academyinfo.go.kr/popup/pubinfo1690/list.do?schlId=0000207",
+    "장학금 공지사항": "https://www.uhs.ac.kr/uhs/155/subview.do?enc=Zm5jdDF8QEB8JTJGcG9ydGFsQmJzJTJGdWhzJTJGNCUyRmxpc3QuZG8lM0ZzcmNoV3JkJTNEJUVDJTlFJUE1JUVEJTk1JTk5JUVBJUI4JTg4JTI2c3JjaENvbHVtbiUzRHNqJTI2cGFnZSUzRDIlMjY%3D#this",
+    "공모전 공지사항": "https://www.uhs.ac.kr/uhs/155/subview.do?enc=Zm5jdDF8QEB8JTJGcG9ydGFsQmJzJTJGdWhzJTJGNCUyRmxpc3QuZG8lM0ZzcmNoV3JkJTNEJUVBJUIzJUI1JUVCJUFBJUE4JUVDJUEwJTg0JTI2c3JjaENvbHVtbiUzRHNqJTI2cGFnZSUzRDElMjY%3D"
+}
+
+# 페이지별 백그라운드 갱신 주기(초). 식단은 점심 전후로 자주, 안내 페이지는 드물게.
+REFRESH_INTERVALS = {
+    "학생식단": 30 * 60,
+    "교직원식단": 30 * 60,
+    "장학금 공지사항": 60 * 60,
+    "공모전 공지사항": 60 * 60,
+    "동아리": 6 * 60 * 60,
+    "등록금": 12 * 60 * 60,
+    "교환학생": 12 * 60 * 60,
+    "취업률": 24 * 60 * 60,
+}
+DEFAULT_REFRESH_INTERVAL = 6 * 60 * 60
+
+FETCH_TIMEOUT = 8
+
+
+def refresh_interval(target: str) -> int:
+    return REFRESH_INTERVALS.get(target, DEFAULT_REFRESH_INTERVAL)
+
+
+# ---------------------------------------------------
+# 공유 HTTP 세션 + 요청 통계
+# ---------------------------------------------------
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "status_200": 0,
+    "status_304": 0,
+    "errors": 0,
+    "bytes": 0,
+    "parsed": 0,
+    "parse_skipped": 0,
+}
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=settings.uhs_http_pool_size,
+                max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.verify = settings.uhs_verify_ssl
+            _session = session
+        return _session
+
+
+def _count(**deltas: int) -> None:
+    with _stats_lock:
+        for k, v in deltas.items():
+            _stats[k] += v
+
+
+def fetch_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    validated = stats["status_200"] + stats["status_304"]
+    stats["not_modified_ratio"] = round(stats["status_304"] / validated, 3) if validated else 0.0
+    return stats
+
+
+def fetch(url: str, previous: Optional[Dict[str, Any]] = None) -> requests.Response:
+    """
+    조건부 GET. previous 레코드에 ETag/Last-Modified가 있으면 검증 헤더를 붙인다.
+    200/304 이외의 상태 코드는 예외.
+    """
+    headers = {}
+    if previous:
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+
+    try:
+        resp = get_session().get(url, headers=headers, timeout=FETCH_TIMEOUT)
+    except Exception:
+        _count(requests=1, errors=1)
+        raise
+
+    _count(requests=1, bytes=len(resp.content))
+    logger.info(f"[uhs_site] GET {url} status_code={resp.status_code} bytes={len(resp.content)}")
+
+    if resp.status_code == 304:
+        _count(status_304=1)
+    elif resp.status_code == 200:
+        _count(status_200=1)
+    else:
+        _count(errors=1)
+        raise RuntimeError(f"상태 코드 {resp.status_code}")
+    return resp
+
+
+def parse_page(html: str, target: Optional[str] = None) -> Dict[str, Any]:
+    """
+    HTML → 구조화된 결과
+      rows: 모든 <table>의 <tr> 텍스트
+      text: 페이지 전체 텍스트
+      menu: (식단 페이지만) 날짜 → 끼니 → 메뉴 인덱스 (uhs_menu.parse_menu)
+      blocks: 보일러플레이트를 걷어낸 본문 블록 (html_extract, fallback 경로용)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    rows: List[str] = []
+    grids: List[List[List[str]]] = []
+    for table in soup.find_all("table"):
+        grid = []
+        for tr in table.find_all("tr"):
+            row_text = tr.get_text(" ", strip=True)
+            if row_text:
+                rows.append(row_text)
+            grid.append([cell.get_text("\n", strip=True) for cell in tr.find_all(["th", "td"])])
+        grids.append(grid)
+
+    parsed = {
+        "rows": rows,
+        "text": soup.get_text("\n", strip=True),
+    }
+    if target in MENU_TARGETS:
+        parsed["menu"] = parse_menu(grids)
+
+    # soup를 변경하므로 마지막에 수행
+    parsed["blocks"] = extract_blocks(soup)
+    return parsed
+
+
+def fetch_and_parse(target: str, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    target 페이지를 받아와 파싱한 캐시 레코드를 만든다.
+    페이지가 바뀌지 않았으면(304 또는 같은 본문 해시) previous의 파싱 결과를 재사용한다.
+    """
+    url = URL_MAP[target]
+    if previous and previous.get("url") != url:
+        previous = None
+
+    resp = fetch(url, previous)
+
+    if resp.status_code == 304:
+        content_hash = previous["content_hash"]
+        parsed = previous["parsed"]
+    else:
+        content_hash = hashlib.sha256(resp.content).hexdigest()
+        same = previous is not None and previous.get("content_hash") == content_hash
+        parsed = previous["parsed"] if same else None
+
+    if parsed is not None:
+        _count(parse_skipped=1)
+        logger.info(f"[uhs_site] unchanged target='{target}' → 이전 파싱 재사용")
+    else:
+        parsed = parse_page(resp.text, target)
+        _count(parsed=1)
+        logger.info(
+            f"[uhs_site] parsed target='{target}': rows={len(parsed['rows'])}, "
+            f"menu_days={len(parsed.get('menu', {}).get('days', {}))}"
+        )
+
+    return {
+        "target": target,
+        "url": url,
+        "fetched_at": time.time(),
+        "etag": resp.headers.get("ETag") or (previous or {}).get("etag"),
+        "last_modified": resp.headers.get("Last-Modified") or (previous or {}).get("last_modified"),
+        "content_hash": content_hash,
+        "parsed": parsed,
+    }
@@ -1,24 +1,242 @@
-from langchain_core.tools import tool
-from tavily import TavilyClient
+# backend/ai/tools/search/web_search.py
+
+"""
+Tavily 웹 검색 Tool
+
+- AsyncTavilyClient 하나를 전용 이벤트 루프 스레드에서 계속 재사용한다.
+- 정규화한 쿼리 기준으로 결과를 TTL 캐시에 저장한다 (Redis 공유, 불가 시 로컬 dict).
+- 같은 쿼리가 동시에 들어오면 Tavily 요청은 하나만 보내고 결과를 나눠 쓴다.
+- 결과 본문은 토큰 예산(WEB_SEARCH_SNIPPET_TOKENS)에 맞춰 잘라서 에이전트에 넘긴다.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.tools import StructuredTool
+from loguru import logger
+from tavily import AsyncTavilyClient
+
 from backend.core.config import settings
+from backend.core.redis_client import get_async_redis_client, get_redis_client
+from backend.ai.tokens import truncate_to_tokens
+
+CACHE_KEY = "web_search:{}"
+_WS_RE = re.compile(r"\s+")
+_EDGE_PUNCT_RE = re.compile(r"^[\s\W_]+|[\s\W_]+$", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """대소문자/공백/앞뒤 문장부호 차이를 없앤 캐시 키용 쿼리"""
+    return _EDGE_PUNCT_RE.sub("", _WS_RE.sub(" ", query.lower()))
+
+
+def _trim_results(res: Dict[str, Any]) -> List[Dict[str, str]]:
+    """결과별 본문을 토큰 예산 안으로 자른다 (캐시에도 잘린 형태로 저장)."""
+    out = []
+    for r in res.get("results", [])[: settings.web_search_max_results]:
+        out.append({
+            "title": r.get("title") or "",
+            "url": r.get("url") or "",
+            "content": truncate_to_tokens((r.get("content") or "").strip(), settings.web_search_snippet_tokens),
+        })
+    return out
+
+
+def format_results(results: List[Dict[str, str]]) -> str:
+    out = [f"제목: {r['title']}\n내용: {r['content']}\nURL: {r['url']}" for r in results]
+    return "\n\n".join(out) if out else "검색 결과 없음"
 
-@tool
-def web_search(query: str) -> str:
-    """Tavily 웹 검색 Tool"""
 
+class WebSearchClient:
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[AsyncTavilyClient] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._local: Dict[str, Tuple[float, List[Dict[str, str]]]] = {}
+        self._stats = {"calls": 0, "cache_hits": 0, "deduped": 0, "requests": 0, "errors": 0, "request_ms": 0.0}
+
+    # ---------------------------------------------------
+    # 전용 이벤트 루프 / 클라이언트
+    # ---------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="web-search", daemon=True)
+                self._thread.start()
+                self._client = AsyncTavilyClient(api_key=settings.tavily_api_key)
+            return self._loop
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._client = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+    def _count(self, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    # ---------------------------------------------------
+    # TTL 캐시
+    # ---------------------------------------------------
+    def _cache_get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        try:
+            raw = get_redis_client().get(CACHE_KEY.format(key))
+            if raw:
+                return json.loads(raw)
+        except Exception as e:
+            logger.warning(f"[web_search] Redis 조회 실패, 로컬 캐시 사용: {e}")
+        return self._local_get(key)
+
+    async def _acache_get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        # 호출한 이벤트 루프를 막지 않도록 비동기 클라이언트로
+        try:
+            raw = await get_async_redis_client().get(CACHE_KEY.format(key))
+            if raw:
+                return json.loads(raw)
+        except Exception as e:
+            logger.warning(f"[web_search] Redis 조회 실패, 로컬 캐시 사용: {e}")
+        return self._local_get(key)
+
+    def _local_get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        hit = self._local.get(key)
+        if hit and hit[0] > time.time():
+            return hit[1]
+        return None
+
+    def _redis_put(self, key: str, results: List[Dict[str, str]]) -> None:
+        try:
+            get_redis_client().setex(
+                CACHE_KEY.format(key), settings.web_search_cache_ttl, json.dumps(results, ensure_ascii=False)
+            )
+        except Exception as e:
+            logger.warning(f"[web_search] Redis 저장 실패, 로컬 캐시만 갱신: {e}")
+
+    # ---------------------------------------------------
+    # 요청 (동일 쿼리 in-flight 병합)
+    # ---------------------------------------------------
+    async def _request(self, key: str, query: str) -> List[Dict[str, str]]:
+        started = time.perf_counter()
+        try:
+            res = await asyncio.wait_for(
+                self._client.search(query=query, max_results=settings.web_search_max_results),
+                timeout=settings.web_search_timeout,
+            )
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            self._count("requests")
+            self._count("request_ms", (time.perf_counter() - started) * 1000)
+        results = _trim_results(res)
+        # 결과를 넘기기 전에 로컬 캐시부터 채워야 in-flight에서 빠진 뒤 들어온 요청이 다시 호출하지 않는다
+        self._local[key] = (time.time() + settings.web_search_cache_ttl, results)
+        # Redis 저장은 기다리지 않고 스레드에서 (Redis가 느려도 Tavily 루프가 멈추지 않게)
+        asyncio.get_running_loop().run_in_executor(None, self._redis_put, key, results)
+        return results
+
+    def _submit(self, key: str, query: str) -> Future:
+        loop = self._ensure_loop()
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["deduped"] += 1
+                return future
+            # _lookup 이후 같은 쿼리 요청이 끝났으면 (로컬 캐시 저장 → in-flight 제거 순서라) 로컬 캐시에 있다
+            cached = self._local_get(key)
+            if cached is not None:
+                self._stats["cache_hits"] += 1
+                future = Future()
+                future.set_result(cached)
+                return future
+            future = asyncio.run_coroutine_threadsafe(self._request(key, query), loop)
+            self._inflight[key] = future
+
+        def _done(f: Future) -> None:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        future.add_done_callback(_done)
+        return future
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+
+    def _lookup(self, query: str) -> Tuple[str, Optional[List[Dict[str, str]]]]:
+        self._count("calls")
+        key = self._key(query)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._count("cache_hits")
+        return key, cached
+
+    async def _alookup(self, query: str) -> Tuple[str, Optional[List[Dict[str, str]]]]:
+        self._count("calls")
+        key = self._key(query)
+        cached = await self._acache_get(key)
+        if cached is not None:
+            self._count("cache_hits")
+        return key, cached
+
+    def search(self, query: str) -> List[Dict[str, str]]:
+        key, cached = self._lookup(query)
+        if cached is not None:
+            return cached
+        return self._submit(key, query).result(timeout=settings.web_search_timeout + 5)
+
+    async def asearch(self, query: str) -> List[Dict[str, str]]:
+        key, cached = await self._alookup(query)
+        if cached is not None:
+            return cached
+        return await asyncio.wrap_future(self._submit(key, query))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["cache_hit_ratio"] = round(stats["cache_hits"] / stats["calls"], 3) if stats["calls"] else 0.0
+        request_ms = stats.pop("request_ms")
+        stats["avg_request_ms"] = round(request_ms / stats["requests"], 1) if stats["requests"] else 0.0
+        return stats
+
+
+web_search_client = WebSearchClient()
+
+
+def _web_search(query: str) -> str:
     if not settings.tavily_api_key:
         return "Tavily API 키 없음"
-
     try:
-        client = TavilyClient(api_key=settings.tavily_api_key)
-        res = client.search(query=query, max_results=3)
+        return format_results(web_search_client.search(query))
+    except Exception as e:
+        return f"웹검색 오류: {e}"
 
-        out = []
-        for r in res.get("results", []):
-            out.append(
-                f"제목: {r.get('title')}\n내용: {r.get('content')}\nURL: {r.get('url')}"
-            )
 
-        return "\n\n".join(out) if out else "검색 결과 없음"
+async def _aweb_search(query: str) -> str:
+    if not settings.tavily_api_key:
+        return "Tavily API 키 없음"
+    try:
+        return format_results(await web_search_client.asearch(query))
     except Exception as e:
         return f"웹검색 오류: {e}"
+
+
+web_search = StructuredTool.from_function(
+    func=_web_search,
+    coroutine=_aweb_search,
+    name="web_search",
+    description="Tavily 웹 검색 Tool",
+)
@@ -3,11 +3,12 @@ load_dotenv()
 
 import os
 import pickle
-from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from backend.core.llm_factory import get_embeddings
+
 
 class FaissStoreBuilder:
 
@@ -18,10 +19,7 @@ class FaissStoreBuilder:
             raise ValueError("❌ OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
 
         # 🔹 최신 OpenAI 임베딩 (1024차원, 한국어 강함)
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-large",
-            api_key=api_key
-        )
+        self.embeddings = get_embeddings("text-embedding-3-large")
 
         # 🔹 리커시브 시멘틱 청킹 (600자 / 100자 오버랩)
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -4,7 +4,8 @@ from pathlib import Path
 import traceback
 
 from langchain_community.vectorstores import FAISS
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from backend.core.llm_factory import get_chat_model, get_embeddings
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -22,13 +23,8 @@ class RAGPipeline:
 
         # 2) LLM / Embedding
         print("[RAG] ChatOpenAI / OpenAIEmbeddings 초기화 중...")
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-        )
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-large"
-        )
+        self.llm = get_chat_model("gpt-4o-mini", temperature=0)
+        self.embeddings = get_embeddings("text-embedding-3-large")
 
         # 3) 이 파일(rag_pipeline.py) 기준으로 경로 잡기
         base_dir = Path(__file__).resolve().parent  # backend/ai/vector
@@ -113,12 +109,18 @@ class RAGPipeline:
     # ----------------------------------------------------
     # 2) 최종 답변 생성
     # ----------------------------------------------------
-    def answer(self, query: str) -> str:
+    def answer(self, query: str, results=None) -> str:
+        """
+        results가 주어지면(예: 투기적 프리페치 결과) 검색을 건너뛰고 그대로 사용한다.
+        """
         print("\n[RAG.answer] ================== answer 호출 ==================")
         print(f"[RAG.answer] 사용자 질문: {query}")
 
         # 1) 검색
-        results = self.search(query)
+        if results is None:
+            results = self.search(query)
+        else:
+            print(f"[RAG.answer] 프리페치된 검색 결과 사용: {len(results)}개")
 
         # 2) 컨텍스트 구성
         context_text = ""
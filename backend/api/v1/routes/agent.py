@@ -5,6 +5,12 @@ from pydantic import BaseModel, Field
 from loguru import logger
 
 from backend.ai.agent.react_agent import run_react_agent, TOOLS
+from backend.ai.tools.search.rag_prefetch import rag_prefetcher
+from backend.ai.agent.model_router import model_router
+from backend.ai.agent.prompts.token_report import token_report
+from backend.ai.tools.search.uhs_site import fetch_stats
+from backend.ai.tools.search.uhs_notice import notice_store, notice_index
+from backend.ai.tools.search.web_search import web_search_client
 
 router = APIRouter()
 
@@ -48,7 +54,43 @@ async def run_agent(request: AgentRequest):
     
 @router.get("/tools")
 async def get_tools():
-    return {"tools": ["web_search", "uhs_fetch_info", "rag_search"]}
+    return {"tools": [t.name for t in TOOLS]}
+
+
+@router.get("/speculation")
+async def get_speculation_stats():
+    """투기적 RAG 프리페치 적중률"""
+    return rag_prefetcher.stats()
+
+
+@router.get("/routing")
+async def get_routing_stats():
+    """모델 라우팅 티어별 지연/품질 샘플"""
+    return model_router.stats()
+
+
+@router.get("/prompt-report")
+async def get_prompt_report():
+    """호출별 정적/동적 프롬프트 토큰 집계"""
+    return token_report.report()
+
+
+@router.get("/uhs-fetch-stats")
+async def get_uhs_fetch_stats():
+    """협성대 홈페이지 요청 수 / 전송 바이트 / 304 비율"""
+    return fetch_stats()
+
+
+@router.get("/notice-sync")
+async def get_notice_sync_state():
+    """공지사항 게시판별 마지막 게시글 ID / 동기화 시각 / 인덱스 크기"""
+    return {"boards": notice_store.load_state(), "indexed": notice_index.count()}
+
+
+@router.get("/web-search-stats")
+async def get_web_search_stats():
+    """웹 검색 캐시 적중률 / 중복 요청 병합 수 / 평균 Tavily 지연"""
+    return web_search_client.stats()
 
 
 @router.get("/health") 
@@ -1,14 +1,34 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+from fastapi.responses import FileResponse, StreamingResponse
+import asyncio
 import uuid
+import zipfile
 import json
-import tempfile
 import os
-from backend.core.redis_client import get_redis_client
+from typing import Optional
+from backend.core.config import settings
+from backend.core.redis_client import get_async_redis_client, get_redis_client
 from backend.ai.grading.grading_pipeline import GradingPipeline
+from backend.ai.grading.job_queue import ACTIVE_STATUSES, RESULT_CHUNK, grading_jobs
+from backend.ai.grading.report import write_reports
+from backend.ai.grading.repository import get_job, iter_submissions, list_jobs, list_submissions
+from backend.ai.grading.scheduler import get_grading_scheduler
+from backend.core.artifact_store import get_artifact_store
+from backend.ai.grading.storage import (
+    REPORT_CSV_FILENAME,
+    REPORT_FILENAME,
+    UPLOAD_FILENAME,
+    UploadTooLarge,
+    remove_session,
+    save_upload,
+    session_dir,
+)
 
 router = APIRouter(tags=["Grading"])
 
+# SSE 스트림: 새 이벤트가 없을 때 기다리는 시간 (지나면 keepalive 주석을 보냄)
+STREAM_BLOCK_MS = 15000
+
 @router.post("/upload-assignments")
 async def upload_assignments(file: UploadFile = File(...)):
     """과제 ZIP 파일 업로드"""
@@ -21,12 +41,18 @@ async def upload_assignments(file: UploadFile = File(...)):
     session_id = str(uuid.uuid4())
     print(f"🎫 세션 ID 생성: {session_id}")
     
-    # 임시 파일로 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-        print(f"💾 임시 파일 저장: {tmp_path} ({len(content)} bytes)")
+    # 세션 디렉터리에 청크 단위로 저장 (ZIP 전체를 메모리에 올리지 않음)
+    tmp_path = os.path.join(session_dir(session_id, create=True), UPLOAD_FILENAME)
+    try:
+        size = await save_upload(file, tmp_path, settings.grading_max_upload_mb * 1024 * 1024)
+    except UploadTooLarge as e:
+        remove_session(session_id)
+        raise HTTPException(413, str(e))
+    print(f"💾 업로드 저장: {tmp_path} ({size} bytes)")
+
+    if not zipfile.is_zipfile(tmp_path):
+        remove_session(session_id)
+        raise HTTPException(400, "올바른 ZIP 파일이 아닙니다")
     
     # Redis에 저장
     redis_client = get_redis_client()
@@ -45,9 +71,12 @@ async def upload_assignments(file: UploadFile = File(...)):
     return {"session_id": session_id, "filename": file.filename}
 
 @router.post("/grade/{session_id}")
-async def grade_assignments(session_id: str, rubric: str = Form(...)):
-    """과제 채점 실행"""
-    print(f"🎯 채점 시작: {session_id}")
+async def grade_assignments(session_id: str, rubric: str = Form(...), mode: str = Form("online")):
+    """
+    과제 채점 작업 등록 (백그라운드 실행, 결과/진행률은 /stream(SSE) 또는 /status 에서 확인)
+    mode: online(바로 채점) | batch(Batch API, 결과까지 오래 걸리지만 비용이 낮음)
+    """
+    print(f"🎯 채점 요청: {session_id}")
     
     redis_client = get_redis_client()
     data = redis_client.get(f"grading:{session_id}")
@@ -59,111 +88,256 @@ async def grade_assignments(session_id: str, rubric: str = Form(...)):
     session_info = json.loads(data)
     print(f"📊 세션 정보: {session_info}")
     
+    # Rubric 파싱
     try:
-        # 진행상태 업데이트
-        print(f"🔄 진행상태 업데이트: processing")
-        redis_client.setex(f"grading_result:{session_id}", 3600, json.dumps({"status": "processing"}))
-        
-        # Rubric 파싱
-        print(f"📋 Rubric 파싱: {rubric}")
         rubric_dict = json.loads(rubric)
-        print(f"📋 Rubric 딕셔너리: {rubric_dict}")
-        
-        # 채점 파이프라인 실행
-        print(f"🚀 채점 파이프라인 시작")
-        pipeline = GradingPipeline()
-        pdf_files = pipeline.extract_zip(session_info["zip_path"])
-        
-        if not pdf_files:
-            print(f"❌ PDF 파일 없음")
-            raise HTTPException(400, "ZIP 파일에 PDF가 없습니다")
-        
-        print(f"📝 총 {len(pdf_files)}개 PDF 파일 발견")
-        
-        # 병렬 채점
-        print(f"🚀 병렬 채점 시작")
-        results = await pipeline.grade_assignments_parallel(pdf_files, rubric_dict)
-        print(f"✅ 병렬 채점 완료: {len(results)}개 결과")
-        
-        # Excel 보고서 생성
-        print(f"📈 Excel 보고서 생성 시작")
-        excel_path = pipeline.create_excel_report(results, rubric_dict)
-        print(f"✅ Excel 보고서 생성 완료: {excel_path}")
-        
-        # 결과 저장
-        result_data = {
-            "status": "completed",
-            "results": results,
-            "excel_path": excel_path,
-            "total_files": len(pdf_files)
-        }
-        redis_client.setex(f"grading_result:{session_id}", 3600, json.dumps(result_data))
-        print(f"📊 결과 Redis 저장 완료")
-        
-        return {
-            "status": "completed",
-            "results": results,
-            "total_files": len(pdf_files)
-        }
-        
-    except Exception as e:
-        print(f"❌ 채점 오류: {str(e)}")
-        redis_client.setex(f"grading_result:{session_id}", 3600, json.dumps({
-            "status": "error", 
-            "message": str(e)
-        }))
-        raise HTTPException(500, f"채점 실패: {str(e)}")
+    except json.JSONDecodeError:
+        raise HTTPException(400, "Rubric JSON 형식이 올바르지 않습니다")
+    print(f"📋 Rubric 딕셔너리: {rubric_dict}")
+    
+    if mode not in ("online", "batch"):
+        raise HTTPException(400, "mode는 online 또는 batch 입니다")
+    
+    if grading_jobs.is_running(session_id):
+        return {"session_id": session_id, **(await grading_jobs.aget_status(session_id) or {"status": "processing"})}
+    
+    pdf_files = await asyncio.to_thread(GradingPipeline().list_zip_pdfs, session_info["zip_path"])
+    if not pdf_files:
+        print(f"❌ PDF 파일 없음")
+        raise HTTPException(400, "ZIP 파일에 PDF가 없습니다")
+    
+    await grading_jobs.submit(session_id, rubric_dict, total=len(pdf_files), mode=mode)
+    
+    return {
+        "session_id": session_id,
+        "status": "queued",
+        "mode": mode,
+        "total_files": len(pdf_files)
+    }
 
-@router.get("/download-excel/{session_id}")
-async def download_excel(session_id: str):
-    """Excel 보고서 다운로드"""
-    print(f"📈 Excel 다운로드 요청: {session_id}")
+@router.post("/retry-failed/{session_id}")
+async def retry_failed_assignments(session_id: str):
+    """채점에 실패한 파일만 다시 채점 (성공한 결과는 유지)"""
+    print(f"🔁 실패 재채점 요청: {session_id}")
     
     redis_client = get_redis_client()
-    data = redis_client.get(f"grading_result:{session_id}")
-    
-    if not data:
-        print(f"❌ 결과 데이터 없음: {session_id}")
-        raise HTTPException(404, "결과를 찾을 수 없습니다")
+    if not redis_client.get(f"grading:{session_id}"):
+        raise HTTPException(404, "세션을 찾을 수 없습니다")
+    if grading_jobs.is_running(session_id):
+        raise HTTPException(409, "채점이 진행 중입니다")
     
-    result_info = json.loads(data)
-    print(f"📊 결과 상태: {result_info['status']}")
+    retried = await grading_jobs.retry_failed(session_id)
+    if not retried:
+        return {"session_id": session_id, "status": "no_failed", "retried": 0}
     
-    if result_info["status"] != "completed":
-        print(f"❌ 채점 미완료: {result_info['status']}")
+    return {"session_id": session_id, "status": "queued", "retried": retried}
+
+async def _report_path(session_id: str, key: str, filename: str) -> str:
+    """
+    완료된 작업의 보고서 경로. 세션 파일이 정리됐거나 Redis가 만료된 작업은
+    DB에 저장된 결과로 보고서를 다시 만든다 (재채점 없음).
+    """
+    status = await grading_jobs.aget_status(session_id)
+    if status and status["status"] != "completed":
+        print(f"❌ 채점 미완료: {status['status']}")
         raise HTTPException(400, "채점이 완료되지 않았습니다")
     
-    excel_path = result_info["excel_path"]
-    print(f"💾 Excel 파일 경로: {excel_path}")
+    path = (status or {}).get(key)
+    if path and os.path.exists(path):
+        return path
     
-    if not os.path.exists(excel_path):
-        print(f"❌ Excel 파일 없음: {excel_path}")
-        raise HTTPException(404, "Excel 파일을 찾을 수 없습니다")
+    job = await asyncio.to_thread(get_job, session_id)
+    if not job:
+        print(f"❌ 결과 데이터 없음: {session_id}")
+        raise HTTPException(404, "결과를 찾을 수 없습니다")
     
-    print(f"✅ Excel 파일 다운로드 준비 완료")
+    path = os.path.join(session_dir(session_id, create=True), filename)
+    print(f"♻️ DB 결과로 보고서 재생성: {path}")
+    await asyncio.to_thread(write_reports, iter_submissions(session_id), job["rubric"], [path])
+    return path
+
+@router.get("/download-excel/{session_id}")
+async def download_excel(session_id: str):
+    """Excel 보고서 다운로드"""
+    print(f"📈 Excel 다운로드 요청: {session_id}")
+    
+    excel_path = await _report_path(session_id, "excel_path", REPORT_FILENAME)
+    print(f"✅ Excel 파일 다운로드 준비 완료: {excel_path}")
     return FileResponse(
         excel_path,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         filename="grading_results.xlsx"
     )
 
-@router.get("/status/{session_id}")
-async def get_grading_status(session_id: str):
-    """채점 진행상태 확인"""
-    redis_client = get_redis_client()
-    data = redis_client.get(f"grading_result:{session_id}")
+@router.get("/download-csv/{session_id}")
+async def download_csv(session_id: str):
+    """CSV 보고서 다운로드"""
+    csv_path = await _report_path(session_id, "csv_path", REPORT_CSV_FILENAME)
+    return FileResponse(csv_path, media_type="text/csv", filename=REPORT_CSV_FILENAME)
+
+@router.get("/results/{session_id}")
+async def get_grading_results(
+    session_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    student_id: Optional[str] = None,
+    assignment: Optional[str] = None,
+    status: Optional[str] = None,
+    order: str = "position",
+):
+    """
+    채점 결과 목록 (offset/limit 페이지 단위)
+    완료된 작업은 DB에서 학번/과제명/상태 필터와 정렬(position | score)을 지원하고,
+    진행 중인 작업은 Redis 해시에서 ZIP 순서로 읽는다.
+    """
+    limit = max(1, min(limit, 1000))
+    offset = max(0, offset)
+    job_status = await grading_jobs.aget_status(session_id)
     
+    if not job_status or job_status["status"] == "completed":
+        job = await asyncio.to_thread(get_job, session_id)
+        if job:
+            total, results = await asyncio.to_thread(
+                list_submissions, session_id, offset, limit, student_id, assignment, status, order
+            )
+            return {"session_id": session_id, "offset": offset, "limit": limit, "total": total, "results": results}
+    
+    data = await get_async_redis_client().get(f"grading:{session_id}")
     if not data:
+        raise HTTPException(404, "세션을 찾을 수 없습니다")
+    
+    names = await asyncio.to_thread(GradingPipeline().list_zip_pdfs, json.loads(data)["zip_path"])
+    page = names[offset:offset + limit]
+    items = await grading_jobs.aget_items(session_id, page)
+    results = [items[name] for name in page if name in items]
+    
+    return {
+        "session_id": session_id,
+        "offset": offset,
+        "limit": limit,
+        "total": len(names),
+        "results": results,
+    }
+
+async def _job_status(session_id: str) -> dict:
+    status = await grading_jobs.aget_status(session_id)
+    if status:
+        return status
+    
+    # Redis가 만료된 과거 작업은 DB 요약으로
+    job = await asyncio.to_thread(get_job, session_id)
+    if not job:
         return {"status": "not_found"}
+    return {
+        "status": "completed",
+        "done": job["total_files"],
+        "total": job["total_files"],
+        "total_files": job["total_files"],
+        "failed": job["failed"],
+        "average_score": job["average_score"],
+    }
+
+@router.get("/status/{session_id}")
+async def get_grading_status(session_id: str):
+    """채점 진행상태 확인 (진행률/요약만, 결과 본문은 /results)"""
+    return await _job_status(session_id)
+
+def _sse(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.get("/stream/{session_id}")
+async def stream_grading(session_id: str, request: Request):
+    """
+    채점 진행 스트림 (Server-Sent Events)
+    - result: 파일 하나가 채점될 때마다 {name, result, progress}
+    - progress: 진행률 (done/total/failed/throughput_per_min/eta_seconds)
+    - done: 작업이 끝났을 때 최종 상태 (이후 연결 종료, 전체 결과는 /results)
+    처음 연결하면 이벤트 스트림에 남아 있는 결과부터 다시 보내고 (이미 끝난 작업 포함),
+    재접속 시 Last-Event-ID 이후 이벤트만 이어서 보낸다.
+    Redis가 만료된 과거 작업은 DB 요약으로 progress/done만 보낸다.
+    """
+    status = await _job_status(session_id)
+    if status["status"] == "not_found":
+        raise HTTPException(404, "세션을 찾을 수 없습니다")
+    last_id = request.headers.get("last-event-id") or "0"
+    print(f"📡 채점 스트림 연결: {session_id} (from {last_id})")
     
-    return json.loads(data)
+    async def events():
+        nonlocal last_id, status
+        yield _sse("progress", status)
+        
+        backlog = False
+        while True:
+            if await request.is_disconnected():
+                return
+            # 읽기 전에 본 상태가 끝난 상태면 그 전까지의 이벤트는 모두 스트림에 있다
+            # → 기다리지 않고 읽고, 빈 결과가 나오면 종료. 진행 중이면 밀린 이벤트가 없을 때만 기다린다
+            active = status["status"] in ACTIVE_STATUSES
+            block_ms = STREAM_BLOCK_MS if active and not backlog else None
+            batch = await grading_jobs.read_events(session_id, last_id, block_ms)
+            status = await grading_jobs.aget_status(session_id) or {"status": "not_found"}
+            if not batch:
+                if not active:
+                    break
+                backlog = False
+                yield ": keepalive\n\n"
+                continue
+            
+            names = [name for _, event, name in batch if event == "result"]
+            results = await grading_jobs.aget_items(session_id, names)
+            for event_id, event, name in batch:
+                if event == "result" and name in results:
+                    yield _sse("result", {"name": name, "result": results[name], "progress": status}, event_id)
+            last_id = batch[-1][0]
+            yield _sse("progress", status, last_id)
+            # 한 번에 못 읽은 이벤트가 남았으면 기다리지 않고 이어서 읽는다
+            backlog = len(batch) >= RESULT_CHUNK
+        
+        final = await grading_jobs.aget_status(session_id) or status
+        yield _sse("done", final)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/jobs")
+async def list_grading_jobs(offset: int = 0, limit: int = 20):
+    """지난 채점 작업 목록 (최근 순). 결과는 /results/{session_id}로 다시 열람"""
+    limit = max(1, min(limit, 100))
+    total, jobs = await asyncio.to_thread(list_jobs, max(0, offset), limit)
+    return {"offset": offset, "limit": limit, "total": total, "jobs": jobs}
+
+@router.get("/jobs/{session_id}")
+async def get_grading_job(session_id: str):
+    """저장된 채점 작업 요약 + 루브릭"""
+    job = await asyncio.to_thread(get_job, session_id)
+    if not job:
+        raise HTTPException(404, "채점 작업을 찾을 수 없습니다")
+    return job
+
+@router.get("/scheduler-stats")
+async def get_scheduler_stats():
+    """채점 LLM 호출 스케줄러: 동시성 한도 / 429·재시도 횟수 / 분당 처리 건수"""
+    return get_grading_scheduler().stats()
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """채점 결과 / PDF 텍스트 캐시 항목 수와 적중 횟수"""
+    return get_artifact_store().stats()
 
 @router.delete("/cleanup/{session_id}")
 async def cleanup_grading_session(session_id: str):
     """세션 정리"""
     redis_client = get_redis_client()
     
-    # 파일 삭제
+    # 진행 중인 채점 작업 중단
+    await grading_jobs.cancel(session_id)
+    
+    # 파일 삭제 (세션 디렉터리 + 이전 방식의 임시 파일)
+    remove_session(session_id)
     grading_data = redis_client.get(f"grading:{session_id}")
     if grading_data:
         info = json.loads(grading_data)
@@ -173,11 +347,14 @@ async def cleanup_grading_session(session_id: str):
     result_data = redis_client.get(f"grading_result:{session_id}")
     if result_data:
         info = json.loads(result_data)
-        if info.get("excel_path") and os.path.exists(info["excel_path"]):
-            os.unlink(info["excel_path"])
+        for key in ("excel_path", "csv_path"):
+            if info.get(key) and os.path.exists(info[key]):
+                os.unlink(info[key])
     
     # Redis 키 삭제
     redis_client.delete(f"grading:{session_id}")
     redis_client.delete(f"grading_result:{session_id}")
+    redis_client.delete(f"grading_items:{session_id}")
+    redis_client.delete(f"grading_events:{session_id}")
     
     return {"status": "cleaned"}
\ No newline at end of file
@@ -1,14 +1,22 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
+import asyncio
 import uuid
 import json
 from backend.core.redis_client import get_redis_client
-from backend.ai.lecture.lecture_pipeline import LectureProcessor
+from backend.core.artifact_store import content_hash, get_artifact_store
+from backend.ai.lecture.lecture_pipeline import CHAPTERS_NAMESPACE, QUIZ_NAMESPACE, LectureProcessor
 import tempfile
 import os
 
 router = APIRouter(tags=["Lecture"])
 
+def _load_artifact(info: dict, key_field: str, namespace: str):
+    """세션 상태가 가리키는 캐시 결과 (세션에는 캐시 키만 저장)"""
+    if key_field not in info:
+        return info.get("data")
+    return get_artifact_store().get(namespace, info[key_field])
+
 @router.post("/upload")
 async def upload_pdf(file: UploadFile = File(...)):
     """PDF 업로드 및 Redis 저장"""
@@ -24,7 +32,7 @@ async def upload_pdf(file: UploadFile = File(...)):
         tmp.write(content)
         tmp_path = tmp.name
     
-    # Redis에 파일 정보 저장 (1시간 TTL)
+    # Redis에 파일 정보 저장 (1시간 TTL). 내용 해시로 같은 PDF의 요약/퀴즈 캐시를 찾는다
     redis_client = get_redis_client()
     redis_client.setex(
         f"pdf:{session_id}",
@@ -32,6 +40,7 @@ async def upload_pdf(file: UploadFile = File(...)):
         json.dumps({
             "filename": file.filename,
             "path": tmp_path,
+            "digest": content_hash(content),
             "status": "uploaded"
         })
     )
@@ -53,17 +62,19 @@ async def generate_summary(session_id: str):
         # 진행상태 업데이트
         redis_client.setex(f"summary:{session_id}", 3600, json.dumps({"status": "processing"}))
         
-        processor = LectureProcessor(pdf_info["path"])
-        text = processor.load_pdf()
-        chapters = processor.split_chapters(text)
+        processor = LectureProcessor(pdf_info["path"], digest=pdf_info.get("digest"))
+        chapters_key, chapters, cached = await processor.asummarize()
         
-        # 결과 저장
+        # 결과는 캐시에 있고 세션에는 캐시 키만 저장
         redis_client.setex(f"summary:{session_id}", 3600, json.dumps({
             "status": "completed",
-            "data": chapters
+            "chapters_key": chapters_key,
+            "cached": cached
         }))
+        # 단원이 바뀌었으므로 이전 퀴즈는 버린다
+        redis_client.delete(f"quiz:{session_id}")
         
-        return {"status": "completed", "data": chapters}
+        return {"status": "completed", "data": chapters, "cached": cached}
         
     except Exception as e:
         redis_client.setex(f"summary:{session_id}", 3600, json.dumps({"status": "error", "message": str(e)}))
@@ -82,6 +93,9 @@ async def generate_quiz(session_id: str):
     summary_info = json.loads(summary_data)
     if summary_info["status"] != "completed":
         raise HTTPException(400, "요약이 완료되지 않았습니다")
+    chapters = await asyncio.to_thread(_load_artifact, summary_info, "chapters_key", CHAPTERS_NAMESPACE)
+    if chapters is None:
+        raise HTTPException(404, "요약 결과가 만료되었습니다. 요약을 다시 생성해주세요")
     
     try:
         # 진행상태 업데이트
@@ -90,16 +104,20 @@ async def generate_quiz(session_id: str):
         pdf_data = redis_client.get(f"pdf:{session_id}")
         pdf_info = json.loads(pdf_data)
         
-        processor = LectureProcessor(pdf_info["path"])
-        questions = processor.generate_questions(summary_info["data"])
+        processor = LectureProcessor(pdf_info["path"], digest=pdf_info.get("digest"))
+        # 이전에 일부 단원만 실패했다면 캐시에서 성공한 단원은 재사용하고 그 단원만 다시 생성
+        quiz_key, questions, cached = await processor.aquiz(chapters)
+        failed = [item["chapter_title"] for item in questions if item.get("error")]
         
-        # 결과 저장
+        # 결과는 캐시에 있고 세션에는 캐시 키만 저장
         redis_client.setex(f"quiz:{session_id}", 3600, json.dumps({
             "status": "completed",
-            "data": questions
+            "quiz_key": quiz_key,
+            "failed_chapters": failed,
+            "cached": cached
         }))
         
-        return {"status": "completed", "data": questions}
+        return {"status": "completed", "data": questions, "failed_chapters": failed, "cached": cached}
         
     except Exception as e:
         redis_client.setex(f"quiz:{session_id}", 3600, json.dumps({"status": "error", "message": str(e)}))
@@ -114,7 +132,12 @@ async def get_status(session_id: str, task_type: str):
     if not data:
         return {"status": "not_found"}
     
-    return json.loads(data)
+    info = json.loads(data)
+    if "chapters_key" in info:
+        info["data"] = await asyncio.to_thread(_load_artifact, info, "chapters_key", CHAPTERS_NAMESPACE)
+    elif "quiz_key" in info:
+        info["data"] = await asyncio.to_thread(_load_artifact, info, "quiz_key", QUIZ_NAMESPACE)
+    return info
 
 @router.delete("/cleanup/{session_id}")
 async def cleanup_session(session_id: str):
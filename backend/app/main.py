@@ -1,4 +1,5 @@
 
+import asyncio
 import os
 from pathlib import Path
 from fastapi import FastAPI
@@ -12,6 +13,14 @@ from backend.core.config import settings
 from backend.core.logging import setup_logging
 from backend.api.v1.router import api_router
 from backend.ai.vector.rag_pipeline import RAGPipeline
+from backend.core.llm_factory import close_clients
+from backend.ai.tools.search.uhs_cache import start_uhs_refresher, uhs_refresher
+from backend.ai.tools.search.uhs_notice import start_notice_syncer, notice_syncer
+from backend.ai.tools.search.web_search import web_search_client
+from backend.ai.grading.storage import sweep_stale_sessions
+from backend.ai.grading.job_queue import grading_jobs
+from backend.services.pdf_extract import get_pdf_extractor
+from backend.db.init_db import init_db
 
 app = FastAPI(title=settings.app_name)
 
@@ -37,6 +46,13 @@ rag_pipeline = None
 @app.on_event("startup")
 async def startup_event():
     global rag_pipeline
+
+    # 없는 테이블만 생성 (채점 작업/결과 테이블 포함, 기존 테이블은 건드리지 않음)
+    try:
+        await asyncio.to_thread(init_db)
+    except Exception as e:
+        print(f"⚠️ DB 테이블 생성 실패: {e}")
+
     try:
         rag_pipeline = RAGPipeline()
         print("✅ RAG Pipeline 전역 로드 완료")
@@ -44,6 +60,33 @@ async def startup_event():
         print(f"⚠️ RAG Pipeline 로드 실패: {e}")
         rag_pipeline = None
 
+    # 협성대 홈페이지 페이지 미리 받아두기
+    start_uhs_refresher()
+
+    # 장학금/공모전 공지사항 게시판 증분 동기화 + 로컬 인덱스
+    start_notice_syncer()
+
+    # 만료된 채점 세션 파일 정리
+    removed = sweep_stale_sessions(settings.grading_retention_hours * 3600)
+    if removed:
+        print(f"🧹 오래된 채점 세션 {removed}개 정리")
+
+    # 서버 재시작 전 끝나지 않은 채점 작업 이어서 실행
+    try:
+        resumed = await grading_jobs.resume_pending()
+        if resumed:
+            print(f"🔁 채점 작업 {resumed}개 재개")
+    except Exception as e:
+        print(f"⚠️ 채점 작업 재개 실패: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await uhs_refresher.stop()
+    await notice_syncer.stop()
+    web_search_client.close()
+    get_pdf_extractor().shutdown()
+    await close_clients()
+
 @app.get("/health")
 def health():
     return {"status": "ok", "env": settings.app_env}
@@ -0,0 +1,247 @@
+# backend/benchmarks/agent_graph.py
+
+"""
+ReAct Agent 그래프 마이크로벤치마크
+
+OpenAI 지연을 제외하고 LangGraph 루프, 메시지 리스트 복사, 도구 디스패치 자체의
+오버헤드만 측정한다. 스크립트된 가짜 ChatModel과 스텁 도구를 사용하므로
+네트워크 없이 항상 같은 결과 흐름으로 실행된다.
+
+실행:
+    python -m backend.benchmarks.agent_graph
+    python -m backend.benchmarks.agent_graph --steps 1,4,8 --history 0,40 --concurrency 1,8 --sessions 50
+"""
+
+import os
+
+# react_agent 임포트 시 ChatOpenAI가 생성되므로 오프라인용 더미 키를 먼저 넣어둔다
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+import argparse
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+
+from backend.ai.agent import react_agent
+
+TOOL_CYCLE = ["rag_search", "uhs_fetch_info", "web_search"]
+
+
+# ---------------------------------------------------
+# 1) 스크립트된 가짜 ChatModel
+# ---------------------------------------------------
+class ScriptedChatModel(BaseChatModel):
+    """
+    마지막 HumanMessage 이후 ToolMessage 개수만 보고 다음 응답을 결정한다.
+    tool_steps 번 도구를 호출한 뒤 최종 답변을 돌려준다.
+    """
+
+    tool_steps: int = 2
+    answer_chars: int = 400
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        done = 0
+        for msg in reversed(messages):
+            if isinstance(msg, HumanMessage):
+                break
+            if isinstance(msg, ToolMessage):
+                done += 1
+
+        if done < self.tool_steps:
+            name = TOOL_CYCLE[done % len(TOOL_CYCLE)]
+            ai_msg = AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": {"query": f"step-{done}"}, "id": f"call_{done}"}],
+            )
+        else:
+            ai_msg = AIMessage(content="가" * self.answer_chars)
+
+        return ChatResult(generations=[ChatGeneration(message=ai_msg)])
+
+
+# ---------------------------------------------------
+# 2) 스텁 도구
+# ---------------------------------------------------
+def make_stub_tools(payload_chars: int) -> Dict[str, StructuredTool]:
+    payload = "나" * payload_chars
+
+    def _stub(query: str) -> str:
+        return payload
+
+    return {
+        name: StructuredTool.from_function(func=_stub, name=name, description=f"{name} 스텁")
+        for name in TOOL_CYCLE
+    }
+
+
+@contextmanager
+def patched_agent(model: BaseChatModel, tools: Dict[str, StructuredTool]):
+    """react_agent 모듈의 LLM / 도구 레지스트리를 잠시 가짜로 바꿔 끼운다."""
+    orig = react_agent.llm, react_agent.LLM_TIERS, react_agent.TOOL_REGISTRY
+    react_agent.llm = model
+    react_agent.LLM_TIERS = {tier: model for tier in orig[1]}
+    react_agent.TOOL_REGISTRY = tools
+    try:
+        yield react_agent.app
+    finally:
+        react_agent.llm, react_agent.LLM_TIERS, react_agent.TOOL_REGISTRY = orig
+
+
+def build_initial_state(history_len: int, session_id: str) -> Dict[str, Any]:
+    history: List[BaseMessage] = []
+    for i in range(history_len // 2):
+        history.append(HumanMessage(content=f"이전 질문 {i}"))
+        history.append(AIMessage(content=f"이전 답변 {i}"))
+    history.append(HumanMessage(content="오늘 학식 뭐야?"))
+
+    return {
+        "messages": [react_agent.SYSTEM_MESSAGE, *history],
+        "session_id": session_id,
+    }
+
+
+def copied_message_refs(initial_len: int, tool_steps: int) -> int:
+    """
+    노드마다 state["messages"] + [msg]로 리스트 전체를 복사한다.
+    노드 수는 agent(tool_steps + 1) + tool(tool_steps) 이다.
+    """
+    total = 0
+    length = initial_len
+    for _ in range(2 * tool_steps + 1):
+        total += length
+        length += 1
+    return total
+
+
+# ---------------------------------------------------
+# 3) 시나리오 실행
+# ---------------------------------------------------
+def run_scenario(
+    tool_steps: int,
+    history_len: int,
+    concurrency: int,
+    sessions: int,
+    payload_chars: int,
+) -> Dict[str, Any]:
+    model = ScriptedChatModel(tool_steps=tool_steps)
+    tools = make_stub_tools(payload_chars)
+    nodes_per_session = 2 * tool_steps + 1
+
+    with patched_agent(model, tools) as graph:
+        # 워밍업 (그래프 컴파일 캐시, 임포트 비용 제외)
+        graph.invoke(build_initial_state(history_len, "warmup"))
+
+        latencies: List[float] = []
+
+        def _one(idx: int) -> None:
+            state = build_initial_state(history_len, f"bench-{idx}")
+            t0 = time.perf_counter()
+            result = graph.invoke(state)
+            latencies.append(time.perf_counter() - t0)
+            assert len(result["messages"]) == len(state["messages"]) + nodes_per_session
+
+        gc.collect()
+        tracemalloc.start()
+        mem_before, _ = tracemalloc.get_traced_memory()
+
+        wall_start = time.perf_counter()
+        if concurrency <= 1:
+            for i in range(sessions):
+                _one(i)
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(_one, range(sessions)))
+        wall = time.perf_counter() - wall_start
+
+        mem_after, mem_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    initial_len = len(build_initial_state(history_len, "x")["messages"])
+    per_session_ms = statistics.mean(latencies) * 1000
+
+    return {
+        "tool_steps": tool_steps,
+        "history": history_len,
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "session_ms_mean": round(per_session_ms, 3),
+        "session_ms_p95": round(_percentile(latencies, 95) * 1000, 3),
+        "step_overhead_us": round(per_session_ms * 1000 / nodes_per_session, 1),
+        "copied_refs_per_session": copied_message_refs(initial_len, tool_steps),
+        "sessions_per_s": round(sessions / wall, 1),
+        "steps_per_s": round(sessions * nodes_per_session / wall, 1),
+        "mem_growth_kb": round((mem_after - mem_before) / 1024, 1),
+        "mem_peak_kb": round(mem_peak / 1024, 1),
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _int_list(raw: str) -> List[int]:
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    cols = [
+        "tool_steps", "history", "concurrency", "session_ms_mean", "session_ms_p95",
+        "step_overhead_us", "copied_refs_per_session", "sessions_per_s", "mem_growth_kb", "mem_peak_kb",
+    ]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    print("  ".join(c.rjust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in cols))
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="ReAct Agent 그래프 오버헤드 벤치마크 (오프라인)")
+    parser.add_argument("--steps", default="0,1,3,6", help="세션당 도구 호출 횟수 목록")
+    parser.add_argument("--history", default="0,20", help="사전 대화 히스토리 메시지 수 목록")
+    parser.add_argument("--concurrency", default="1,4", help="동시 실행 세션 수 목록")
+    parser.add_argument("--sessions", type=int, default=30, help="시나리오당 세션 수")
+    parser.add_argument("--payload", type=int, default=2000, help="스텁 도구 결과 길이(문자)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for steps in _int_list(args.steps):
+        for history in _int_list(args.history):
+            for conc in _int_list(args.concurrency):
+                rows.append(run_scenario(steps, history, conc, args.sessions, args.payload))
+
+    print_table(rows)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+    return rows
+
+
+if __name__ == "__main__":
+    main()
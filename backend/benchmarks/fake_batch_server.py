@@ -0,0 +1,233 @@
+# backend/benchmarks/fake_batch_server.py
+
+"""
+로컬 OpenAI Batch API 대역 서버 (채점 배치 모드 테스트용)
+
+files / batches 엔드포인트만 흉내 내고, 채점 요청에는 프롬프트의 Rubric을 읽어
+배점의 50~100% 사이 점수(과제 내용 해시로 결정)를 JSON으로 돌려준다.
+네트워크와 API 키 없이 업로드 → 배치 생성 → 폴링 → 결과 다운로드 흐름을 재현할 수 있다.
+
+실행:
+    python -m backend.benchmarks.fake_batch_server --port 8765 --delay 5 --fail-rate 0.1
+    GRADING_BATCH_BASE_URL=http://127.0.0.1:8765/v1 로 백엔드를 띄우고 mode=batch로 채점 요청
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as email_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+_RUBRIC_RE = re.compile(r"채점하세요:\s*\n(\{.*?\})\s*\n")
+
+
+class FakeBatchBackend:
+
+    def __init__(self, delay: float = 2.0, fail_rate: float = 0.0):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------
+    # files
+    # ---------------------------------------------------
+    def add_file(self, content: bytes, filename: str, purpose: str) -> Dict[str, Any]:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        meta = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        with self._lock:
+            self.files[file_id] = {"meta": meta, "content": content}
+        return meta
+
+    # ---------------------------------------------------
+    # batches
+    # ---------------------------------------------------
+    def create_batch(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        input_file = self.files.get(body.get("input_file_id"))
+        if input_file is None:
+            raise KeyError("input file not found")
+        lines = [json.loads(line) for line in input_file["content"].decode("utf-8").splitlines() if line.strip()]
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        batch = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": body.get("endpoint"),
+            "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "metadata": body.get("metadata"),
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+        }
+        with self._lock:
+            self.batches[batch_id] = {"batch": batch, "lines": lines, "ready_at": time.time() + self.delay}
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self.batches.get(batch_id)
+        if entry is None:
+            return None
+        batch = entry["batch"]
+        if batch["status"] == "in_progress" and time.time() >= entry["ready_at"]:
+            self._complete(batch, entry["lines"])
+        return batch
+
+    def _complete(self, batch: Dict[str, Any], lines: list) -> None:
+        outputs, errors = [], []
+        for line in lines:
+            digest = hashlib.sha256(json.dumps(line["body"], sort_keys=True).encode("utf-8")).digest()
+            if digest[0] / 255 < self.fail_rate:
+                errors.append({
+                    "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                    "custom_id": line["custom_id"],
+                    "response": {"status_code": 500, "body": {"error": {"message": "fake server error"}}},
+                    "error": None,
+                })
+                continue
+            content = _grade(line["body"], digest)
+            outputs.append({
+                "id": f"batch_req_{uuid.uuid4().hex[:16]}",
+                "custom_id": line["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": uuid.uuid4().hex,
+                    "body": {
+                        "id": f"chatcmpl-{uuid.uuid4().hex[:16]}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": line["body"].get("model"),
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }],
+                    },
+                },
+                "error": None,
+            })
+
+        def _jsonl(rows):
+            return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8")
+
+        batch["output_file_id"] = self.add_file(_jsonl(outputs), "output.jsonl", "batch_output")["id"]
+        if errors:
+            batch["error_file_id"] = self.add_file(_jsonl(errors), "errors.jsonl", "batch_output")["id"]
+        batch["request_counts"] = {"total": len(lines), "completed": len(outputs), "failed": len(errors)}
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+
+def _grade(body: Dict[str, Any], digest: bytes) -> str:
+    """프롬프트의 Rubric으로 결정적인 채점 결과 JSON 생성"""
+    prompt = body["messages"][-1]["content"]
+    match = _RUBRIC_RE.search(prompt)
+    rubric = json.loads(match.group(1)) if match else {}
+    ratio = 0.5 + digest[1] / 255 * 0.5
+    scores = {name: round(float(max_score) * ratio) for name, max_score in rubric.items()}
+    return json.dumps({
+        "scores": scores,
+        "total_score": sum(scores.values()),
+        "feedback": "로컬 배치 서버가 생성한 피드백입니다.",
+    }, ensure_ascii=False)
+
+
+def make_handler(backend: FakeBatchBackend):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status: int, payload: Any, raw: bool = False) -> None:
+            data = payload if raw else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        def do_POST(self):
+            if self.path == "/v1/files":
+                # multipart/form-data: purpose + file
+                raw = self._body()
+                header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("utf-8")
+                message = BytesParser(policy=email_policy).parsebytes(header + raw)
+                fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+                upload = fields.get("file")
+                if upload is None:
+                    return self._send(400, {"error": {"message": "file is required"}})
+                purpose = fields["purpose"].get_content().strip() if "purpose" in fields else "batch"
+                meta = backend.add_file(upload.get_payload(decode=True), upload.get_filename() or "input.jsonl", purpose)
+                return self._send(200, meta)
+            if self.path == "/v1/batches":
+                try:
+                    return self._send(200, backend.create_batch(json.loads(self._body())))
+                except KeyError as e:
+                    return self._send(400, {"error": {"message": str(e)}})
+            self._send(404, {"error": {"message": "not found"}})
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3:
+                batch = backend.get_batch(parts[2])
+                return self._send(200, batch) if batch else self._send(404, {"error": {"message": "batch not found"}})
+            if parts[:2] == ["v1", "files"] and len(parts) >= 3:
+                entry = backend.files.get(parts[2])
+                if entry is None:
+                    return self._send(404, {"error": {"message": "file not found"}})
+                if len(parts) == 4 and parts[3] == "content":
+                    return self._send(200, entry["content"], raw=True)
+                return self._send(200, entry["meta"])
+            self._send(404, {"error": {"message": "not found"}})
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, delay: float = 2.0, fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 서버 시작 (테스트 코드에서 사용). server.shutdown()으로 종료."""
+    server = ThreadingHTTPServer((host, port), make_handler(FakeBatchBackend(delay, fail_rate)))
+    threading.Thread(target=server.serve_forever, name="fake-batch-server", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 OpenAI Batch API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=2.0, help="배치 완료까지 걸리는 시간(초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="오류로 응답할 요청 비율")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(FakeBatchBackend(args.delay, args.fail_rate)))
+    print(f"🧪 fake batch server: http://{args.host}:{args.port}/v1 (delay={args.delay}s, fail_rate={args.fail_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
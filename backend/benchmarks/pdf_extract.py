@@ -0,0 +1,86 @@
+# backend/benchmarks/pdf_extract.py
+
+"""
+PDF 텍스트 추출 처리량 벤치마크
+
+같은 PDF 묶음을
+1) 스레드 풀에서 pypdf로 추출 (이전 방식, GIL 때문에 직렬화)
+2) services/pdf_extract.py 프로세스 풀(페이지 구간 병렬)로 추출
+두 방식으로 돌려 페이지/초를 비교한다. 캐시는 끄고(매번 새 캐시 디렉터리) 측정한다.
+
+실행:
+    python -m backend.benchmarks.pdf_extract
+    python -m backend.benchmarks.pdf_extract --workers 1,2,4,8 --repeat 3 path/to/a.pdf path/to/b.pdf
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from backend.core import artifact_store
+from backend.core.config import settings
+from backend.services.pdf_extract import PDFExtractService, _extract_range
+
+DEFAULT_PDFS = os.path.join(os.path.dirname(__file__), "..", "ai", "vector", "pdfs", "*.pdf")
+
+
+def _fresh_cache() -> None:
+    settings.cache_dir = tempfile.mkdtemp(prefix="pdf-bench-")
+    artifact_store._store = None
+
+
+def bench_threads(paths: List[str], workers: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda p: _extract_range(p, 0, None), paths))
+    return time.perf_counter() - started
+
+
+async def _bench_pool(service: PDFExtractService, paths: List[str]) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*[service.extract(p) for p in paths])
+    return time.perf_counter() - started
+
+
+def bench_processes(paths: List[str], workers: int, pages_per_task: int) -> float:
+    service = PDFExtractService(workers, pages_per_task)
+    try:
+        # 워커 기동 시간은 제외
+        service._submit(paths[0], 0, 1).result()
+        return asyncio.run(_bench_pool(service, paths))
+    finally:
+        service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PDF 추출 처리량 벤치마크")
+    parser.add_argument("pdfs", nargs="*", help="PDF 경로 (기본: backend/ai/vector/pdfs/*.pdf)")
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--pages-per-task", type=int, default=settings.pdf_extract_pages_per_task)
+    parser.add_argument("--repeat", type=int, default=1, help="PDF 목록 반복 횟수")
+    args = parser.parse_args()
+
+    paths = (args.pdfs or sorted(glob.glob(DEFAULT_PDFS))) * args.repeat
+    if not paths:
+        raise SystemExit("PDF가 없습니다")
+    pages = sum(_extract_range(p, 0, 0)[0] for p in paths)
+    print(f"PDF {len(paths)}개, {pages}페이지, CPU {os.cpu_count()}개")
+
+    for workers in sorted({int(w) for w in args.workers.split(",")}):
+        _fresh_cache()
+        t_threads = bench_threads(paths, workers)
+        _fresh_cache()
+        t_procs = bench_processes(paths, workers, args.pages_per_task)
+        print(
+            f"workers={workers:<3} threads {pages / t_threads:8.1f} pages/s   "
+            f"processes {pages / t_procs:8.1f} pages/s   (x{t_threads / t_procs:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
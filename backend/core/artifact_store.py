@@ -0,0 +1,121 @@
+# backend/core/artifact_store.py
+
+"""
+영속 아티팩트 캐시 (SQLite)
+
+채점 결과, PDF 추출 텍스트처럼 "입력 해시 → 결과"로 다시 만들 수 있는 값을
+서버 재시작 후에도 재사용하기 위한 저장소. 값은 JSON으로 저장한다.
+같은 호스트의 여러 워커가 한 파일을 함께 쓰도록 WAL 모드로 연다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from backend.core.config import settings
+
+DB_FILENAME = "artifacts.sqlite3"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_key(*parts: Any) -> str:
+    """여러 구성 요소(해시, 정규화된 설정, 모델명 등)를 하나의 캐시 키로"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ArtifactStore:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 커넥션은 스레드마다 하나씩
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value FROM artifacts WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE artifacts SET hits = hits + 1 WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"[artifact_store] 조회 실패 {namespace}/{key[:12]}: {e}")
+            return None
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO artifacts (namespace, key, value, created_at, hits) VALUES (?, ?, ?, ?, 0)",
+                    (namespace, key, json.dumps(value, ensure_ascii=False), time.time()),
+                )
+        except Exception as e:
+            logger.warning(f"[artifact_store] 저장 실패 {namespace}/{key[:12]}: {e}")
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM artifacts WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def purge(self, older_than_seconds: float) -> int:
+        """오래된 항목 정리. 지운 개수 반환."""
+        with self._conn() as conn:
+            cur = conn.execute("DELETE FROM artifacts WHERE created_at < ?", (time.time() - older_than_seconds,))
+            return cur.rowcount
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        rows = self._conn().execute(
+            "SELECT namespace, COUNT(*), COALESCE(SUM(hits), 0), COALESCE(SUM(LENGTH(value)), 0) "
+            "FROM artifacts GROUP BY namespace"
+        ).fetchall()
+        return {ns: {"entries": n, "hits": hits, "bytes": size} for ns, n, hits, size in rows}
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(os.path.join(settings.cache_dir, DB_FILENAME))
+            logger.info(f"[artifact_store] 열기: {_store.path}")
+        return _store
@@ -19,8 +19,96 @@ class Settings(BaseSettings):
     openai_api_key: str | None = None
     tavily_api_key: str | None = None
 
+    # OpenAI HTTP 커넥션 풀 (backend/core/llm_factory.py)
+    openai_base_url: str | None = None
+    openai_max_connections: int = 50
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry: float = 30.0
+    openai_timeout: float = 60.0
+    openai_connect_timeout: float = 5.0
+    openai_max_retries: int = 2
+
+    # Agent: 질문 복잡도 기반 모델 라우팅 (model_router.py)
+    agent_routing_enabled: bool = True
+    agent_fast_model: str = "gpt-4o-mini"
+    agent_large_model: str = "gpt-4o"
+    agent_routing_threshold: int = 2
+    agent_fast_max_steps: int = 3
+
+    # Agent: 시스템 프롬프트 변형(full | compact) / 호출별 토큰 회계 로그 (측정할 때만 켬)
+    agent_prompt_variant: str = "full"
+    agent_token_report: bool = False
+
+    # Agent: 첫 LLM 호출과 병렬로 FAISS 검색을 미리 시작 (rag_prefetch.py)
+    agent_speculative_rag: bool = False
+    agent_speculative_similarity: float = 0.5
+    agent_speculative_wait: float = 10.0
+
+    # 협성대 홈페이지 백그라운드 프리페치 (uhs_cache.py)
+    uhs_prefetch_enabled: bool = True
+    uhs_http_pool_size: int = 8
+    uhs_verify_ssl: bool = False
+    uhs_fallback_token_cap: int = 800
+
+    # 공지사항 게시판 증분 크롤러 + 로컬 검색 인덱스 (uhs_notice.py)
+    uhs_notice_enabled: bool = True
+    uhs_notice_dir: str = "notices"
+    uhs_notice_sync_interval: int = 3600
+    uhs_notice_max_pages: int = 30
+    uhs_notice_top_k: int = 5
+
+    # Tavily 웹 검색: 결과 TTL 캐시 / 결과별 본문 토큰 예산 (web_search.py)
+    web_search_max_results: int = 3
+    web_search_cache_ttl: int = 1800
+    web_search_snippet_tokens: int = 200
+    web_search_timeout: float = 15.0
+
+    # 과제 채점: 업로드 ZIP / ZIP 내 PDF 크기 제한, 세션 파일 보관 시간 (grading/storage.py)
+    grading_max_upload_mb: int = 1024
+    grading_max_pdf_mb: int = 50
+    grading_retention_hours: int = 24
+    grading_max_jobs: int = 2
+
+    # 과제 채점 LLM 호출 스케줄러: 토큰 버킷 + AIMD 동시성 + 백오프 재시도 (grading/scheduler.py)
+    grading_model: str = "gpt-4o-mini"
+    grading_tpm_limit: int = 150000
+    grading_initial_concurrency: int = 4
+    grading_max_concurrency: int = 32
+    grading_latency_target: float = 30.0
+    grading_max_attempts: int = 5
+    grading_expected_output_tokens: int = 800
+    # 응답이 채점 결과 스키마에 맞지 않을 때 잘못된 필드만 다시 요청하는 횟수
+    grading_repair_attempts: int = 1
+    # 호출당 과제 본문 토큰 한도. 넘으면 섹션별 근거 수집(map) 후 최종 채점(reduce)
+    grading_max_prompt_tokens: int = 12000
+    grading_section_tokens: int = 6000
+    grading_section_overlap: int = 200
+    grading_max_sections: int = 20
+
+    # 과제 채점 배치 모드: OpenAI Batch API 호환 엔드포인트 (grading/batch.py)
+    # GRADING_BATCH_BASE_URL이 없으면 OPENAI_BASE_URL 사용
+    grading_batch_base_url: str | None = None
+    grading_batch_poll_interval: float = 30.0
+    grading_batch_completion_window: str = "24h"
+
+    # 강의 분석: 단원별 문제 동시 생성 수 / LLM 호출당 시도 횟수 (lecture_pipeline.py)
+    lecture_quiz_concurrency: int = 4
+    lecture_llm_attempts: int = 3
+    # 강의 분석: 단원 분리 방식(auto | single | map_reduce). 호출당 본문 토큰 한도를 넘으면
+    # 페이지 구간(LECTURE_WINDOW_TOKENS)별로 단원 경계/요약을 동시에 찾은 뒤 합친다
+    lecture_segmentation: str = "auto"
+    lecture_max_prompt_tokens: int = 12000
+    lecture_window_tokens: int = 6000
+    lecture_window_concurrency: int = 4
+
+    # PDF 텍스트 추출 프로세스 풀 (services/pdf_extract.py). 워커 0이면 CPU 코어 수
+    pdf_extract_workers: int = 0
+    pdf_extract_pages_per_task: int = 20
+
     vector_dir: str = "vectorstore"
     upload_dir: str = "uploads"
+    # 영속 아티팩트 캐시(SQLite): 채점 결과, PDF 추출 텍스트 등 (core/artifact_store.py)
+    cache_dir: str = "cache"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,177 @@
+# backend/core/llm_factory.py
+
+"""
+LLM / OpenAI 클라이언트 팩토리
+모든 파이프라인이 keep-alive 커넥션 풀을 공유하도록 한 곳에서 생성한다.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from loguru import logger
+from openai import OpenAI, AsyncOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from backend.core.config import settings
+
+_lock = threading.Lock()
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_openai_client: Optional[OpenAI] = None
+_async_openai_client: Optional[AsyncOpenAI] = None
+
+_chat_models: Dict[Tuple[str, float, int], ChatOpenAI] = {}
+_embeddings: Dict[str, OpenAIEmbeddings] = {}
+
+
+def _api_key() -> str:
+    if not settings.openai_api_key:
+        raise ValueError(
+            "❌ OPENAI_API_KEY가 설정되지 않았습니다. "
+            ".env 파일을 확인하세요."
+        )
+    return settings.openai_api_key
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.openai_timeout,
+        connect=settings.openai_connect_timeout,
+    )
+
+
+# ---------------------------------------------------
+# 1) 공유 HTTP 커넥션 풀 (sync / async)
+# ---------------------------------------------------
+def get_http_client() -> httpx.Client:
+    """프로세스 전역 sync HTTP 커넥션 풀"""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+            logger.info("[llm_factory] sync HTTP 커넥션 풀 생성")
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """프로세스 전역 async HTTP 커넥션 풀"""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+            logger.info("[llm_factory] async HTTP 커넥션 풀 생성")
+        return _async_http_client
+
+
+# ---------------------------------------------------
+# 2) OpenAI SDK 클라이언트 (STT / TTS 등)
+# ---------------------------------------------------
+def get_openai_client() -> OpenAI:
+    global _openai_client
+    http_client = get_http_client()
+    with _lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(
+                api_key=_api_key(),
+                base_url=settings.openai_base_url,
+                max_retries=settings.openai_max_retries,
+                http_client=http_client,
+            )
+        return _openai_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    global _async_openai_client
+    http_client = get_async_http_client()
+    with _lock:
+        if _async_openai_client is None:
+            _async_openai_client = AsyncOpenAI(
+                api_key=_api_key(),
+                base_url=settings.openai_base_url,
+                max_retries=settings.openai_max_retries,
+                http_client=http_client,
+            )
+        return _async_openai_client
+
+
+# ---------------------------------------------------
+# 3) LangChain 모델 (ChatOpenAI / OpenAIEmbeddings)
+# ---------------------------------------------------
+def get_chat_model(model: str, temperature: float = 0.0, max_retries: Optional[int] = None) -> ChatOpenAI:
+    """
+    (model, temperature, max_retries) 조합별로 ChatOpenAI 인스턴스를 하나만 만들어 재사용한다.
+    sync/async 호출 모두 공유 커넥션 풀을 사용한다.
+    max_retries=0이면 SDK 내부 재시도 없이 429 등을 호출 측(채점 스케줄러)에 그대로 올린다.
+    """
+    if max_retries is None:
+        max_retries = settings.openai_max_retries
+    key = (model, float(temperature), max_retries)
+    http_client = get_http_client()
+    http_async_client = get_async_http_client()
+    with _lock:
+        llm = _chat_models.get(key)
+        if llm is None:
+            llm = ChatOpenAI(
+                api_key=_api_key(),
+                base_url=settings.openai_base_url,
+                model=model,
+                temperature=temperature,
+                timeout=settings.openai_timeout,
+                max_retries=max_retries,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            _chat_models[key] = llm
+            logger.info(f"[llm_factory] ChatOpenAI 생성: model={model}, temperature={temperature}")
+        return llm
+
+
+def get_embeddings(model: str = "text-embedding-3-large") -> OpenAIEmbeddings:
+    http_client = get_http_client()
+    http_async_client = get_async_http_client()
+    with _lock:
+        emb = _embeddings.get(model)
+        if emb is None:
+            emb = OpenAIEmbeddings(
+                api_key=_api_key(),
+                base_url=settings.openai_base_url,
+                model=model,
+                max_retries=settings.openai_max_retries,
+                http_client=http_client,
+                http_async_client=http_async_client,
+            )
+            _embeddings[model] = emb
+            logger.info(f"[llm_factory] OpenAIEmbeddings 생성: model={model}")
+        return emb
+
+
+# ---------------------------------------------------
+# 4) 종료 처리
+# ---------------------------------------------------
+async def close_clients() -> None:
+    """앱 종료 시 커넥션 풀 정리"""
+    global _http_client, _async_http_client, _openai_client, _async_openai_client
+    with _lock:
+        http_client, async_http_client = _http_client, _async_http_client
+        _http_client = None
+        _async_http_client = None
+        _openai_client = None
+        _async_openai_client = None
+        _chat_models.clear()
+        _embeddings.clear()
+
+    if http_client is not None:
+        http_client.close()
+    if async_http_client is not None:
+        await async_http_client.aclose()
+    logger.info("[llm_factory] HTTP 커넥션 풀 종료")
@@ -1,6 +1,7 @@
 # backend/core/redis_client.py
 
 import redis
+import redis.asyncio as aioredis
 from backend.core.config import settings
 
 # Redis 클라이언트 초기화
@@ -11,8 +12,19 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# 오래 기다리는 읽기(XREAD BLOCK 등)나 이벤트 루프에서 자주 보내는 명령용 비동기 클라이언트 - 스레드 풀을 점유하지 않는다
+async_redis_client = aioredis.Redis(
+    host='localhost',
+    port=6379,
+    db=0,
+    decode_responses=True
+)
+
 def get_redis():
     return redis_client
 
 def get_redis_client():
-    return redis_client
\ No newline at end of file
+    return redis_client
+
+def get_async_redis_client():
+    return async_redis_client
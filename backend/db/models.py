@@ -1,6 +1,12 @@
 
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, DateTime, Boolean, ForeignKey, func
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+)
+from sqlalchemy.dialects.postgresql import JSONB
+
+# PostgreSQL에서는 JSONB, 그 외(SQLite 등)에서는 JSON
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 class Base(DeclarativeBase):
     pass
@@ -41,3 +47,46 @@ class Document(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
+
+class GradingJob(Base):
+    """과제 채점 작업 (session_id 단위). 완료 시 요약과 루브릭을 보관해 재채점 없이 다시 열람"""
+    __tablename__ = "grading_jobs"
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=True)
+    rubric: Mapped[dict] = mapped_column(JSONType)
+    mode: Mapped[str] = mapped_column(String(20), default="online")
+    status: Mapped[str] = mapped_column(String(20), default="completed", index=True)
+    total_files: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    average_score: Mapped[float] = mapped_column(Float, default=0.0)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), index=True)
+    completed_at: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+
+class GradingSubmission(Base):
+    """제출물별 채점 결과"""
+    __tablename__ = "grading_submissions"
+    __table_args__ = (
+        UniqueConstraint("job_id", "member_name", name="uq_grading_submissions_job_member"),
+        Index("ix_grading_submissions_job_score", "job_id", "total_score"),
+        # 결과 목록/보고서는 ZIP 순서(position)로 페이지를 나눠 읽는다
+        Index("ix_grading_submissions_job_position", "job_id", "position"),
+        # 학번/과제명 조회는 항상 작업 안에서 이뤄진다
+        Index("ix_grading_submissions_job_student", "job_id", "student_id"),
+        Index("ix_grading_submissions_job_assignment", "job_id", "assignment"),
+    )
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String(36), ForeignKey("grading_jobs.id", ondelete="CASCADE"), index=True)
+    # ZIP 안 경로 (보고서/목록 순서 기준)
+    member_name: Mapped[str] = mapped_column(String(512))
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    # member_name의 파일명 부분이라 같은 길이까지 허용
+    filename: Mapped[str] = mapped_column(String(512))
+    student_id: Mapped[str] = mapped_column(String(50), nullable=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=True)
+    assignment: Mapped[str] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="graded")
+    scores: Mapped[dict] = mapped_column(JSONType)
+    total_score: Mapped[float] = mapped_column(Float, default=0.0)
+    feedback: Mapped[str] = mapped_column(Text, nullable=True)
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
@@ -0,0 +1,147 @@
+# backend/services/pdf_extract.py
+
+"""
+PDF 텍스트 추출 서비스 (프로세스 풀)
+
+pypdf 추출은 CPU 작업이라 스레드로 돌리면 GIL 때문에 직렬화되고 이벤트 루프도 느려진다.
+- 추출은 별도 프로세스 풀에서 실행 (워커 수 PDF_EXTRACT_WORKERS, 0이면 CPU 코어 수)
+- 페이지가 많은 PDF는 PDF_EXTRACT_PAGES_PER_TASK 페이지씩 나눠 여러 워커가 동시에 추출
+  (바이트로 받은 PDF는 남은 구간을 임시 파일 경로로 넘겨 구간마다 PDF 전체를 pickle하지 않는다)
+- 추출 결과(페이지별 텍스트 목록)는 파일 내용 해시로 영속 캐시(core/artifact_store.py, namespace "pdf_pages")에 저장
+채점(grading_pipeline)과 강의 분석(lecture_pipeline)이 같은 풀을 공유한다.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple, Union
+
+from loguru import logger
+
+from backend.core.artifact_store import content_hash, get_artifact_store
+from backend.core.config import settings
+
+CACHE_NAMESPACE = "pdf_pages"
+
+Source = Union[str, bytes]
+
+
+# ---------------------------------------------------
+# 워커 프로세스에서 실행되는 함수 (pickle 가능하도록 모듈 최상위)
+# ---------------------------------------------------
+def _extract_range(source: Source, start: int, end: Optional[int]) -> Tuple[int, List[str]]:
+    """[start, end) 페이지 텍스트와 전체 페이지 수. end가 None이면 끝까지."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+    count = len(reader.pages)
+    stop = count if end is None else min(end, count)
+    return count, [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+class PDFExtractService:
+
+    def __init__(self, workers: int = 0, pages_per_task: int = 20):
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # 스레드/이벤트 루프가 도는 서버 프로세스를 fork하지 않도록 spawn
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"[pdf_extract] 프로세스 풀 생성: workers={self.workers}")
+            return self._pool
+
+    def _reset(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, source: Source, start: int, end: Optional[int]) -> Future:
+        try:
+            return self._executor().submit(_extract_range, source, start, end)
+        except BrokenProcessPool:
+            # 워커가 죽었으면 풀을 새로 만든다
+            self._reset()
+            return self._executor().submit(_extract_range, source, start, end)
+
+    # ---------------------------------------------------
+    # 추출
+    # ---------------------------------------------------
+    async def extract_pages(self, source: Source, digest: Optional[str] = None) -> List[str]:
+        """
+        페이지별 텍스트 목록. source는 파일 경로 또는 바이트.
+        첫 구간을 추출하면서 페이지 수를 알아내고, 남은 구간은 여러 워커에 나눠 동시에 추출한다.
+        워커는 경로로 파일을 직접 연다. 바이트는 첫 구간에만 그대로 넘기고, 구간이 더 있으면
+        임시 파일에 써서 경로로 넘긴다 (큰 PDF를 구간마다 프로세스 간에 복사하지 않도록).
+        """
+        if digest is None:
+            data = source if isinstance(source, bytes) else await asyncio.to_thread(_read_file, source)
+            digest = content_hash(data)
+        store = get_artifact_store()
+        cached = await asyncio.to_thread(store.get, CACHE_NAMESPACE, digest)
+        if cached is not None:
+            return cached
+
+        step = self.pages_per_task
+        count, pages = await asyncio.wrap_future(self._submit(source, 0, step))
+        if count > step:
+            path = await asyncio.to_thread(_spill, source) if isinstance(source, bytes) else source
+            try:
+                rest = await asyncio.gather(*[
+                    asyncio.wrap_future(self._submit(path, start, start + step))
+                    for start in range(step, count, step)
+                ])
+            finally:
+                if path is not source:
+                    os.unlink(path)
+            pages += [text for _, texts in rest for text in texts]
+
+        await asyncio.to_thread(store.put, CACHE_NAMESPACE, digest, pages)
+        return pages
+
+    async def extract(self, source: Source, digest: Optional[str] = None) -> str:
+        """PDF 전체 텍스트 (페이지 사이 줄바꿈)"""
+        return "\n".join(await self.extract_pages(source, digest))
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _spill(data: bytes) -> str:
+    """바이트 PDF를 임시 파일로 (남은 페이지 구간은 워커가 경로로 연다). 호출한 쪽에서 삭제"""
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+        return f.name
+
+
+_service: Optional[PDFExtractService] = None
+_service_lock = threading.Lock()
+
+
+def get_pdf_extractor() -> PDFExtractService:
+    """프로세스 전역 PDF 추출 서비스"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PDFExtractService(settings.pdf_extract_workers, settings.pdf_extract_pages_per_task)
+        return _service
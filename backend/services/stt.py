@@ -1,7 +1,7 @@
 
 import io
 import os
-from openai import OpenAI
+from backend.core.llm_factory import get_openai_client
 from loguru import logger
 
 class STTService:
@@ -16,7 +16,7 @@ class STTService:
                 ".env 파일을 확인하세요."
             )
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_openai_client()
         self.model = "whisper-1"
         logger.info("✅ STTService initialized with Whisper model")
     
@@ -1,6 +1,6 @@
 
 import os
-from openai import OpenAI
+from backend.core.llm_factory import get_openai_client
 from loguru import logger
 from io import BytesIO
 
@@ -16,7 +16,7 @@ class TTSService:
                 ".env 파일을 확인하세요."
             )
         
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_openai_client()
         self.model = "tts-1"  # Fast model, good for real-time
         self.voice = "alloy"  # Voice option: alloy, echo, fable, onyx, nova, shimmer
         logger.info("✅ TTSService initialized with TTS model")
@@ -0,0 +1,99 @@
+# backend/tests/test_grading_batch.py
+
+import asyncio
+import os
+
+import pytest
+
+from backend.ai.grading import grading_pipeline
+from backend.ai.grading.grading_pipeline import GradingPipeline
+from backend.benchmarks import fake_batch_server
+from backend.core.artifact_store import ArtifactStore
+from backend.core.config import settings
+
+RUBRIC = {"문제 이해": 30, "코드 품질": 20}
+
+
+@pytest.fixture
+def batch_server(monkeypatch):
+    # delay=0: 배치가 첫 조회에서 바로 끝남 / fail_rate: 요청 절반 정도를 500으로 응답
+    server = fake_batch_server.serve(port=0, delay=0, fail_rate=0.5)
+    host, port = server.server_address[:2]
+    monkeypatch.setattr(settings, "grading_batch_base_url", f"http://{host}:{port}/v1")
+    monkeypatch.setattr(settings, "grading_batch_poll_interval", 0.01)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts.sqlite3"))
+    monkeypatch.setattr(grading_pipeline, "get_artifact_store", lambda: store)
+    # 배치 경로는 채팅 모델을 쓰지 않는다
+    monkeypatch.setattr(grading_pipeline, "get_chat_model", lambda *args, **kwargs: _NoChatModel())
+
+    async def _load(self, source, digest=None):
+        return source.decode("utf-8")
+
+    # PDF 추출 대신 바이트를 그대로 본문으로
+    monkeypatch.setattr(GradingPipeline, "load_pdf_content", _load)
+    return GradingPipeline()
+
+
+class _NoChatModel:
+
+    def bind(self, **kwargs):
+        return self
+
+
+@pytest.fixture
+def jsonl_paths(monkeypatch):
+    """배치 입력 JSONL 임시 파일 경로 기록 (끝나면 지워졌는지 확인)"""
+    paths = []
+    original = grading_pipeline.tempfile.NamedTemporaryFile
+
+    def _tracked(*args, **kwargs):
+        f = original(*args, **kwargs)
+        paths.append(f.name)
+        return f
+
+    monkeypatch.setattr(grading_pipeline.tempfile, "NamedTemporaryFile", _tracked)
+    return paths
+
+
+def _submissions(n):
+    return [(f"2024{i:04d}_과제1_학생{i}.pdf", f"제출물 {i} 본문".encode("utf-8")) for i in range(n)]
+
+
+def test_batch_grades_and_fails_rows(batch_server, pipeline, jsonl_paths):
+    batch_ids = []
+
+    async def _on_batch(batch_id):
+        batch_ids.append(batch_id)
+
+    results = asyncio.run(pipeline.grade_assignments_batch(_submissions(20), RUBRIC, on_batch=_on_batch))
+
+    assert len(results) == 20
+    assert len(batch_ids) == 1
+    graded = [r for r in results if r["status"] == "graded"]
+    failed = [r for r in results if r["status"] == "failed"]
+    assert graded and failed
+    assert len(graded) + len(failed) == 20
+    for r in graded:
+        assert set(r["scores"]) == set(RUBRIC)
+        assert r["total_score"] == sum(r["scores"].values())
+        assert r["student_id"].startswith("2024")
+    for r in failed:
+        assert "fake server error" in r["error"]
+    assert jsonl_paths and not any(os.path.exists(p) for p in jsonl_paths)
+
+
+def test_batch_removes_jsonl_when_input_fails(pipeline, jsonl_paths):
+    def _broken():
+        yield from _submissions(2)
+        raise OSError("zip read failed")
+
+    with pytest.raises(OSError):
+        asyncio.run(pipeline.grade_assignments_batch(_broken(), RUBRIC))
+    assert jsonl_paths and not any(os.path.exists(p) for p in jsonl_paths)
@@ -0,0 +1,56 @@
+# backend/tests/test_result_schema.py
+
+from backend.ai.grading.result_schema import (
+    build_result_model,
+    invalid_fields,
+    merge_partial,
+    validate_result,
+)
+
+RUBRIC = {"문제 이해": 30, "코드 품질": 20}
+
+
+def test_total_score_recomputed_from_scores():
+    model = build_result_model(RUBRIC)
+    result, errors = validate_result(model, {
+        "scores": {"문제 이해": 25, "코드 품질": 15},
+        "total_score": 99,
+        "feedback": "좋음",
+    })
+    assert errors == []
+    assert result["total_score"] == 40
+
+
+def test_total_score_filled_when_missing():
+    model = build_result_model(RUBRIC)
+    result, _ = validate_result(model, {
+        "scores": {"문제 이해": 12.5, "코드 품질": 10},
+        "feedback": "보통",
+    })
+    assert result["total_score"] == 22.5
+
+
+def test_score_over_max_is_invalid_field():
+    model = build_result_model(RUBRIC)
+    result, errors = validate_result(model, {
+        "scores": {"문제 이해": 31, "코드 품질": 10},
+        "feedback": "",
+    })
+    assert result is None
+    assert invalid_fields(errors) == ["feedback", "scores.문제 이해"]
+
+
+def test_merge_partial_patches_scores_and_drops_stale_total():
+    base = {"scores": {"문제 이해": 31, "코드 품질": 10}, "total_score": 41, "feedback": "좋음"}
+    merged = merge_partial(base, {"scores": {"문제 이해": 28}})
+    assert merged == {"scores": {"문제 이해": 28, "코드 품질": 10}, "feedback": "좋음"}
+    assert base["scores"]["문제 이해"] == 31
+
+    result, errors = validate_result(build_result_model(RUBRIC), merged)
+    assert errors == []
+    assert result["total_score"] == 38
+
+
+def test_merge_partial_replaces_other_fields():
+    base = {"scores": {"문제 이해": 20}, "feedback": ""}
+    assert merge_partial(base, {"feedback": "보완 필요"}) == {"scores": {"문제 이해": 20}, "feedback": "보완 필요"}